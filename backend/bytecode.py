@@ -0,0 +1,380 @@
+"""Compilación del AST verificado a bytecode de pila.
+
+Cada instrucción ocupa dos enteros en un array('i'): el código de operación y
+su argumento (0 si no usa). Los valores de NumNode van a una tabla de
+constantes y CONST lleva su índice; las variables usan el frame y slot que
+anota Resolver, y las llamadas el func_index. Como las anotaciones de tipo ya
+están en el AST, las conversiones int -> float y la elección entre división
+entera y real se resuelven al compilar: la VM no mira tipos.
+
+Las condiciones de if, while y for se compilan a saltos: && y || saltan en
+cortocircuito sin calcular un 1 o un 0 intermedio. Un LOAD_LOCAL seguido de
+CONST o de otro LOAD_LOCAL se funde en una instrucción con los dos operandos
+en el argumento (el segundo en los 16 bits altos), salvo que un salto llegue
+a la segunda.
+"""
+import sys
+import os
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from visitor import NodeVisitor
+from interpreter import ExecutionError, CERO, preparar
+
+# Códigos de operación. El orden sigue la frecuencia aproximada en ejecución,
+# que es el orden en que la VM los compara.
+OPCODE_NAMES = (
+    "LOAD_LOCAL_CONST", "LOAD_LOCAL2", "LOAD_LOCAL", "CONST", "STORE_LOCAL", "JUMP_IF_FALSE", "JUMP_IF_TRUE", "JUMP",
+    "ADD", "SUB", "MUL", "LT", "LE", "GT", "GE", "EQ", "NE",
+    "LOAD_GLOBAL", "STORE_GLOBAL", "DUP", "POP",
+    "CALL", "RETURN",
+    "DIV_INT", "DIV_FLOAT", "MOD_INT", "MOD_FLOAT", "NEG", "NOT", "TO_FLOAT",
+    "PRINT_INT", "PRINT_FLOAT", "HALT",
+)
+
+(LOAD_LOCAL_CONST, LOAD_LOCAL2, LOAD_LOCAL, CONST, STORE_LOCAL, JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP,
+ ADD, SUB, MUL, LT, LE, GT, GE, EQ, NE,
+ LOAD_GLOBAL, STORE_GLOBAL, DUP, POP,
+ CALL, RETURN,
+ DIV_INT, DIV_FLOAT, MOD_INT, MOD_FLOAT, NEG, NOT, TO_FLOAT,
+ PRINT_INT, PRINT_FLOAT, HALT) = range(len(OPCODE_NAMES))
+
+SALTOS = frozenset((JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP))
+CON_ARGUMENTO = SALTOS | {LOAD_LOCAL, CONST, STORE_LOCAL, LOAD_GLOBAL, STORE_GLOBAL, CALL}
+FUSIONADAS = {CONST: LOAD_LOCAL_CONST, LOAD_LOCAL: LOAD_LOCAL2}
+
+# Límites de los dos operandos de una instrucción fusionada
+MAX_PRIMERO = 1 << 16
+MAX_SEGUNDO = 1 << 15
+
+BINARIOS = {'+': ADD, '-': SUB, '*': MUL, '<': LT, '<=': LE, '>': GT, '>=': GE, '==': EQ, '!=': NE}
+
+
+class FunctionCode:
+    """Una función compilada: entry es el pc de su primera instrucción"""
+    __slots__ = ("name", "entry", "n_params", "frame_size")
+
+    def __init__(self, name, entry, n_params, frame_size):
+        self.name = name
+        self.entry = entry
+        self.n_params = n_params
+        self.frame_size = frame_size
+
+
+class Bytecode:
+    """Programa compilado.
+
+    code tiene las instrucciones de todas las funciones; la ejecución empieza
+    en 0, donde se inicializan las globales y se llama a main. HALT termina
+    con el valor de main en la pila.
+    """
+
+    def __init__(self):
+        self.code = array('i')
+        self.consts = []
+        self.functions = []
+        self.global_names = []
+
+
+class BytecodeCompiler(NodeVisitor):
+    """Genera el Bytecode de un ProgramNode ya resuelto.
+
+    Las sentencias emiten código que deja la pila como estaba; las expresiones,
+    código que deja su valor encima.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.bytecode = Bytecode()
+        self.code = self.bytecode.code
+        self._constantes = {}
+        self._funciones = []
+        self._retorno = None
+        self._destinos = set()
+
+    def compile(self, program):
+        """Verifica, resuelve y compila program; lanza ExecutionError si no se puede ejecutar"""
+        resolver = preparar(program)
+        bytecode = self.bytecode
+        self._funciones = resolver.functions
+        bytecode.global_names = [None] * resolver.global_count
+
+        globales = [decl for decl in program.declarations if isinstance(decl, VarDeclNode)]
+        # Todas las globales valen 0 de su tipo antes del primer inicializador
+        for decl in globales:
+            bytecode.global_names[decl.slot] = decl.var_name
+            self.emit(CONST, self.constante(CERO[decl.var_type]))
+            self.emit(STORE_GLOBAL, decl.slot)
+        for decl in globales:
+            self.visit_var_decl(decl)
+        self.emit(CALL, resolver.function_index['main'])
+        self.emit(HALT)
+
+        for info in resolver.functions:
+            decl = info.decl
+            bytecode.functions.append(FunctionCode(decl.func_name, self.etiqueta(),
+                                                   len(decl.params), info.frame_size))
+            self._retorno = decl.return_type
+            self.visit(decl.body)
+            self.emit(CONST, self.constante(CERO[decl.return_type]))
+            self.emit(RETURN)
+        return bytecode
+
+    def emit(self, op, arg=0):
+        """Agrega una instrucción; devuelve la posición de su argumento"""
+        code = self.code
+        n = len(code)
+        if (op in FUSIONADAS and n and code[n - 2] == LOAD_LOCAL and n not in self._destinos
+                and code[n - 1] < MAX_PRIMERO and arg < MAX_SEGUNDO):
+            code[n - 2] = FUSIONADAS[op]
+            code[n - 1] |= arg << 16
+            return n - 1
+        code.append(op)
+        code.append(arg)
+        return n + 1
+
+    def etiqueta(self):
+        """Posición de la próxima instrucción, marcada como destino de un salto"""
+        self._destinos.add(len(self.code))
+        return len(self.code)
+
+    def parchear(self, saltos, destino=None):
+        """Hace que los saltos apunten a destino (por defecto, a lo próximo que se emita)"""
+        if destino is None:
+            destino = self.etiqueta()
+        for salto in saltos:
+            self.code[salto] = destino
+
+    def constante(self, valor):
+        # Por texto y no por igualdad: 1 == 1.0 y 0.0 == -0.0
+        clave = (valor.__class__, repr(valor))
+        indice = self._constantes.get(clave)
+        if indice is None:
+            indice = self._constantes[clave] = len(self.bytecode.consts)
+            self.bytecode.consts.append(valor)
+        return indice
+
+    def convertir(self, expr, destino):
+        """Compila expr y, si destino es float y expr es int, la convierte"""
+        self.visit(expr)
+        if destino == 'float' and expr.expr_type == 'int':
+            self.emit(TO_FLOAT)
+
+    def saltos(self, node, cuando):
+        """Compila node como condición.
+
+        Devuelve los saltos, a parchear por el llamador, que se toman cuando
+        el valor de verdad de node es cuando; si no, la ejecución sigue.
+        """
+        if isinstance(node, BinaryOpNode) and node.op in ('&&', '||'):
+            # a && b es falso si a o b lo es; a || b es verdadero si a o b lo es
+            corta = node.op == '||'
+            if cuando == corta:
+                return self.saltos(node.left, cuando) + self.saltos(node.right, cuando)
+            siguen = self.saltos(node.left, corta)
+            tomados = self.saltos(node.right, cuando)
+            self.parchear(siguen)
+            return tomados
+        if isinstance(node, UnaryOpNode) and node.op == '!':
+            return self.saltos(node.expr, not cuando)
+        self.visit(node)
+        return [self.emit(JUMP_IF_TRUE if cuando else JUMP_IF_FALSE)]
+
+    # --- Sentencias ---
+
+    def visit_var_decl(self, node):
+        if node.init_expr is None:
+            self.emit(CONST, self.constante(CERO[node.var_type]))
+        else:
+            if node.self_ref:
+                # La posición puede traer el valor de un bloque hermano
+                self.emit(CONST, self.constante(CERO[node.var_type]))
+                self.emit(STORE_LOCAL, node.slot)
+            self.convertir(node.init_expr, node.var_type)
+        self.emit(STORE_GLOBAL if node.frame == 0 else STORE_LOCAL, node.slot)
+
+    def visit_block(self, node):
+        for stmt in node.statements:
+            self.visit(stmt)
+
+    def visit_statement(self, node):
+        if node is not None:
+            self.visit(node)
+
+    def visit_expr_stmt(self, node):
+        if isinstance(node.expr, AssignNode):
+            self.asignar(node.expr)
+        elif not isinstance(node.expr, EmptyExprNode):
+            self.visit(node.expr)
+            self.emit(POP)
+
+    def visit_if(self, node):
+        falsos = self.saltos(node.condition, False)
+        self.visit_statement(node.then_stmt)
+        if node.else_stmt is not None:
+            fin = self.emit(JUMP)
+            self.parchear(falsos)
+            self.visit_statement(node.else_stmt)
+            self.parchear([fin])
+        else:
+            self.parchear(falsos)
+
+    def visit_while(self, node):
+        # La condición va al final: una sola instrucción de salto por vuelta
+        condicion = self.emit(JUMP)
+        cuerpo = self.etiqueta()
+        self.visit_statement(node.body)
+        self.parchear([condicion])
+        self.parchear(self.saltos(node.condition, True), cuerpo)
+
+    def visit_for(self, node):
+        self.visit_expr_stmt(ExprStmtNode(node.init_expr))
+        condicion = self.emit(JUMP)
+        cuerpo = self.etiqueta()
+        self.visit_statement(node.body)
+        self.visit_expr_stmt(ExprStmtNode(node.update_expr))
+        self.parchear([condicion])
+        if isinstance(node.condition, EmptyExprNode):
+            self.emit(JUMP, cuerpo)
+        else:
+            self.parchear(self.saltos(node.condition, True), cuerpo)
+
+    def visit_return(self, node):
+        if isinstance(node.expr, EmptyExprNode):
+            self.emit(CONST, self.constante(None))
+        else:
+            self.convertir(node.expr, self._retorno)
+        self.emit(RETURN)
+
+    def visit_print(self, node):
+        self.visit(node.expr)
+        tipo = node.expr.expr_type
+        if tipo == 'float':
+            self.emit(PRINT_FLOAT)
+        elif tipo == 'void':
+            self.emit(POP)
+        else:
+            self.emit(PRINT_INT)
+
+    # --- Expresiones ---
+
+    def visit_num(self, node):
+        self.emit(CONST, self.constante(node.value))
+
+    def visit_var(self, node):
+        self.emit(LOAD_GLOBAL if node.frame == 0 else LOAD_LOCAL, node.slot)
+
+    def asignar(self, node, valor=False):
+        """Asignación; con valor=True deja además el valor asignado en la pila"""
+        self.convertir(node.expr, node.expr_type)
+        if valor:
+            self.emit(DUP)
+        self.emit(STORE_GLOBAL if node.frame == 0 else STORE_LOCAL, node.slot)
+
+    def visit_assign(self, node):
+        self.asignar(node, valor=True)
+
+    def visit_binary_op(self, node):
+        op = node.op
+        if op == '&&' or op == '||':
+            falsos = self.saltos(node, False)
+            self.emit(CONST, self.constante(1))
+            fin = self.emit(JUMP)
+            self.parchear(falsos)
+            self.emit(CONST, self.constante(0))
+            self.parchear([fin])
+            return
+        self.visit(node.left)
+        self.visit(node.right)
+        if op == '/':
+            self.emit(DIV_INT if node.expr_type == 'int' else DIV_FLOAT)
+        elif op == '%':
+            self.emit(MOD_INT if node.expr_type == 'int' else MOD_FLOAT)
+        else:
+            self.emit(BINARIOS[op])
+
+    def visit_unary_op(self, node):
+        if node.op == '-' and isinstance(node.expr, NumNode):
+            self.emit(CONST, self.constante(-node.expr.value))
+            return
+        self.visit(node.expr)
+        self.emit(NOT if node.op == '!' else NEG)
+
+    def visit_func_call(self, node):
+        params = self._funciones[node.func_index].decl.params
+        for arg, param in zip(node.args, params):
+            self.convertir(arg, param.param_type)
+        self.emit(CALL, node.func_index)
+
+
+def compile_program(program):
+    """Bytecode de program; lanza ExecutionError si no se puede ejecutar"""
+    return BytecodeCompiler().compile(program)
+
+
+def disassemble(bytecode):
+    """Listado legible del bytecode, una instrucción por línea"""
+    entradas = {f.entry: f for f in bytecode.functions}
+    code = bytecode.code
+    lines = ["<inicio>:"]
+    for pc in range(0, len(code), 2):
+        if pc in entradas:
+            f = entradas[pc]
+            lines.append("")
+            lines.append(f"{f.name}: {f.n_params} parámetros, marco de {f.frame_size}")
+        op, arg = code[pc], code[pc + 1]
+        linea = f"  {pc:>5}  {OPCODE_NAMES[op]:<16}"
+        if op in (LOAD_LOCAL_CONST, LOAD_LOCAL2):
+            primero, segundo = arg & (MAX_PRIMERO - 1), arg >> 16
+            linea += f"{primero:>5} {segundo}"
+            if op == LOAD_LOCAL_CONST:
+                linea += f"   ({bytecode.consts[segundo]!r})"
+        elif op in CON_ARGUMENTO:
+            linea += f"{arg:>5}"
+            if op == CONST:
+                linea += f"   ({bytecode.consts[arg]!r})"
+            elif op in (LOAD_GLOBAL, STORE_GLOBAL):
+                linea += f"   ({bytecode.global_names[arg]})"
+            elif op == CALL:
+                linea += f"   ({bytecode.functions[arg].name})"
+        lines.append(linea.rstrip())
+    return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python bytecode.py <archivo_fuente>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        parser = ParserAST(Lexer().tokenize(src))
+        ast = parser.parse()
+        if parser.errors:
+            sys.exit(1)
+        bytecode = compile_program(ast)
+        print(disassemble(bytecode))
+        print(f"\n{len(bytecode.code) // 2} instrucciones, {len(bytecode.consts)} constantes")
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
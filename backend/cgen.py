@@ -0,0 +1,487 @@
+"""Generación de C99 a partir del AST verificado.
+
+CEmitter traduce el programa a un archivo C: int es long long (long es de
+32 bits en algunas plataformas), float es double y print llama a printf. El
+archivo se compila con el compilador del sistema ($CC, o cc, gcc o clang) y
+el ejecutable corre como un proceso aparte.
+
+La semántica es la de interpreter.py, con dos diferencias inevitables:
+- los int son de 64 bits: un desborde da la vuelta (se compila con -fwrapv)
+  en lugar de crecer como en Python;
+- la recursión la limita la pila del proceso, no LIMITE_RECURSION: una
+  recursión demasiado profunda termina con SIGSEGV, que se informa con el
+  mismo error que en los demás backends, pero se pierde lo que el programa
+  había impreso y seguía en el buffer de stdout.
+
+C no fija el orden en que se evalúan los operandos de un operador o los
+argumentos de una llamada, y modificar una variable y leerla sin un punto de
+secuencia es comportamiento indefinido. Cuando un operando tiene efectos
+(asignaciones o llamadas) y el otro no es una constante, el primero se guarda
+en un temporal con el operador coma: (t1 = a, t1 + b) evalúa a antes que b,
+como los demás backends.
+
+Nombres en el C generado: f_<nombre> las funciones, g_<nombre> las globales,
+l<slot>_<nombre> las locales, como en transpiler.py, y t<n> los temporales.
+"""
+import sys
+import os
+import math
+import time
+import shutil
+import signal
+import subprocess
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from visitor import NodeVisitor
+from interpreter import ExecutionError, preparar
+
+CFLAGS = ("-std=c99", "-O2", "-fwrapv")
+LIBS = ("-lm",)
+
+TIPOS_C = {'int': 'long long', 'float': 'double', 'void': 'void', 'bool': 'long long'}
+
+MAX_ENTERO = (1 << 63) - 1
+
+SANGRIA = "    "
+
+# Funciones de apoyo de todo programa generado. Los errores de ejecución
+# salen por stderr con código 1, y el mensaje es el de los demás backends.
+PRELUDIO = r"""#include <stdio.h>
+#include <stdlib.h>
+#include <math.h>
+
+static void error_ejecucion(const char *mensaje) {
+    fflush(stdout);
+    fprintf(stderr, "%s\n", mensaje);
+    exit(1);
+}
+
+static long long div_i(long long a, long long b) {
+    if (b == 0) error_ejecucion("División por cero");
+    if (b == -1) return -a;
+    return a / b;
+}
+
+static long long mod_i(long long a, long long b) {
+    if (b == 0) error_ejecucion("División por cero");
+    if (b == -1) return 0;
+    return a % b;
+}
+
+static double div_f(double a, double b) {
+    if (b == 0) error_ejecucion("División por cero");
+    return a / b;
+}
+
+static double mod_f(double a, double b) {
+    if (b == 0) error_ejecucion("División por cero");
+    return fmod(a, b);
+}
+
+static void print_i(long long v) {
+    printf("%lld\n", v);
+}
+
+static void print_f(double v) {
+    if (isnan(v)) puts("nan");
+    else printf("%g\n", v);
+}
+"""
+
+
+def tipo_c(tipo):
+    return TIPOS_C[tipo]
+
+
+class CEmitter(NodeVisitor):
+    """Genera el texto C de un ProgramNode resuelto.
+
+    Las sentencias agregan líneas a self.lines; las expresiones devuelven su
+    texto entre paréntesis. main() de C inicializa las globales en orden de
+    declaración y llama a f_main.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self._nivel = 0
+        self._infos = []
+        self._temporales = []
+        self._efectos = {}
+
+    def emit_program(self, program):
+        """Verifica, resuelve y traduce program; lanza ExecutionError si no se puede ejecutar"""
+        resolver = preparar(program)
+        self._infos = resolver.functions
+        self.lines = PRELUDIO.split("\n")
+
+        globales = [decl for decl in program.declarations if isinstance(decl, VarDeclNode)]
+        for decl in globales:
+            self.linea(f"static {tipo_c(decl.var_type)} {self.nombre(decl)} = 0;")
+        self.linea("")
+        for info in resolver.functions:
+            self.linea(self.firma(info.decl) + ";")
+        self.linea("")
+        for info in resolver.functions:
+            self.funcion(info.decl)
+
+        main = resolver.functions[resolver.function_index['main']].decl
+        self.linea("int main(void) {")
+        self._nivel += 1
+        inicio = len(self.lines)
+        self._temporales = []
+        for decl in globales:
+            self.visit(decl)
+        self.linea(f"f_{main.func_name}();")
+        self.linea("return 0;")
+        self.declarar_temporales(inicio)
+        self._nivel -= 1
+        self.linea("}")
+        return "\n".join(self.lines) + "\n"
+
+    def firma(self, decl):
+        params = ", ".join(f"{tipo_c(p.param_type)} l{i}_{p.param_name}"
+                           for i, p in enumerate(decl.params)) or "void"
+        return f"static {tipo_c(decl.return_type)} f_{decl.func_name}({params})"
+
+    def funcion(self, decl):
+        self.linea(self.firma(decl) + " {")
+        inicio = len(self.lines)
+        self._temporales = []
+        self.bloque(decl.body)
+        self._nivel += 1
+        if decl.return_type != 'void':
+            self.linea("return 0;")
+        self.declarar_temporales(inicio)
+        self._nivel -= 1
+        self.linea("}")
+        self.linea("")
+
+    def declarar_temporales(self, inicio):
+        declaraciones = [SANGRIA * self._nivel + f"{tipo} t{i};"
+                         for i, tipo in enumerate(self._temporales)]
+        self.lines[inicio:inicio] = declaraciones
+
+    def temporal(self, tipo):
+        """Nombre de un temporal nuevo de la función en curso"""
+        self._temporales.append(tipo_c(tipo))
+        return f"t{len(self._temporales) - 1}"
+
+    def linea(self, texto):
+        self.lines.append(SANGRIA * self._nivel + texto if texto else "")
+
+    def bloque(self, node):
+        """Cuerpo entre llaves de una sentencia compuesta: una declaración
+        suelta no es una sentencia en C"""
+        self._nivel += 1
+        if isinstance(node, BlockNode):
+            for stmt in node.statements:
+                self.visit(stmt)
+        elif node is not None:
+            self.visit(node)
+        self._nivel -= 1
+
+    def nombre(self, node):
+        """Nombre en C de la variable de node"""
+        if node.frame == 0:
+            return f"g_{node.var_name}"
+        return f"l{node.slot}_{node.var_name}"
+
+    def efectos(self, node):
+        """Si evaluar node puede asignar una variable o llamar a una función"""
+        clave = id(node)
+        resultado = self._efectos.get(clave)
+        if resultado is None:
+            if isinstance(node, (AssignNode, FuncCallNode)):
+                resultado = True
+            elif isinstance(node, BinaryOpNode):
+                resultado = self.efectos(node.left) or self.efectos(node.right)
+            elif isinstance(node, UnaryOpNode):
+                resultado = self.efectos(node.expr)
+            else:
+                resultado = False
+            self._efectos[clave] = resultado
+        return resultado
+
+    @staticmethod
+    def constante(node):
+        return isinstance(node, NumNode) or (
+            isinstance(node, UnaryOpNode) and node.op == '-' and isinstance(node.expr, NumNode))
+
+    # --- Sentencias ---
+
+    def visit_var_decl(self, node):
+        valor = "0" if node.init_expr is None else self.visit(node.init_expr)
+        if node.frame == 0:
+            self.linea(f"{self.nombre(node)} = {valor};")
+        elif node.self_ref:
+            # Leer la variable en su propio inicializador sería leer una
+            # automática sin valor: vale 0, como en los demás backends
+            self.linea(f"{tipo_c(node.var_type)} {self.nombre(node)} = 0;")
+            self.linea(f"{self.nombre(node)} = {valor};")
+        else:
+            self.linea(f"{tipo_c(node.var_type)} {self.nombre(node)} = {valor};")
+
+    def visit_block(self, node):
+        self.linea("{")
+        self._nivel += 1
+        for stmt in node.statements:
+            self.visit(stmt)
+        self._nivel -= 1
+        self.linea("}")
+
+    def visit_expr_stmt(self, node):
+        if not isinstance(node.expr, EmptyExprNode):
+            self.linea(self.visit(node.expr) + ";")
+
+    def visit_if(self, node, palabra="if"):
+        self.linea(f"{palabra} ({self.visit(node.condition)}) {{")
+        self.bloque(node.then_stmt)
+        else_stmt = node.else_stmt
+        if isinstance(else_stmt, IfNode):
+            # El else if cierra la llave al terminar
+            self.visit_if(else_stmt, "} else if")
+            return
+        if else_stmt is not None:
+            self.linea("} else {")
+            self.bloque(else_stmt)
+        self.linea("}")
+
+    def visit_while(self, node):
+        self.linea(f"while ({self.visit(node.condition)}) {{")
+        self.bloque(node.body)
+        self.linea("}")
+
+    def visit_for(self, node):
+        inicial = "" if isinstance(node.init_expr, EmptyExprNode) else self.visit(node.init_expr)
+        condicion = "" if isinstance(node.condition, EmptyExprNode) else self.visit(node.condition)
+        actualizar = "" if isinstance(node.update_expr, EmptyExprNode) else self.visit(node.update_expr)
+        self.linea(f"for ({inicial}; {condicion}; {actualizar}) {{")
+        self.bloque(node.body)
+        self.linea("}")
+
+    def visit_return(self, node):
+        if isinstance(node.expr, EmptyExprNode):
+            self.linea("return;")
+        else:
+            self.linea(f"return {self.visit(node.expr)};")
+
+    def visit_print(self, node):
+        valor = self.visit(node.expr)
+        tipo = node.expr.expr_type
+        if tipo == 'void':
+            self.linea(valor + ";")
+        elif tipo == 'float':
+            self.linea(f"print_f({valor});")
+        else:
+            self.linea(f"print_i({valor});")
+
+    # --- Expresiones ---
+
+    def visit_empty_expr(self, node):
+        return "0"
+
+    def visit_num(self, node):
+        valor = node.value
+        if isinstance(valor, float):
+            if not math.isfinite(valor):
+                return "HUGE_VAL"
+            return repr(valor)
+        if valor > MAX_ENTERO:
+            raise ExecutionError(f"El entero {valor} no cabe en long long")
+        return f"{valor}LL"
+
+    def visit_var(self, node):
+        return self.nombre(node)
+
+    def visit_assign(self, node):
+        valor = self.visit(node.expr)
+        nombre = self.nombre(node)
+        if self.efectos(node.expr):
+            # x = (x = 3) + 1 modifica x dos veces sin punto de secuencia
+            t = self.temporal(node.expr.expr_type)
+            return f"({t} = {valor}, {nombre} = {t})"
+        return f"({nombre} = {valor})"
+
+    def visit_binary_op(self, node):
+        op = node.op
+        izquierdo = self.visit(node.left)
+        derecho = self.visit(node.right)
+        if op == '&&' or op == '||':
+            # Ya evalúan en orden y en cortocircuito
+            return f"({izquierdo} {op} {derecho})"
+
+        if ((self.efectos(node.left) and not self.constante(node.right))
+                or (self.efectos(node.right) and not self.constante(node.left))):
+            t = self.temporal(node.left.expr_type)
+            prefijo = f"{t} = {izquierdo}, "
+            izquierdo = t
+        else:
+            prefijo = ""
+
+        if op == '/':
+            texto = f"div_{'f' if node.expr_type == 'float' else 'i'}({izquierdo}, {derecho})"
+        elif op == '%':
+            texto = f"mod_{'f' if node.expr_type == 'float' else 'i'}({izquierdo}, {derecho})"
+        else:
+            texto = f"{izquierdo} {op} {derecho}"
+        return f"({prefijo}{texto})"
+
+    def visit_unary_op(self, node):
+        return f"({node.op}{self.visit(node.expr)})"
+
+    def visit_func_call(self, node):
+        args = [self.visit(arg) for arg in node.args]
+        variables = [arg for arg in node.args if not self.constante(arg)]
+        if len(variables) > 1 and any(self.efectos(arg) for arg in variables):
+            params = self._infos[node.func_index].decl.params
+            asignaciones = []
+            for i, (arg, param) in enumerate(zip(node.args, params)):
+                if not self.constante(arg):
+                    t = self.temporal(param.param_type)
+                    asignaciones.append(f"{t} = {args[i]}")
+                    args[i] = t
+            return f"({', '.join(asignaciones)}, f_{node.func_name}({', '.join(args)}))"
+        return f"f_{node.func_name}({', '.join(args)})"
+
+
+def generate_c(program):
+    """Texto C de program; lanza ExecutionError si no se puede ejecutar"""
+    return CEmitter().emit_program(program)
+
+
+def find_compiler():
+    """Ruta del compilador de C: $CC, o el primero de cc, gcc y clang; None si no hay"""
+    for nombre in (os.environ.get("CC"), "cc", "gcc", "clang"):
+        if nombre:
+            ruta = shutil.which(nombre)
+            if ruta is not None:
+                return ruta
+    return None
+
+
+def build(texto_c, directorio, compilador=None, fuente=None):
+    """Escribe el C en fuente (programa.c en directorio si no se indica) y lo
+    compila en directorio.
+
+    Devuelve (ruta del ejecutable, segundos de compilación); lanza
+    ExecutionError si no hay compilador o si falla.
+    """
+    compilador = compilador or find_compiler()
+    if compilador is None:
+        raise ExecutionError("No se encontró un compilador de C (defina CC)")
+    fuente = fuente or os.path.join(directorio, "programa.c")
+    ejecutable = os.path.join(directorio, "programa")
+    with open(fuente, "w", encoding="utf-8") as f:
+        f.write(texto_c)
+    inicio = time.perf_counter()
+    resultado = subprocess.run([compilador, *CFLAGS, fuente, "-o", ejecutable, *LIBS],
+                               capture_output=True, text=True)
+    segundos = time.perf_counter() - inicio
+    if resultado.returncode != 0:
+        raise ExecutionError(f"Falló la compilación de C:\n{resultado.stderr.strip()}")
+    return ejecutable, segundos
+
+
+def run_executable(ejecutable, out=None):
+    """Ejecuta el programa compilado; devuelve los segundos de ejecución.
+
+    Con out, la salida se junta y se escribe ahí; si no, va directo a la
+    salida estándar. Lanza ExecutionError si el programa termina con error.
+    """
+    inicio = time.perf_counter()
+    resultado = subprocess.run([ejecutable], stdout=None if out is None else subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    segundos = time.perf_counter() - inicio
+    if out is not None:
+        out.write(resultado.stdout)
+    if resultado.returncode < 0:
+        senal = signal.Signals(-resultado.returncode).name
+        if senal == "SIGSEGV":
+            raise ExecutionError("Recursión demasiado profunda")
+        raise ExecutionError(f"El programa terminó con la señal {senal}")
+    if resultado.returncode != 0:
+        raise ExecutionError(resultado.stderr.strip())
+    return segundos
+
+
+def run_c(program, out=None, fuente=None):
+    """Genera, compila y ejecuta program en un directorio temporal.
+
+    Con fuente, el C se escribe en esa ruta y se conserva. Si no, queda en el
+    directorio temporal, salvo que falle la compilación: entonces se guarda
+    en un archivo aparte, para que los errores del compilador apunten a un
+    archivo que existe. Devuelve (segundos de compilación, segundos de
+    ejecución).
+    """
+    texto_c = generate_c(program)
+    with tempfile.TemporaryDirectory(prefix="compilador_c_") as directorio:
+        try:
+            ejecutable, t_compilacion = build(texto_c, directorio, fuente=fuente)
+        except ExecutionError as e:
+            temporal = os.path.join(directorio, "programa.c")
+            if fuente is not None or not os.path.exists(temporal):
+                raise
+            descriptor, conservado = tempfile.mkstemp(prefix="compilador_", suffix=".c")
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                f.write(texto_c)
+            mensaje = str(e).replace(temporal, conservado)
+            raise ExecutionError(f"{mensaje}\nEl C generado quedó en {conservado}") from None
+        if out is None:
+            sys.stdout.flush()
+        t_ejecucion = run_executable(ejecutable, out)
+    return t_compilacion, t_ejecucion
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python cgen.py <archivo_fuente> [--run] [--emit-c <archivo.c>]", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        parser = ParserAST(Lexer().tokenize(src))
+        ast = parser.parse()
+        if parser.errors:
+            # parse() ya los informó
+            sys.exit(1)
+        fuente = None
+        if "--emit-c" in sys.argv:
+            i = sys.argv.index("--emit-c")
+            if i + 1 >= len(sys.argv):
+                print("--emit-c requiere la ruta del archivo C", file=sys.stderr)
+                sys.exit(1)
+            fuente = sys.argv[i + 1]
+        if "--run" in sys.argv[2:]:
+            t_compilacion, t_ejecucion = run_c(ast, fuente=fuente)
+            print(f"Compilación C: {t_compilacion * 1000:.1f} ms, ejecución: {t_ejecucion * 1000:.1f} ms",
+                  file=sys.stderr)
+        elif fuente is not None:
+            with open(fuente, "w", encoding="utf-8") as f:
+                f.write(generate_c(ast))
+        else:
+            print(generate_c(ast), end="")
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
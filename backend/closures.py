@@ -0,0 +1,453 @@
+"""Compilación del AST verificado a closures de Python.
+
+Cada nodo se recorre una sola vez y se convierte en una función especializada
+para su operador, sus tipos y el lugar de sus variables: un BinaryOpNode int
+con '+' queda como lambda f: l(f) + r(f), y si el lado derecho es un número,
+como lambda f: l(f) + c. Ejecutar es llamar a la closure raíz, sin despacho
+por clase de nodo ni lectura de atributos del AST.
+
+Todas las closures reciben f, el marco de la función en curso; las globales
+son una lista capturada. Las expresiones devuelven su valor. Las sentencias
+que pueden ejecutar un return devuelven None o (valor,), como en el
+intérprete; las demás devuelven cualquier cosa y quien las llama lo ignora.
+Las conversiones int -> float se deciden al compilar, como en bytecode.py.
+La semántica es la de interpreter.py.
+"""
+import sys
+import os
+import math
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from visitor import NodeVisitor
+from interpreter import (ExecutionError, BUFFER_SALIDA, LIMITE_RECURSION, CERO, con_pila,
+                         dividir, resto, preparar)
+
+
+def _resto_real(a, b):
+    if b == 0:
+        raise ZeroDivisionError("resto por cero")
+    return math.fmod(a, b)
+
+
+# Operador -> constructor de la closure. Los '/' y '%' enteros y reales se
+# separan porque el tipo ya se conoce al compilar.
+BINARIAS = {
+    '+': lambda l, r: lambda f: l(f) + r(f),
+    '-': lambda l, r: lambda f: l(f) - r(f),
+    '*': lambda l, r: lambda f: l(f) * r(f),
+    '<': lambda l, r: lambda f: l(f) < r(f),
+    '<=': lambda l, r: lambda f: l(f) <= r(f),
+    '>': lambda l, r: lambda f: l(f) > r(f),
+    '>=': lambda l, r: lambda f: l(f) >= r(f),
+    '==': lambda l, r: lambda f: l(f) == r(f),
+    '!=': lambda l, r: lambda f: l(f) != r(f),
+    'int/': lambda l, r: lambda f: dividir(l(f), r(f)),
+    'float/': lambda l, r: lambda f: l(f) / r(f),
+    'int%': lambda l, r: lambda f: resto(l(f), r(f)),
+    'float%': lambda l, r: lambda f: _resto_real(l(f), r(f)),
+    '&&': lambda l, r: lambda f: 1 if l(f) and r(f) else 0,
+    '||': lambda l, r: lambda f: 1 if l(f) or r(f) else 0,
+}
+
+# Lo mismo con el lado derecho constante
+CON_CONSTANTE = {
+    '+': lambda l, c: lambda f: l(f) + c,
+    '-': lambda l, c: lambda f: l(f) - c,
+    '*': lambda l, c: lambda f: l(f) * c,
+    '<': lambda l, c: lambda f: l(f) < c,
+    '<=': lambda l, c: lambda f: l(f) <= c,
+    '>': lambda l, c: lambda f: l(f) > c,
+    '>=': lambda l, c: lambda f: l(f) >= c,
+    '==': lambda l, c: lambda f: l(f) == c,
+    '!=': lambda l, c: lambda f: l(f) != c,
+}
+
+# Y con el izquierdo una local y el derecho constante: i < 10, j + 1
+LOCAL_CONSTANTE = {
+    '+': lambda i, c: lambda f: f[i] + c,
+    '-': lambda i, c: lambda f: f[i] - c,
+    '*': lambda i, c: lambda f: f[i] * c,
+    '<': lambda i, c: lambda f: f[i] < c,
+    '<=': lambda i, c: lambda f: f[i] <= c,
+    '>': lambda i, c: lambda f: f[i] > c,
+    '>=': lambda i, c: lambda f: f[i] >= c,
+    '==': lambda i, c: lambda f: f[i] == c,
+    '!=': lambda i, c: lambda f: f[i] != c,
+}
+
+
+def sin_valor(sentencia):
+    """Closure que ejecuta sentencia y devuelve None"""
+    def s(f):
+        sentencia(f)
+    return s
+
+
+class ClosureCompiler(NodeVisitor):
+    """Convierte un ProgramNode ya resuelto en una closure que lo ejecuta.
+
+    compile(program) devuelve la closure raíz: llamarla inicializa las
+    globales, ejecuta main() y devuelve su valor.
+    """
+
+    def __init__(self, out=None):
+        super().__init__()
+        self.out = out if out is not None else sys.stdout
+        self.salida = []
+        self.globales = []
+        self.funciones = []
+        self._infos = []
+        self._retorno = None
+        self._returns = 0
+
+    def compile(self, program):
+        """Verifica, resuelve y compila program; lanza ExecutionError si no se puede ejecutar"""
+        resolver = preparar(program)
+        self._infos = resolver.functions
+        self.globales = [0] * resolver.global_count
+        # Las llamadas buscan aquí la función al ejecutarse: así una función
+        # puede llamar a otra que todavía no se compiló, o a sí misma
+        self.funciones = [None] * len(resolver.functions)
+        for info in resolver.functions:
+            self.funciones[info.index] = self.funcion(info)
+
+        declaraciones = [decl for decl in program.declarations if isinstance(decl, VarDeclNode)]
+        iniciales = tuple(self.visit(decl) for decl in declaraciones)
+        ceros = [0] * resolver.global_count
+        for decl in declaraciones:
+            ceros[decl.slot] = CERO[decl.var_type]
+        main = self.funciones[resolver.function_index['main']]
+        globales = self.globales
+        flush = self.flush
+
+        def ejecutar():
+            limite = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(limite, LIMITE_RECURSION))
+            try:
+                # Todas las globales valen 0 antes del primer inicializador
+                globales[:] = ceros
+                for inicial in iniciales:
+                    inicial(globales)
+                return main([])
+            except ZeroDivisionError:
+                raise ExecutionError("División por cero")
+            except RecursionError:
+                raise ExecutionError("Recursión demasiado profunda")
+            finally:
+                sys.setrecursionlimit(limite)
+                flush()
+        return lambda: con_pila(ejecutar)
+
+    def funcion(self, info):
+        """Closure que ejecuta la función de info sobre un marco con sus argumentos"""
+        decl = info.decl
+        self._retorno = decl.return_type
+        antes = self._returns
+        body = self.visit(decl.body)
+        relleno = [0] * (info.frame_size - len(decl.params))
+        cero = CERO[decl.return_type]
+
+        if self._returns == antes:
+            def llamar(marco):
+                marco += relleno
+                body(marco)
+                return cero
+            return llamar
+
+        def llamar(marco):
+            marco += relleno
+            resultado = body(marco)
+            return cero if resultado is None else resultado[0]
+        return llamar
+
+    def flush(self):
+        if self.salida:
+            self.out.write("\n".join(self.salida) + "\n")
+            self.salida.clear()
+
+    def sentencia(self, node):
+        """(closure de node, si puede ejecutar un return)"""
+        antes = self._returns
+        closure = self.visit(node)
+        return closure, self._returns != antes
+
+    def convertir(self, expr, destino):
+        """Closure de expr, convertida a float si destino lo es y expr es int"""
+        closure = self.visit(expr)
+        if destino == 'float' and expr.expr_type == 'int':
+            return lambda f: float(closure(f))
+        return closure
+
+    # --- Sentencias ---
+
+    def visit_var_decl(self, node):
+        slot = node.slot
+        if node.init_expr is None:
+            valor = CERO[node.var_type]
+
+            def declarar(f):
+                f[slot] = valor
+        elif node.self_ref:
+            # El inicializador lee la variable: la posición puede traer el
+            # valor de una variable de un bloque hermano
+            inicial = self.convertir(node.init_expr, node.var_type)
+            cero = CERO[node.var_type]
+
+            def declarar(f):
+                f[slot] = cero
+                f[slot] = inicial(f)
+        else:
+            inicial = self.convertir(node.init_expr, node.var_type)
+
+            def declarar(f):
+                f[slot] = inicial(f)
+        # Las globales se declaran una vez, al comienzo, con su lista como marco
+        return declarar
+
+    def visit_block(self, node):
+        pares = [self.sentencia(stmt) for stmt in node.statements]
+        if not any(retorna for _, retorna in pares):
+            sentencias = tuple(closure for closure, _ in pares)
+            if len(sentencias) == 1:
+                return sentencias[0]
+
+            def bloque(f):
+                for s in sentencias:
+                    s(f)
+            return bloque
+
+        pares = tuple(pares)
+
+        def bloque(f):
+            for s, retorna in pares:
+                if retorna:
+                    resultado = s(f)
+                    if resultado is not None:
+                        return resultado
+                else:
+                    s(f)
+        return bloque
+
+    def visit_list(self, nodes):
+        # Declaraciones como cuerpo de if, while o for: ninguna retorna
+        declaraciones = tuple(self.visit(node) for node in nodes)
+
+        def declarar(f):
+            for d in declaraciones:
+                d(f)
+        return declarar
+
+    def rama(self, node):
+        """Como sentencia, para una rama de if que puede faltar"""
+        if node is None:
+            return (lambda f: None), False
+        return self.sentencia(node)
+
+    def visit_expr_stmt(self, node):
+        return self.visit(node.expr)
+
+    def visit_if(self, node):
+        condicion = self.visit(node.condition)
+        entonces, retorna_entonces = self.rama(node.then_stmt)
+        sino, retorna_sino = self.rama(node.else_stmt)
+        # Si una rama puede retornar, el if devuelve None o (valor,): la otra
+        # no puede dejar pasar el valor de una expresión
+        if retorna_entonces and not retorna_sino:
+            sino = sin_valor(sino)
+        elif retorna_sino and not retorna_entonces:
+            entonces = sin_valor(entonces)
+
+        if node.else_stmt is None:
+            def si(f):
+                if condicion(f):
+                    return entonces(f)
+            return si
+
+        def si(f):
+            if condicion(f):
+                return entonces(f)
+            return sino(f)
+        return si
+
+    def visit_while(self, node):
+        condicion = self.visit(node.condition)
+        if node.body is None:
+            def mientras(f):
+                while condicion(f):
+                    pass
+            return mientras
+
+        cuerpo, retorna = self.sentencia(node.body)
+        if not retorna:
+            def mientras(f):
+                while condicion(f):
+                    cuerpo(f)
+            return mientras
+
+        def mientras(f):
+            while condicion(f):
+                resultado = cuerpo(f)
+                if resultado is not None:
+                    return resultado
+        return mientras
+
+    def visit_for(self, node):
+        inicial = self.visit(node.init_expr)
+        actualizar = self.visit(node.update_expr)
+        if isinstance(node.condition, EmptyExprNode):
+            condicion = lambda f: True
+        else:
+            condicion = self.visit(node.condition)
+        if node.body is None:
+            cuerpo, retorna = (lambda f: None), False
+        else:
+            cuerpo, retorna = self.sentencia(node.body)
+
+        if not retorna:
+            def para(f):
+                inicial(f)
+                while condicion(f):
+                    cuerpo(f)
+                    actualizar(f)
+            return para
+
+        def para(f):
+            inicial(f)
+            while condicion(f):
+                resultado = cuerpo(f)
+                if resultado is not None:
+                    return resultado
+                actualizar(f)
+        return para
+
+    def visit_return(self, node):
+        self._returns += 1
+        if isinstance(node.expr, EmptyExprNode):
+            return lambda f: (None,)
+        valor = self.convertir(node.expr, self._retorno)
+        return lambda f: (valor(f),)
+
+    def visit_print(self, node):
+        valor = self.visit(node.expr)
+        tipo = node.expr.expr_type
+        if tipo == 'void':
+            return valor
+        texto = (lambda v: format(v, "g")) if tipo == 'float' else (lambda v: str(int(v)))
+        salida = self.salida
+        flush = self.flush
+
+        def imprimir(f):
+            salida.append(texto(valor(f)))
+            if len(salida) >= BUFFER_SALIDA:
+                flush()
+        return imprimir
+
+    # --- Expresiones ---
+
+    def visit_empty_expr(self, node):
+        return lambda f: None
+
+    def visit_num(self, node):
+        valor = node.value
+        return lambda f: valor
+
+    def visit_var(self, node):
+        slot = node.slot
+        if node.frame == 0:
+            globales = self.globales
+            return lambda f: globales[slot]
+        return lambda f: f[slot]
+
+    def visit_assign(self, node):
+        slot = node.slot
+        valor = self.convertir(node.expr, node.expr_type)
+        if node.frame == 0:
+            globales = self.globales
+
+            def asignar(f):
+                v = globales[slot] = valor(f)
+                return v
+            return asignar
+
+        def asignar(f):
+            v = f[slot] = valor(f)
+            return v
+        return asignar
+
+    def visit_binary_op(self, node):
+        op = node.op
+        if op in ('/', '%'):
+            op = ('float' if node.expr_type == 'float' else 'int') + op
+        elif isinstance(node.right, NumNode) and op in CON_CONSTANTE:
+            valor = node.right.value
+            if isinstance(node.left, VarNode) and node.left.frame == 1:
+                return LOCAL_CONSTANTE[op](node.left.slot, valor)
+            return CON_CONSTANTE[op](self.visit(node.left), valor)
+        return BINARIAS[op](self.visit(node.left), self.visit(node.right))
+
+    def visit_unary_op(self, node):
+        if node.op == '-' and isinstance(node.expr, NumNode):
+            valor = -node.expr.value
+            return lambda f: valor
+        expr = self.visit(node.expr)
+        if node.op == '!':
+            return lambda f: 0 if expr(f) else 1
+        return lambda f: -expr(f)
+
+    def visit_func_call(self, node):
+        index = node.func_index
+        funciones = self.funciones
+        params = self._infos[index].decl.params
+        args = tuple(self.convertir(arg, param.param_type) for arg, param in zip(node.args, params))
+        if not args:
+            return lambda f: funciones[index]([])
+        if len(args) == 1:
+            a, = args
+            return lambda f: funciones[index]([a(f)])
+        if len(args) == 2:
+            a, b = args
+            return lambda f: funciones[index]([a(f), b(f)])
+        return lambda f: funciones[index]([a(f) for a in args])
+
+
+def compile_closures(program, out=None):
+    """Closure raíz de program; lanza ExecutionError si no se puede ejecutar"""
+    return ClosureCompiler(out).compile(program)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python closures.py <archivo_fuente>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        parser = ParserAST(Lexer().tokenize(src))
+        ast = parser.parse()
+        if parser.errors:
+            # parse() ya los informó
+            sys.exit(1)
+        compile_closures(ast)()
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Intérprete que recorre el AST verificado.
+
+Antes de ejecutar, Resolver verifica el programa y anota en cada variable su
+marco y posición, así leer o asignar es indexar una lista: frames[0] son las
+globales y frames[1] el marco de la función en curso. Las globales se
+inicializan en orden de declaración y después se llama a main().
+
+Semántica (la misma en todos los backends):
+- int / int y int % int truncan hacia cero, como en C; con un float la
+  división es real y % es fmod. Dividir por cero es un error de ejecución.
+- Un valor int que se guarda en un float (inicialización, asignación,
+  argumento o retorno) se convierte a float.
+- Una variable sin inicializar vale 0 (0.0 si es float); una función que
+  termina sin return devuelve 0 de su tipo. Las globales valen 0 desde el
+  comienzo, antes de cualquier inicializador, y una variable que se lee en
+  su propio inicializador (int b = b + 1) vale 0 en él.
+- Relacionales, &&, || y ! dan 1 o 0; && y || evalúan en cortocircuito.
+- print escribe una línea: los int como enteros, los float con %g. Imprimir
+  una llamada a una función void solo la evalúa.
+- Una recursión más profunda que la que admite el backend es el error de
+  ejecución "Recursión demasiado profunda". El límite es LIMITE_RECURSION
+  marcos de Python: unas 200 000 llamadas anidadas en vm y python, unas
+  40 000 en closures y unas 20 000 aquí, que anida varias visitas por
+  llamada. En C lo fija la pila del proceso.
+"""
+import sys
+import os
+import math
+import operator
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from visitor import NodeVisitor
+from resolver import Resolver
+
+# Líneas de print que se juntan antes de escribirlas de una vez
+BUFFER_SALIDA = 512
+
+# Límite de recursión de Python mientras se ejecuta: cada llamada del programa
+# anida varias visitas
+LIMITE_RECURSION = 200000
+
+# Pila del hilo que ejecuta el programa, holgada para LIMITE_RECURSION marcos
+PILA_EJECUCION = 512 * 1024 * 1024
+
+
+class ExecutionError(Exception):
+    pass
+
+
+def con_pila(funcion):
+    """Llama a funcion() en un hilo con PILA_EJECUCION bytes de pila.
+
+    Hasta Python 3.10 cada llamada de Python también usa pila de C, y la del
+    hilo principal (8 MB habituales) se agota mucho antes que
+    LIMITE_RECURSION: el proceso terminaría con un fallo de segmentación en
+    lugar de RecursionError. Si la plataforma no permite fijar el tamaño, la
+    llama en el hilo actual.
+    """
+    resultado = []
+
+    def ejecutar():
+        try:
+            resultado.append((True, funcion()))
+        except BaseException as e:
+            resultado.append((False, e))
+
+    anterior = threading.stack_size()
+    try:
+        threading.stack_size(PILA_EJECUCION)
+    except (ValueError, RuntimeError):
+        return funcion()
+    try:
+        hilo = threading.Thread(target=ejecutar, daemon=True)
+        hilo.start()
+    finally:
+        threading.stack_size(anterior)
+    hilo.join()
+    correcto, valor = resultado[0]
+    if not correcto:
+        raise valor
+    return valor
+
+
+def dividir(a, b):
+    if a.__class__ is int and b.__class__ is int:
+        cociente = abs(a) // abs(b)
+        return cociente if (a < 0) == (b < 0) else -cociente
+    return a / b
+
+
+def resto(a, b):
+    if a.__class__ is int and b.__class__ is int:
+        return a - b * dividir(a, b)
+    if b == 0:
+        raise ZeroDivisionError("resto por cero")
+    return math.fmod(a, b)
+
+
+def formatear(valor):
+    """Texto que print escribe para valor"""
+    if valor.__class__ is float:
+        return format(valor, "g")
+    return str(int(valor))
+
+
+OPERACIONES = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': dividir, '%': resto,
+    '<': operator.lt, '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne,
+}
+
+CERO = {'int': 0, 'float': 0.0, 'void': None}
+
+
+def preparar(program):
+    """Verifica y resuelve program; devuelve el Resolver o lanza ExecutionError"""
+    resolver = Resolver()
+    if not resolver.analyze(program):
+        raise ExecutionError(f"El programa tiene {len(resolver.errors)} errores semánticos")
+    main = resolver.function_index.get('main')
+    if main is None:
+        raise ExecutionError("No hay una función 'main'")
+    if resolver.functions[main].decl.params:
+        raise ExecutionError("La función 'main' no debe recibir parámetros")
+    return resolver
+
+
+class Interpreter(NodeVisitor):
+    """Ejecuta un ProgramNode recorriendo el AST.
+
+    Las sentencias devuelven None para seguir con la siguiente o (valor,)
+    cuando se ejecutó un return; las expresiones devuelven su valor.
+    """
+
+    def __init__(self, out=None):
+        super().__init__()
+        self.out = out if out is not None else sys.stdout
+        self.salida = []
+        self.frames = [[], []]
+        self.funciones = []
+
+    def run(self, program):
+        """Ejecuta program desde main(); devuelve lo que devuelve main"""
+        resolver = preparar(program)
+        self.funciones = [self.funcion(info) for info in resolver.functions]
+        globales = [decl for decl in program.declarations if isinstance(decl, VarDeclNode)]
+        self.frames = [[0] * resolver.global_count, []]
+        for decl in globales:
+            self.frames[0][decl.slot] = CERO[decl.var_type]
+
+        def ejecutar():
+            limite = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(limite, LIMITE_RECURSION))
+            try:
+                for decl in globales:
+                    self.visit_var_decl(decl)
+                return self.llamar(resolver.function_index['main'], [])
+            except ZeroDivisionError:
+                raise ExecutionError("División por cero")
+            except RecursionError:
+                raise ExecutionError("Recursión demasiado profunda")
+            finally:
+                sys.setrecursionlimit(limite)
+                self.flush()
+        return con_pila(ejecutar)
+
+    def funcion(self, info):
+        """(cuerpo, relleno del marco, parámetros float, devuelve float, valor sin return)"""
+        decl = info.decl
+        reales = tuple(i for i, p in enumerate(decl.params) if p.param_type == 'float')
+        return (decl.body, [0] * (info.frame_size - len(decl.params)), reales,
+                decl.return_type == 'float', CERO[decl.return_type])
+
+    def llamar(self, index, marco):
+        """Ejecuta la función index con los argumentos ya evaluados en marco"""
+        body, relleno, reales, real, cero = self.funciones[index]
+        for i in reales:
+            marco[i] = float(marco[i])
+        marco.extend(relleno)
+        frames = self.frames
+        anterior = frames[1]
+        frames[1] = marco
+        resultado = self.visit(body)
+        frames[1] = anterior
+        if resultado is None:
+            return cero
+        valor = resultado[0]
+        return float(valor) if real else valor
+
+    def flush(self):
+        if self.salida:
+            self.out.write("\n".join(self.salida) + "\n")
+            self.salida = []
+
+    # --- Sentencias ---
+
+    def visit_var_decl(self, node):
+        if node.init_expr is None:
+            valor = CERO[node.var_type]
+        else:
+            if node.self_ref:
+                self.frames[node.frame][node.slot] = CERO[node.var_type]
+            valor = self.visit(node.init_expr)
+            if node.var_type == 'float':
+                valor = float(valor)
+        self.frames[node.frame][node.slot] = valor
+
+    def visit_block(self, node):
+        visit = self.visit
+        for stmt in node.statements:
+            resultado = visit(stmt)
+            if resultado is not None:
+                return resultado
+        return None
+
+    def visit_expr_stmt(self, node):
+        self.visit(node.expr)
+
+    def visit_if(self, node):
+        if self.visit(node.condition):
+            if node.then_stmt is not None:
+                return self.visit(node.then_stmt)
+        elif node.else_stmt is not None:
+            return self.visit(node.else_stmt)
+        return None
+
+    def visit_while(self, node):
+        visit = self.visit
+        condition = node.condition
+        body = node.body
+        if body is None:
+            while visit(condition):
+                pass
+            return None
+        while visit(condition):
+            resultado = visit(body)
+            if resultado is not None:
+                return resultado
+        return None
+
+    def visit_for(self, node):
+        visit = self.visit
+        condition = None if isinstance(node.condition, EmptyExprNode) else node.condition
+        update = node.update_expr
+        body = node.body
+        visit(node.init_expr)
+        while condition is None or visit(condition):
+            if body is not None:
+                resultado = visit(body)
+                if resultado is not None:
+                    return resultado
+            visit(update)
+        return None
+
+    def visit_return(self, node):
+        return (self.visit(node.expr),)
+
+    def visit_print(self, node):
+        valor = self.visit(node.expr)
+        if valor is not None:
+            salida = self.salida
+            salida.append(formatear(valor))
+            if len(salida) >= BUFFER_SALIDA:
+                self.flush()
+
+    # --- Expresiones ---
+
+    def visit_empty_expr(self, node):
+        return None
+
+    def visit_num(self, node):
+        return node.value
+
+    def visit_var(self, node):
+        return self.frames[node.frame][node.slot]
+
+    def visit_assign(self, node):
+        valor = self.visit(node.expr)
+        if node.expr_type == 'float':
+            valor = float(valor)
+        self.frames[node.frame][node.slot] = valor
+        return valor
+
+    def visit_binary_op(self, node):
+        op = node.op
+        if op == '&&':
+            return 1 if self.visit(node.left) and self.visit(node.right) else 0
+        if op == '||':
+            return 1 if self.visit(node.left) or self.visit(node.right) else 0
+        return OPERACIONES[op](self.visit(node.left), self.visit(node.right))
+
+    def visit_unary_op(self, node):
+        valor = self.visit(node.expr)
+        if node.op == '!':
+            return 0 if valor else 1
+        return -valor
+
+    def visit_func_call(self, node):
+        visit = self.visit
+        return self.llamar(node.func_index, [visit(arg) for arg in node.args])
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python interpreter.py <archivo_fuente>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        parser = ParserAST(Lexer().tokenize(src))
+        ast = parser.parse()
+        if parser.errors:
+            # parse() ya los informó
+            sys.exit(1)
+        Interpreter().run(ast)
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
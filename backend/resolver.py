@@ -0,0 +1,149 @@
+"""Resolución de nombres para los backends de ejecución.
+
+Resolver es un SemanticAnalyzer que, además de verificar el programa, anota
+en el AST dónde vive cada variable: frame y slot en VarNode, AssignNode y
+VarDeclNode (marco 0 las globales, 1 las locales de la función que se ejecuta)
+y func_index en FuncCallNode. En una local, VarDeclNode.self_ref indica que
+el inicializador lee la variable que se declara (int b = b + 1): como la
+posición puede traer el valor de un bloque hermano, los backends la ponen en
+0 antes de evaluarlo. Las globales valen 0 desde el comienzo. Las posiciones salen de SymbolTable.resolve, con
+los mismos ámbitos que usa la verificación, así que ejecutar no busca nunca
+un nombre en un diccionario.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from semantic_analyzer import SemanticAnalyzer
+
+
+class FunctionInfo:
+    """Lo que un backend necesita de una función: su declaración, el tamaño de
+    su marco (parámetros más la máxima cantidad de locales vivas a la vez) y
+    su posición en Resolver.functions"""
+    __slots__ = ("decl", "frame_size", "index")
+
+    def __init__(self, decl, frame_size, index):
+        self.decl = decl
+        self.frame_size = frame_size
+        self.index = index
+
+
+class Resolver(SemanticAnalyzer):
+    """Verificación semántica que además anota las posiciones de las variables.
+
+    Después de analyze(program), functions tiene un FunctionInfo por función en
+    orden de declaración (el índice es el func_index de las llamadas) y
+    global_count la cantidad de globales.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.functions = []
+        self.function_index = {}
+        self.global_count = 0
+        self._frame_size = 0
+        self._declarada = None
+
+    def analyze(self, ast, jobs=1):
+        # Las anotaciones se hacen en este proceso: sin pool
+        success = super().analyze(ast)
+        self.global_count = len(self.symbol_table.global_symbols())
+        return success
+
+    def declare_functions(self, declarations):
+        repetidas = super().declare_functions(declarations)
+        for i, decl in enumerate(declarations):
+            if isinstance(decl, FuncDeclNode) and i not in repetidas:
+                self.function_index[decl.func_name] = len(self.functions)
+                self.functions.append(FunctionInfo(decl, 0, len(self.functions)))
+        return repetidas
+
+    def visit_func_body(self, node):
+        self._frame_size = len(node.params)
+        super().visit_func_body(node)
+        index = self.function_index.get(node.func_name)
+        if index is not None and self.functions[index].decl is node:
+            self.functions[index].frame_size = self._frame_size
+
+    def visit_var_decl(self, node, is_global=False):
+        super().visit_var_decl(node, is_global)
+        self.bind(node)
+        if node.frame == 1 and node.slot >= self._frame_size:
+            self._frame_size = node.slot + 1
+
+    def visit_var_init(self, node):
+        # La variable ya está declarada: su posición sirve para reconocer
+        # las lecturas de sí misma en el inicializador
+        self.bind(node)
+        self._declarada = node
+        super().visit_var_init(node)
+        self._declarada = None
+
+    def visit_var(self, node):
+        var_type = super().visit_var(node)
+        self.bind(node)
+        return var_type
+
+    def visit_assign(self, node):
+        var_type = super().visit_assign(node)
+        self.bind(node)
+        return var_type
+
+    def visit_func_call(self, node):
+        return_type = super().visit_func_call(node)
+        node.func_index = self.function_index.get(node.func_name)
+        return return_type
+
+    def bind(self, node):
+        """Anota en node el marco y la posición de node.var_name"""
+        ubicacion = self.symbol_table.resolve(node.var_name)
+        if ubicacion is not None:
+            node.frame, node.slot = ubicacion
+            declarada = self._declarada
+            if (declarada is not None and node is not declarada and declarada.frame == 1
+                    and ubicacion == (declarada.frame, declarada.slot)):
+                declarada.self_ref = True
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python resolver.py <archivo_fuente>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        ast = ParserAST(Lexer().tokenize(src)).parse()
+        resolver = Resolver()
+        success = resolver.analyze(ast)
+        if not success:
+            print(resolver.get_errors_report())
+            sys.exit(1)
+
+        print(f"Globales: {resolver.global_count}")
+        for decl in ast.declarations:
+            if isinstance(decl, VarDeclNode):
+                print(f"  {decl.var_name} -> slot {decl.slot}")
+        print("Funciones:")
+        for info in resolver.functions:
+            print(f"  {info.index}. {info.decl.func_name}: marco de {info.frame_size} slots")
+        sys.exit(0)
+
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+"""Traducción del AST verificado a un módulo de Python.
+
+PythonEmitter escribe el programa como código fuente de Python: cada función
+es una def con sus variables como locales de Python, los bucles son while y
+las condiciones usan and/or/not directamente. El texto se compila con
+compile() y se ejecuta con exec(), así el programa corre a la velocidad del
+propio intérprete de CPython. Requiere Python 3.8: las asignaciones usadas
+como expresión se escriben con :=.
+
+Nombres en el módulo generado (nunca chocan entre sí):
+- f_<nombre> para las funciones y g_<nombre> para las globales;
+- l<slot>_<nombre> para parámetros y locales (el slot de Resolver distingue
+  una variable de otra del mismo nombre que oculta);
+- _div, _mod, _fmod, _salida y _flush los pone el entorno de ejecución.
+
+El objeto código se guarda en disco con marshal, como un .pyc, en un archivo
+cuyo nombre es el hash del texto fuente del programa: con el mismo fuente no
+se vuelve a analizar, traducir ni compilar. Cargar de la caché es ejecutar
+lo que haya en ella, así que es un directorio del usuario (CACHE_DIR) y no se
+usa si otro usuario puede escribir en él. La semántica es la de
+interpreter.py.
+"""
+import sys
+import os
+import math
+import hashlib
+import marshal
+import stat
+import tempfile
+import importlib.util
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from ast_nodes import *
+from visitor import NodeVisitor
+from interpreter import (ExecutionError, BUFFER_SALIDA, LIMITE_RECURSION, CERO, con_pila,
+                         dividir, resto, preparar)
+
+# Cambia cuando cambia el código que se genera: invalida lo guardado
+VERSION = 2
+
+# Directorio de la caché de objetos código: $COMPILADOR_CACHE, o
+# compilador dentro de $XDG_CACHE_HOME (por defecto ~/.cache)
+CACHE_DIR = os.environ.get("COMPILADOR_CACHE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "compilador")
+
+# Encabezado de cada archivo de la caché: magic de esta versión de Python y
+# VERSION, para no cargar código de otro intérprete o de otro emisor
+ENCABEZADO = importlib.util.MAGIC_NUMBER + VERSION.to_bytes(4, "little")
+
+SANGRIA = "    "
+
+
+def _fmod(a, b):
+    if b == 0:
+        raise ZeroDivisionError("resto por cero")
+    return math.fmod(a, b)
+
+
+class PythonEmitter(NodeVisitor):
+    """Genera el texto de un módulo de Python a partir de un ProgramNode resuelto.
+
+    Las sentencias agregan líneas a self.lines; las expresiones devuelven su
+    texto, siempre entre paréntesis cuando combinan operandos. El módulo
+    define las funciones y _programa(), que inicializa las globales, llama a
+    main y devuelve su valor.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self._nivel = 0
+        self._infos = []
+        self._retorno = None
+        self._globales_asignadas = set()
+
+    def emit_program(self, program):
+        """Verifica, resuelve y traduce program; lanza ExecutionError si no se puede ejecutar"""
+        resolver = preparar(program)
+        self._infos = resolver.functions
+        for info in resolver.functions:
+            self.funcion(info.decl)
+
+        globales = [decl for decl in program.declarations if isinstance(decl, VarDeclNode)]
+        self.linea("def _programa():")
+        self._nivel += 1
+        if globales:
+            self.linea("global " + ", ".join(self.nombre(decl) for decl in globales))
+        # Todas las globales valen 0 antes del primer inicializador, que
+        # puede leerlas (int g = g + 1) o llamar a una función que las lee
+        for decl in globales:
+            self.linea(f"{self.nombre(decl)} = {CERO[decl.var_type]!r}")
+        for decl in globales:
+            self.visit(decl)
+        main = resolver.functions[resolver.function_index['main']].decl
+        self.linea(f"return f_{main.func_name}()")
+        self._nivel -= 1
+        return "\n".join(self.lines) + "\n"
+
+    def funcion(self, decl):
+        params = ", ".join(f"l{i}_{p.param_name}" for i, p in enumerate(decl.params))
+        self.linea(f"def f_{decl.func_name}({params}):")
+        self._nivel += 1
+        inicio = len(self.lines)
+        self._retorno = decl.return_type
+        self._globales_asignadas = set()
+        self.visit(decl.body)
+        self.linea(f"return {CERO[decl.return_type]!r}")
+        if self._globales_asignadas:
+            self.lines.insert(inicio, SANGRIA * self._nivel + "global "
+                              + ", ".join(sorted(self._globales_asignadas)))
+        self._nivel -= 1
+        self.linea("")
+
+    def linea(self, texto):
+        self.lines.append(SANGRIA * self._nivel + texto if texto else "")
+
+    def bloque(self, node):
+        """Cuerpo indentado de una sentencia compuesta; pass si queda vacío"""
+        self._nivel += 1
+        n = len(self.lines)
+        if node is not None:
+            self.visit(node)
+        if len(self.lines) == n:
+            self.linea("pass")
+        self._nivel -= 1
+
+    def nombre(self, node):
+        """Nombre en Python de la variable de node"""
+        if node.frame == 0:
+            return f"g_{node.var_name}"
+        return f"l{node.slot}_{node.var_name}"
+
+    def convertir(self, expr, destino):
+        """Texto de expr, convertida a float si destino lo es y expr es int"""
+        texto = self.visit(expr)
+        if destino == 'float' and expr.expr_type == 'int':
+            return f"float({texto})"
+        return texto
+
+    def condicion(self, node):
+        """Texto de node para un if o un while: basta su valor de verdad"""
+        if isinstance(node, BinaryOpNode) and node.op in ('&&', '||'):
+            op = 'and' if node.op == '&&' else 'or'
+            return f"({self.condicion(node.left)} {op} {self.condicion(node.right)})"
+        if isinstance(node, UnaryOpNode) and node.op == '!':
+            return f"(not {self.condicion(node.expr)})"
+        return self.visit(node)
+
+    # --- Sentencias ---
+
+    def visit_var_decl(self, node):
+        if node.init_expr is None:
+            valor = repr(CERO[node.var_type])
+        else:
+            if node.self_ref:
+                # Sin esto sería UnboundLocalError, o el valor de otro bloque
+                self.linea(f"{self.nombre(node)} = {CERO[node.var_type]!r}")
+            valor = self.convertir(node.init_expr, node.var_type)
+        self.linea(f"{self.nombre(node)} = {valor}")
+
+    def visit_block(self, node):
+        for stmt in node.statements:
+            self.visit(stmt)
+
+    def visit_expr_stmt(self, node):
+        expr = node.expr
+        if isinstance(expr, EmptyExprNode):
+            return
+        if isinstance(expr, AssignNode):
+            # Como sentencia no hace falta :=
+            valor = self.convertir(expr.expr, expr.expr_type)
+            self.linea(f"{self.asignado(expr)} = {valor}")
+        else:
+            self.linea(self.visit(expr))
+
+    def visit_if(self, node, palabra="if"):
+        self.linea(f"{palabra} {self.condicion(node.condition)}:")
+        self.bloque(node.then_stmt)
+        else_stmt = node.else_stmt
+        if isinstance(else_stmt, IfNode):
+            self.visit_if(else_stmt, "elif")
+        elif else_stmt is not None:
+            self.linea("else:")
+            self.bloque(else_stmt)
+
+    def visit_while(self, node):
+        self.linea(f"while {self.condicion(node.condition)}:")
+        self.bloque(node.body)
+
+    def visit_for(self, node):
+        self.visit_expr_stmt(ExprStmtNode(node.init_expr))
+        if isinstance(node.condition, EmptyExprNode):
+            self.linea("while True:")
+        else:
+            self.linea(f"while {self.condicion(node.condition)}:")
+        self._nivel += 1
+        n = len(self.lines)
+        if node.body is not None:
+            self.visit(node.body)
+        self.visit_expr_stmt(ExprStmtNode(node.update_expr))
+        if len(self.lines) == n:
+            self.linea("pass")
+        self._nivel -= 1
+
+    def visit_return(self, node):
+        if isinstance(node.expr, EmptyExprNode):
+            self.linea("return None")
+        else:
+            self.linea(f"return {self.convertir(node.expr, self._retorno)}")
+
+    def visit_print(self, node):
+        valor = self.visit(node.expr)
+        tipo = node.expr.expr_type
+        if tipo == 'void':
+            self.linea(valor)
+            return
+        if tipo == 'float':
+            texto = f"format({valor}, 'g')"
+        elif tipo == 'int':
+            texto = f"str({valor})"
+        else:
+            texto = f"str(int({valor}))"
+        self.linea(f"_salida.append({texto})")
+        self.linea(f"if len(_salida) >= {BUFFER_SALIDA}: _flush()")
+
+    # --- Expresiones ---
+
+    def visit_empty_expr(self, node):
+        return "None"
+
+    def visit_num(self, node):
+        valor = node.value
+        if isinstance(valor, float) and not math.isfinite(valor):
+            return f"float('{valor!r}')"
+        return repr(valor)
+
+    def visit_var(self, node):
+        return self.nombre(node)
+
+    def asignado(self, node):
+        """Nombre del destino de una asignación; registra las globales para declararlas"""
+        nombre = self.nombre(node)
+        if node.frame == 0:
+            self._globales_asignadas.add(nombre)
+        return nombre
+
+    def visit_assign(self, node):
+        valor = self.convertir(node.expr, node.expr_type)
+        return f"({self.asignado(node)} := {valor})"
+
+    def visit_binary_op(self, node):
+        op = node.op
+        if op == '&&' or op == '||':
+            return f"(1 if {self.condicion(node)} else 0)"
+        izquierdo = self.visit(node.left)
+        derecho = self.visit(node.right)
+        if op == '/':
+            if node.expr_type == 'int':
+                return f"_div({izquierdo}, {derecho})"
+            return f"({izquierdo} / {derecho})"
+        if op == '%':
+            funcion = "_mod" if node.expr_type == 'int' else "_fmod"
+            return f"{funcion}({izquierdo}, {derecho})"
+        return f"({izquierdo} {op} {derecho})"
+
+    def visit_unary_op(self, node):
+        if node.op == '!':
+            return f"(0 if {self.visit(node.expr)} else 1)"
+        return f"(-{self.visit(node.expr)})"
+
+    def visit_func_call(self, node):
+        params = self._infos[node.func_index].decl.params
+        args = ", ".join(self.convertir(arg, param.param_type)
+                         for arg, param in zip(node.args, params))
+        return f"f_{node.func_name}({args})"
+
+
+def transpile(program):
+    """Texto del módulo de Python para program; lanza ExecutionError si no se puede ejecutar"""
+    return PythonEmitter().emit_program(program)
+
+
+def compile_python(texto):
+    """Objeto código del módulo generado"""
+    try:
+        return compile(texto, "<programa>", "exec")
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        # Anidamientos que el compilador de Python no acepta (más de 20
+        # bucles, expresiones muy profundas)
+        raise ExecutionError(f"El programa no se puede traducir a Python: {e}")
+
+
+class CodeCache:
+    """Objetos código guardados en disco con marshal, por hash del fuente.
+
+    El directorio se crea con permisos 0o700. Si no es un directorio del
+    usuario actual o si el grupo u otros pueden escribir en él, la caché no
+    lee ni escribe nada: cualquiera que pueda dejar un archivo ahí podría
+    hacer ejecutar su código.
+    """
+
+    def __init__(self, directorio=None):
+        self.directorio = directorio if directorio is not None else CACHE_DIR
+        self._segura = None
+
+    def segura(self):
+        """Crea el directorio si falta; dice si se puede usar"""
+        if self._segura is None:
+            self._segura = self._verificar()
+            if not self._segura:
+                print(f"Aviso: no se usa la caché de código en {self.directorio}: "
+                      f"debe ser un directorio propio sin escritura para el grupo ni otros",
+                      file=sys.stderr)
+        return self._segura
+
+    def _verificar(self):
+        try:
+            os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+            # lstat: un enlace simbólico puede apuntar a un directorio ajeno
+            info = os.lstat(os.path.normpath(self.directorio))
+        except OSError:
+            return False
+        if not stat.S_ISDIR(info.st_mode):
+            return False
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            return False
+        return not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+    @staticmethod
+    def clave(fuente):
+        return hashlib.sha256(fuente.encode("utf-8")).hexdigest()
+
+    def ruta(self, clave):
+        return os.path.join(self.directorio, clave + ".pyc")
+
+    def get(self, fuente):
+        """Objeto código guardado para fuente, o None"""
+        if not self.segura():
+            return None
+        try:
+            with open(self.ruta(self.clave(fuente)), "rb") as f:
+                datos = f.read()
+        except OSError:
+            return None
+        if not datos.startswith(ENCABEZADO):
+            return None
+        try:
+            return marshal.loads(datos[len(ENCABEZADO):])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def put(self, fuente, code):
+        """Guarda code para fuente; si no se puede escribir, no hace nada"""
+        if not self.segura():
+            return
+        ruta = self.ruta(self.clave(fuente))
+        try:
+            # Se escribe aparte y se renombra: otro proceso nunca lee un archivo a medias
+            fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(ENCABEZADO + marshal.dumps(code))
+            os.replace(temporal, ruta)
+        except OSError:
+            pass
+
+
+def load_code(program, fuente=None, cache=None):
+    """Objeto código de program.
+
+    Si se da fuente (el texto del que salió program), se busca primero en la
+    caché y lo que se compila se guarda ahí.
+    """
+    if fuente is not None:
+        cache = cache if cache is not None else CodeCache()
+        code = cache.get(fuente)
+        if code is not None:
+            return code
+    code = compile_python(transpile(program))
+    if fuente is not None:
+        cache.put(fuente, code)
+    return code
+
+
+def run_code(code, out=None):
+    """Ejecuta un módulo generado; devuelve lo que devuelve main"""
+    out = out if out is not None else sys.stdout
+    salida = []
+
+    def flush():
+        if salida:
+            out.write("\n".join(salida) + "\n")
+            salida.clear()
+
+    entorno = {"_div": dividir, "_mod": resto, "_fmod": _fmod,
+               "_salida": salida, "_flush": flush}
+
+    def ejecutar():
+        limite = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limite, LIMITE_RECURSION))
+        try:
+            exec(code, entorno)
+            return entorno["_programa"]()
+        except ZeroDivisionError:
+            raise ExecutionError("División por cero")
+        except RecursionError:
+            raise ExecutionError("Recursión demasiado profunda")
+        finally:
+            sys.setrecursionlimit(limite)
+            flush()
+    return con_pila(ejecutar)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python transpiler.py <archivo_fuente> [--py] [--sin-cache]", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        if "--py" in sys.argv[2:]:
+            parser = ParserAST(Lexer().tokenize(src))
+            ast = parser.parse()
+            if parser.errors:
+                sys.exit(1)
+            print(transpile(ast), end="")
+            sys.exit(0)
+
+        usar_cache = "--sin-cache" not in sys.argv[2:]
+        cache = CodeCache()
+        code = cache.get(src) if usar_cache else None
+        if code is None:
+            # Solo sin caché hace falta analizar el fuente
+            parser = ParserAST(Lexer().tokenize(src))
+            ast = parser.parse()
+            if parser.errors:
+                # parse() ya los informó
+                sys.exit(1)
+            code = compile_python(transpile(ast))
+            if usar_cache:
+                cache.put(src, code)
+        run_code(code)
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Máquina virtual de pila para el bytecode de bytecode.py.
+
+Un solo bucle de despacho ejecuta todo el programa: las llamadas no usan la
+pila de Python sino una lista de (pc de retorno, marco), así la profundidad de
+recursión no depende del límite del intérprete. Los operandos comparten una
+pila; cada llamada toma sus argumentos del tope como primeros slots del marco.
+La semántica es la de interpreter.py.
+"""
+import sys
+import os
+import math
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'semantic'))
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from interpreter import ExecutionError, BUFFER_SALIDA, formatear
+from bytecode import *
+
+# Llamadas anidadas como máximo, para cortar una recursión infinita
+MAX_LLAMADAS = 200000
+
+
+class VM:
+    def __init__(self, out=None):
+        self.out = out if out is not None else sys.stdout
+
+    def run(self, bytecode):
+        """Ejecuta bytecode desde el inicio; devuelve lo que devuelve main"""
+        salida = []
+        try:
+            return self.ejecutar(bytecode, salida)
+        except ZeroDivisionError:
+            raise ExecutionError("División por cero")
+        finally:
+            if salida:
+                self.out.write("\n".join(salida) + "\n")
+
+    def ejecutar(self, bytecode, salida):
+        # Indexar una lista devuelve el entero ya creado; un array crearía uno
+        # por lectura
+        code = bytecode.code.tolist()
+        consts = bytecode.consts
+        funciones = [(f.entry, f.n_params, [0] * (f.frame_size - f.n_params))
+                     for f in bytecode.functions]
+        out = self.out
+        globales = [0] * len(bytecode.global_names)
+        frame = []
+        llamadas = []
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        while True:
+            op = code[pc]
+            arg = code[pc + 1]
+            pc += 2
+            if op == LOAD_LOCAL_CONST:
+                push(frame[arg & 0xFFFF])
+                push(consts[arg >> 16])
+            elif op == LOAD_LOCAL2:
+                push(frame[arg & 0xFFFF])
+                push(frame[arg >> 16])
+            elif op == LOAD_LOCAL:
+                push(frame[arg])
+            elif op == CONST:
+                push(consts[arg])
+            elif op == STORE_LOCAL:
+                frame[arg] = pop()
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP_IF_TRUE:
+                if pop():
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == ADD:
+                b = pop()
+                stack[-1] += b
+            elif op == SUB:
+                b = pop()
+                stack[-1] -= b
+            elif op == MUL:
+                b = pop()
+                stack[-1] *= b
+            elif op == LT:
+                b = pop()
+                stack[-1] = stack[-1] < b
+            elif op == LE:
+                b = pop()
+                stack[-1] = stack[-1] <= b
+            elif op == GT:
+                b = pop()
+                stack[-1] = stack[-1] > b
+            elif op == GE:
+                b = pop()
+                stack[-1] = stack[-1] >= b
+            elif op == EQ:
+                b = pop()
+                stack[-1] = stack[-1] == b
+            elif op == NE:
+                b = pop()
+                stack[-1] = stack[-1] != b
+            elif op == LOAD_GLOBAL:
+                push(globales[arg])
+            elif op == STORE_GLOBAL:
+                globales[arg] = pop()
+            elif op == DUP:
+                push(stack[-1])
+            elif op == POP:
+                pop()
+            elif op == CALL:
+                entrada, n, relleno = funciones[arg]
+                if n:
+                    nuevo = stack[-n:]
+                    del stack[-n:]
+                    nuevo += relleno
+                else:
+                    nuevo = relleno[:]
+                llamadas.append((pc, frame))
+                if len(llamadas) > MAX_LLAMADAS:
+                    raise ExecutionError("Recursión demasiado profunda")
+                frame = nuevo
+                pc = entrada
+            elif op == RETURN:
+                pc, frame = llamadas.pop()
+            elif op == DIV_INT:
+                b = pop()
+                a = stack[-1]
+                cociente = abs(a) // abs(b)
+                stack[-1] = cociente if (a < 0) == (b < 0) else -cociente
+            elif op == DIV_FLOAT:
+                b = pop()
+                stack[-1] /= b
+            elif op == MOD_INT:
+                b = pop()
+                a = stack[-1]
+                cociente = abs(a) // abs(b)
+                stack[-1] = a - b * (cociente if (a < 0) == (b < 0) else -cociente)
+            elif op == MOD_FLOAT:
+                b = pop()
+                if b == 0:
+                    raise ZeroDivisionError("resto por cero")
+                stack[-1] = math.fmod(stack[-1], b)
+            elif op == NEG:
+                stack[-1] = -stack[-1]
+            elif op == NOT:
+                stack[-1] = 0 if stack[-1] else 1
+            elif op == TO_FLOAT:
+                stack[-1] = float(stack[-1])
+            elif op == PRINT_INT:
+                salida.append(str(int(pop())))
+                if len(salida) >= BUFFER_SALIDA:
+                    out.write("\n".join(salida) + "\n")
+                    salida.clear()
+            elif op == PRINT_FLOAT:
+                salida.append(formatear(pop()))
+                if len(salida) >= BUFFER_SALIDA:
+                    out.write("\n".join(salida) + "\n")
+                    salida.clear()
+            elif op == HALT:
+                return pop()
+            else:
+                raise ExecutionError(f"Código de operación desconocido: {op}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python vm.py <archivo_fuente> [--dis]", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        parser = ParserAST(Lexer().tokenize(src))
+        ast = parser.parse()
+        if parser.errors:
+            sys.exit(1)
+        bytecode = compile_program(ast)
+        if "--dis" in sys.argv[2:]:
+            print(disassemble(bytecode), file=sys.stderr)
+        VM().run(bytecode)
+        sys.exit(0)
+
+    except ExecutionError as e:
+        print(f"Error de ejecución: {e}", file=sys.stderr)
+        sys.exit(1)
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
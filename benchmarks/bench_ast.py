@@ -0,0 +1,84 @@
+import sys
+import os
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+
+from lexer import Lexer
+from parser_ast import ParserAST
+from ast_nodes import ASTNode
+from corpus import generar_programa
+
+
+def clonar(nodo, crear):
+    """Copia el árbol creando cada nodo con crear(nodo) y copiando sus atributos"""
+    if isinstance(nodo, list):
+        return [clonar(x, crear) for x in nodo]
+    if not isinstance(nodo, ASTNode):
+        return nodo
+    copia = crear(nodo)
+    for nombre, valor in nodo.iter_fields():
+        setattr(copia, nombre, clonar(valor, crear))
+    return copia
+
+
+def con_dict():
+    """crear() para nodos como los de antes: objetos comunes con __dict__"""
+    clases = {}
+
+    def crear(nodo):
+        cls = type(nodo)
+        if cls not in clases:
+            clases[cls] = type(cls.__name__, (), {})
+        return clases[cls]()
+    return crear
+
+
+def con_slots(nodo):
+    return object.__new__(type(nodo))
+
+
+def contar(nodo):
+    if isinstance(nodo, list):
+        return sum(contar(x) for x in nodo)
+    if not isinstance(nodo, ASTNode):
+        return 0
+    return 1 + sum(contar(valor) for _, valor in nodo.iter_fields())
+
+
+def memoria(func):
+    """Bytes que quedan reservados por el resultado de func()"""
+    tracemalloc.start()
+    resultado = func()
+    retenido = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retenido, resultado
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    texto = generar_programa(n_funciones)
+    tokens = Lexer().tokenize(texto)
+    tokens.line_index().line_col(0)
+
+    total, ast = memoria(lambda: ParserAST(tokens).parse())
+    nodos = contar(ast)
+    print(f"Fuente: {len(texto)} caracteres, {nodos} nodos")
+    print(f"AST completo (nodos, listas, lexemas y números): {total} bytes, "
+          f"{total / nodos:.1f} bytes/nodo, {total / len(texto):.2f} bytes por carácter de fuente")
+
+    # Misma estructura con las dos representaciones; los valores (lexemas,
+    # números) se comparten, así que solo se miden nodos y listas.
+    antes, copia = memoria(lambda: clonar(ast, con_dict()))
+    del copia
+    despues, copia = memoria(lambda: clonar(ast, con_slots))
+    del copia
+    print(f"Nodos con __dict__:   {antes / nodos:.1f} bytes/nodo")
+    print(f"Nodos con __slots__:  {despues / nodos:.1f} bytes/nodo")
+    print(f"Reducción: {1 - despues / antes:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import sys
+import os
+import io
+import tempfile
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'semantic'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'backend'))
+
+from lexer import Lexer
+from parser_ast import ParserAST
+from interpreter import Interpreter, CERO
+from bytecode import compile_program
+from vm import VM
+from closures import compile_closures
+from transpiler import load_code, run_code, CodeCache
+from cgen import generate_c, build, run_executable, find_compiler
+from bench_lexer import medir
+
+
+def programa_bucles(n):
+    """Bucles anidados con condiciones y aritmética, como parser/sample2.src a escala"""
+    return f"""
+int total = 0;
+void main() {{
+    int i;
+    int j;
+    int x = 0;
+    for (i = 0; i < {n}; i = i + 1) {{
+        j = 0;
+        while (j < 100 && x != -1) {{
+            x = x + (i * j) % 7;
+            j = j + 1;
+            if (x > 1000 || j >= 50) {{
+                x = x - 1000;
+            }}
+        }}
+        total = total + x;
+    }}
+    print(total);
+}}
+"""
+
+
+def programa_recursivo(n):
+    return f"""
+int fib(int n) {{
+    if (n < 2) return n;
+    return fib(n - 1) + fib(n - 2);
+}}
+void main() {{
+    print(fib({n}));
+}}
+"""
+
+
+class PorNombre(Interpreter):
+    """Variables buscadas por nombre en tiempo de ejecución: un diccionario por
+    llamada y otro de globales (los programas de prueba no ocultan nombres)"""
+
+    def run(self, program):
+        self.globales = self.locales = {}
+        return super().run(program)
+
+    def funcion(self, info):
+        return super().funcion(info) + ([p.param_name for p in info.decl.params],)
+
+    def llamar(self, index, marco):
+        body, _, reales, real, cero, nombres = self.funciones[index]
+        for i in reales:
+            marco[i] = float(marco[i])
+        anterior = self.locales
+        self.locales = dict(zip(nombres, marco))
+        resultado = self.visit(body)
+        self.locales = anterior
+        if resultado is None:
+            return cero
+        return float(resultado[0]) if real else resultado[0]
+
+    def visit_var_decl(self, node):
+        valor = CERO[node.var_type] if node.init_expr is None else self.visit(node.init_expr)
+        self.locales[node.var_name] = float(valor) if node.var_type == 'float' else valor
+
+    def visit_var(self, node):
+        if node.var_name in self.locales:
+            return self.locales[node.var_name]
+        return self.globales[node.var_name]
+
+    def visit_assign(self, node):
+        valor = self.visit(node.expr)
+        if node.expr_type == 'float':
+            valor = float(valor)
+        if node.var_name in self.locales:
+            self.locales[node.var_name] = valor
+        else:
+            self.globales[node.var_name] = valor
+        return valor
+
+
+def ejecutar(clase, ast):
+    salida = io.StringIO()
+    clase(salida).run(ast)
+    return salida.getvalue()
+
+
+def ejecutar_vm(ast):
+    """Compilación a bytecode más ejecución: las dos variantes incluyen su preparación"""
+    salida = io.StringIO()
+    VM(salida).run(compile_program(ast))
+    return salida.getvalue()
+
+
+def ejecutar_closures(ast):
+    """Compilación a closures más ejecución"""
+    salida = io.StringIO()
+    compile_closures(ast, salida)()
+    return salida.getvalue()
+
+
+def ejecutar_python(ast):
+    """Traducción a Python, compile() y ejecución, sin caché"""
+    salida = io.StringIO()
+    run_code(load_code(ast), salida)
+    return salida.getvalue()
+
+
+def cargar_sin_cache(texto):
+    """Lo que hace falta para ejecutar un fuente nuevo: analizarlo, traducirlo y compilarlo"""
+    return load_code(ParserAST(Lexer().tokenize(texto)).parse())
+
+
+def main():
+    escala = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    with open(os.path.join(current_dir, '..', 'parser', 'sample2.src'), encoding="utf-8") as f:
+        sample2 = f.read()
+    programas = [
+        ("parser/sample2.src", sample2),
+        (f"Bucles ({200 * escala} x 100)", programa_bucles(200 * escala)),
+        (f"Recursión (fib({18 + escala}))", programa_recursivo(18 + escala)),
+    ]
+
+    variantes = [
+        ("Por nombre", lambda a: ejecutar(PorNombre, a)),
+        ("Slots", lambda a: ejecutar(Interpreter, a)),
+        ("VM", ejecutar_vm),
+        ("Closures", ejecutar_closures),
+        ("Python", ejecutar_python),
+    ]
+
+    print("Ejecución, incluida la preparación de cada backend (ms)")
+    print(f"{'Programa':<26}" + "".join(f"{nombre:>12}" for nombre, _ in variantes))
+    tiempos = []
+    for nombre, texto in programas:
+        ast = ParserAST(Lexer().tokenize(texto)).parse()
+        medidas = [medir(ejecutar_variante, ast) for _, ejecutar_variante in variantes]
+        if len({salida for _, salida in medidas}) != 1:
+            print(f"ERROR: las salidas de {nombre} no coinciden")
+            sys.exit(1)
+        tiempos.append([t for t, _ in medidas])
+        print(f"{nombre:<26}" + "".join(f"{t * 1000:>12.2f}" for t, _ in medidas))
+
+    print("\nAceleración sobre el recorrido con slots")
+    print(f"{'Programa':<26}" + "".join(f"{nombre:>12}" for nombre, _ in variantes))
+    for (nombre, _), fila in zip(programas, tiempos):
+        slots = fila[1]
+        print(f"{nombre:<26}" + "".join(f"{slots / t:>11.2f}x" for t in fila))
+
+    # C: la compilación y la ejecución del proceso se miden por separado
+    if find_compiler() is None:
+        print("\nBackend C omitido: no se encontró un compilador de C")
+    else:
+        print("\nBackend C (ms): compilación, ejecución del proceso y aceleración de la ejecución sobre slots")
+        for (nombre, texto), fila in zip(programas, tiempos):
+            ast = ParserAST(Lexer().tokenize(texto)).parse()
+            salida = io.StringIO()
+            with tempfile.TemporaryDirectory() as directorio:
+                ejecutable, t_compilacion = build(generate_c(ast), directorio)
+                t_ejecucion, _ = medir(lambda e: run_executable(e, salida), ejecutable)
+            print(f"{nombre:<26}{t_compilacion * 1000:>12.2f}{t_ejecucion * 1000:>12.2f}"
+                  f"{fila[1] / t_ejecucion:>11.2f}x")
+
+    # Caché de objetos código: con el mismo fuente no se analiza ni se compila
+    texto = programa_bucles(200 * escala)
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CodeCache(directorio)
+        cache.put(texto, cargar_sin_cache(texto))
+        t_sin, _ = medir(cargar_sin_cache, texto)
+        t_con, _ = medir(cache.get, texto)
+    print(f"\nCargar el programa de bucles para el backend Python: sin caché {t_sin * 1000:.2f} ms, "
+          f"con caché {t_con * 1000:.2f} ms ({t_sin / t_con:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import sys
+import os
+import time
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+
+from lexer import Lexer
+from corpus import generar_programa
+
+
+def medir(func, texto, repeticiones=3):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = func(texto)
+        duracion = time.perf_counter() - inicio
+        if mejor is None or duracion < mejor:
+            mejor = duracion
+    return mejor, resultado
+
+
+def memoria_por_token(func, texto):
+    """Bytes retenidos por token por el resultado de func(texto)"""
+    tracemalloc.start()
+    resultado = func(texto)
+    retenido = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retenido / max(len(resultado), 1)
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texto = generar_programa(n_funciones)
+    megabytes = len(texto) / (1024 * 1024)
+    lexer = Lexer()
+
+    print(f"Fuente: {len(texto)} caracteres ({megabytes:.2f} MB)")
+
+    t_tabla, tokens_tabla = medir(lexer.tokenize_tabla, texto)
+    t_nuevo, tokens_nuevo = medir(lexer.tokenize, texto)
+
+    if (list(tokens_tabla) != list(tokens_nuevo) or tokens_tabla.starts != tokens_nuevo.starts
+            or tokens_tabla.ends != tokens_nuevo.ends):
+        print("ERROR: los flujos de tokens no coinciden")
+        sys.exit(1)
+
+    print(f"Tokens: {len(tokens_nuevo)}")
+    print(f"Tabla del AFD ({lexer.tabla.num_estados} estados, {lexer.tabla.num_clases} clases): "
+          f"{t_tabla:.3f} s  ({megabytes / t_tabla:.2f} MB/s)")
+    print(f"Patrón maestro:   {t_nuevo:.3f} s  ({megabytes / t_nuevo:.2f} MB/s)")
+
+    # Edición de un carácter en la mitad del archivo: re-lexeo incremental
+    offset = texto.index("contador + 1", len(texto) // 2)
+    t_relex, _ = medir(lambda t: lexer.relex(tokens_nuevo, offset, 1, "x"), texto)
+    print(f"Re-lexeo de una edición: {t_relex * 1000:.2f} ms (completo: {t_nuevo * 1000:.1f} ms)")
+
+    del tokens_tabla, tokens_nuevo
+    print(f"Memoria lista de tuplas: {memoria_por_token(lambda t: list(lexer.tokenize(t)), texto):.1f} bytes/token")
+    print(f"Memoria TokenBuffer:     {memoria_por_token(lexer.tokenize, texto):.1f} bytes/token")
+
+
+if __name__ == "__main__":
+    main()
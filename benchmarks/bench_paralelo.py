@@ -0,0 +1,36 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+
+from lexer import Lexer
+from corpus import generar_programa
+from bench_lexer import medir
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    texto = generar_programa(n_funciones)
+    megabytes = len(texto) / (1024 * 1024)
+    lexer = Lexer()
+
+    print(f"Fuente: {len(texto)} caracteres ({megabytes:.2f} MB), {os.cpu_count()} núcleos")
+
+    t_serial, serial = medir(lexer.tokenize, texto)
+    t_paralelo, paralelo = medir(lambda t: lexer.tokenize_paralelo(t, jobs), texto)
+
+    if (serial.kinds != paralelo.kinds or serial.starts != paralelo.starts
+            or serial.ends != paralelo.ends):
+        print("ERROR: los flujos de tokens no coinciden")
+        sys.exit(1)
+
+    print(f"Tokens: {len(serial)}")
+    print(f"Serial:              {t_serial:.3f} s  ({megabytes / t_serial:.2f} MB/s)")
+    print(f"Paralelo ({jobs} procesos): {t_paralelo:.3f} s  ({megabytes / t_paralelo:.2f} MB/s)")
+    print(f"Aceleración: {t_serial / t_paralelo:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import sys
+import os
+import cProfile
+import gc
+import time
+import pstats
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'semantic'))
+
+from lexer import Lexer
+from parser_ast import ParserAST
+from ast_nodes import ASTNode, FuncDeclNode
+from parser_ll1 import ParserLL1
+from incremental import ProgramaIncremental
+from semantic_analyzer import SemanticAnalyzer
+from corpus import generar_programa
+from bench_lexer import medir
+
+
+def volcar(nodo):
+    """Estructura comparable de un AST, incluidas las posiciones"""
+    if isinstance(nodo, list):
+        return [volcar(x) for x in nodo]
+    if isinstance(nodo, ASTNode):
+        return type(nodo).__name__, {k: volcar(v) for k, v in nodo.iter_fields()}
+    return nodo
+
+
+def llamadas_por_token(func, tokens):
+    """Llamadas a funciones (Python y nativas) por token durante func(tokens)"""
+    perfil = cProfile.Profile()
+    perfil.runcall(func, tokens)
+    return pstats.Stats(perfil).total_calls / max(len(tokens), 1)
+
+
+def alternar(funcs, tokens, rondas=5):
+    """Mejor tiempo de cada func(tokens), alternando el orden en cada ronda.
+
+    Antes de cada corrida se libera el resultado anterior y se recolecta la
+    basura: un AST grande vivo encarece los ciclos del recolector y castiga
+    al que se mide después.
+    """
+    mejores = [float("inf")] * len(funcs)
+    for ronda in range(rondas):
+        orden = range(len(funcs)) if ronda % 2 == 0 else reversed(range(len(funcs)))
+        for i in orden:
+            gc.collect()
+            inicio = time.perf_counter()
+            funcs[i](tokens)
+            mejores[i] = min(mejores[i], time.perf_counter() - inicio)
+    return mejores
+
+
+def anidado(profundidad):
+    """Programa con una expresión de profundidad paréntesis anidados"""
+    return "int main() { return " + "(" * profundidad + "1" + ")" * profundidad + "; }"
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    profundidad = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    texto = generar_programa(n_funciones)
+    tokens = Lexer().tokenize(texto)
+
+    print(f"Tokens: {len(tokens)}")
+
+    t_rd, t_ll1 = alternar([lambda t: ParserAST(t).parse(), lambda t: ParserLL1(t).parse()], tokens)
+
+    ast_rd = ParserAST(tokens).parse()
+    if volcar(ast_rd) != volcar(ParserLL1(tokens).parse()):
+        print("ERROR: los AST no coinciden")
+        sys.exit(1)
+
+    print(f"Descenso recursivo: {t_rd:.3f} s  ({len(tokens) / t_rd:,.0f} tokens/s)")
+    print(f"LL(1) por tabla:    {t_ll1:.3f} s  ({len(tokens) / t_ll1:,.0f} tokens/s)")
+    print(f"Relación: {t_rd / t_ll1:.2f}x")
+    print(f"Llamadas por token (descenso recursivo): "
+          f"{llamadas_por_token(lambda t: ParserAST(t).parse(), tokens):.2f}")
+
+    # Tabla de símbolos solo con las firmas: los cuerpos quedan sin analizar
+    def tabla(t, lazy):
+        analyzer = SemanticAnalyzer()
+        ast = ParserAST(t, lazy=lazy).parse()
+        analyzer.declare_signatures(ast)
+        return ast, analyzer.symbol_table.get_table_representation()
+    t_tabla, (ast_lazy, tabla_lazy) = medir(lambda t: tabla(t, True), tokens)
+    t_tabla_completa, (_, tabla_completa) = medir(lambda t: tabla(t, False), tokens)
+    funciones = [d for d in ast_lazy.declarations if isinstance(d, FuncDeclNode)]
+    diferidos = sum(1 for d in funciones if not d.is_materialized())
+    if tabla_lazy != tabla_completa or volcar(ast_lazy) != volcar(ast_rd):
+        print("ERROR: el análisis diferido no coincide con el completo")
+        sys.exit(1)
+    print(f"Tabla de símbolos con cuerpos diferidos: {t_tabla * 1000:.1f} ms "
+          f"(analizando todo: {t_tabla_completa * 1000:.1f} ms), {diferidos}/{len(funciones)} cuerpos sin analizar")
+
+    # Edición de un carácter en la mitad del archivo: reanálisis incremental
+    offset = texto.index("contador + 1", len(texto) // 2)
+    programa = ProgramaIncremental(tokens)
+    anteriores = {id(nodo) for nodo in programa.program.declarations}
+    nuevos, cambio = Lexer().relex(tokens, offset, 1, "x")
+    t_inc, reanalizadas = medir(lambda c: programa.actualizar(nuevos, c), cambio, repeticiones=1)
+    t_completo, completo = medir(lambda t: ParserAST(t).parse(), nuevos)
+    if volcar(completo) != volcar(programa.program):
+        print("ERROR: el reanálisis incremental no coincide con el completo")
+        sys.exit(1)
+    reutilizadas = sum(1 for nodo in programa.program.declarations if id(nodo) in anteriores)
+    print(f"Reanálisis de una edición: {t_inc * 1000:.2f} ms (completo: {t_completo * 1000:.1f} ms), "
+          f"{len(reanalizadas)} declaraciones nuevas, {reutilizadas} reutilizadas")
+
+    tokens = Lexer().tokenize(anidado(profundidad))
+    try:
+        ParserAST(tokens).programa()
+        print(f"Descenso recursivo con {profundidad} niveles: correcto")
+    except RecursionError:
+        print(f"Descenso recursivo con {profundidad} niveles: RecursionError")
+    ParserLL1(tokens).programa()
+    print(f"LL(1) por tabla con {profundidad} niveles: correcto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'semantic'))
+
+from lexer import Lexer
+from token_buffer import LineIndex
+from parser_ast import ParserAST
+from semantic_analyzer import SemanticAnalyzer
+from corpus import generar_programa
+
+# Una variable sin declarar en la primera declaración: el primer diagnóstico
+ERROR_INICIAL = "int error_inicial = sin_declarar;\n"
+
+
+def por_fases(path):
+    """Léxico, sintáctico y semántico en secuencia, cada fase con su salida completa"""
+    inicio = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as f:
+        texto = f.read()
+    ast = ParserAST(Lexer().tokenize(texto)).parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(ast)
+    return time.perf_counter() - inicio, analyzer.errors
+
+
+def por_declaracion(path):
+    """Las tres fases superpuestas; devuelve también cuándo apareció el primer error"""
+    inicio = time.perf_counter()
+    primero = None
+    lines = LineIndex()
+    with open(path, "r", encoding="utf-8") as f:
+        parser = ParserAST(Lexer().iter_tokens(f, lineas=lines), lines)
+        analyzer = SemanticAnalyzer()
+        for _, errores in analyzer.analyze_declarations(parser.declaraciones()):
+            if errores and primero is None:
+                primero = time.perf_counter() - inicio
+    return time.perf_counter() - inicio, primero, analyzer.errors
+
+
+def pico(func, path):
+    """Memoria máxima reservada durante func(path), en bytes"""
+    tracemalloc.start()
+    resultado = func(path)
+    maximo = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return maximo, resultado
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    texto = ERROR_INICIAL + generar_programa(n_funciones)
+    print(f"Fuente: {len(texto)} caracteres, {n_funciones} funciones")
+    with tempfile.NamedTemporaryFile("w", suffix=".src", encoding="utf-8", delete=False) as f:
+        f.write(texto)
+    del texto
+
+    try:
+        medir_archivo(f.name)
+    finally:
+        os.unlink(f.name)
+
+
+def medir_archivo(path):
+    t_fases, errores_fases = por_fases(path)
+    t_pipeline, t_primero, errores_pipeline = por_declaracion(path)
+    if errores_fases != errores_pipeline:
+        print("ERROR: los diagnósticos no coinciden")
+        sys.exit(1)
+
+    print(f"Por fases:       {t_fases:.3f} s, primer diagnóstico al final")
+    print(f"Por declaración: {t_pipeline:.3f} s, primer diagnóstico a los {t_primero * 1000:.1f} ms")
+
+    m_fases, _ = pico(por_fases, path)
+    m_pipeline, _ = pico(por_declaracion, path)
+    print(f"Pico de memoria por fases:       {m_fases / 1024:.0f} KB")
+    print(f"Pico de memoria por declaración: {m_pipeline / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import sys
+import os
+import random
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'semantic'))
+
+from lexer import Lexer
+from parser_ast import ParserAST
+from ast_nodes import *
+from semantic_analyzer import SemanticAnalyzer, SymbolTable, SemanticError
+from incremental import ProgramaIncremental
+from incremental_analyzer import IncrementalAnalyzer
+from bench_lexer import medir
+from corpus import generar_programa
+
+# Solo aritméticos: el programa no tiene errores semánticos y se mide el recorrido
+OPERADORES = ["+", "-", "*", "/"]
+
+
+def expresion(azar, profundidad):
+    if profundidad == 0:
+        return azar.choice(["a", "b", "c", "1", "2.5"])
+    forma = azar.random()
+    if forma < 0.6:
+        return (f"({expresion(azar, profundidad - 1)} {azar.choice(OPERADORES)} "
+                f"{expresion(azar, profundidad - 1)})")
+    if forma < 0.75:
+        return f"-{expresion(azar, profundidad - 1)}"
+    if forma < 0.9:
+        return f"f({expresion(azar, profundidad - 1)}, {expresion(azar, profundidad - 1)})"
+    return f"(c = {expresion(azar, profundidad - 1)})"
+
+
+def programa_expresiones(n_funciones, profundidad=6, semilla=1):
+    """Programa con funciones cuyo cuerpo es casi todo expresiones"""
+    azar = random.Random(semilla)
+    partes = ["float f(float x, float y) { return x + y; }\n"]
+    for i in range(n_funciones):
+        partes.append(f"float g{i}(int a, float b) {{\n    float c = 0;\n")
+        for _ in range(4):
+            partes.append(f"    c = {expresion(azar, profundidad)};\n")
+        partes.append("    return c;\n}\n")
+    return "".join(partes)
+
+
+class ConIsinstance(SemanticAnalyzer):
+    """El despacho anterior: una cadena de isinstance por visita (primero los
+    nodos de expresión, después los de sentencia)"""
+
+    def visit(self, node):
+        if isinstance(node, EmptyExprNode):
+            return self.visit_empty_expr(node)
+        elif isinstance(node, NumNode):
+            return self.visit_num(node)
+        elif isinstance(node, BinaryOpNode):
+            return self.visit_binary_op(node)
+        elif isinstance(node, UnaryOpNode):
+            return self.visit_unary_op(node)
+        elif isinstance(node, AssignNode):
+            return self.visit_assign(node)
+        elif isinstance(node, VarNode):
+            return self.visit_var(node)
+        elif isinstance(node, FuncCallNode):
+            return self.visit_func_call(node)
+        elif isinstance(node, VarDeclNode):
+            return self.visit_var_decl(node)
+        elif isinstance(node, FuncDeclNode):
+            return self.visit_func_decl(node)
+        elif isinstance(node, IfNode):
+            return self.visit_if(node)
+        elif isinstance(node, WhileNode):
+            return self.visit_while(node)
+        elif isinstance(node, ForNode):
+            return self.visit_for(node)
+        elif isinstance(node, ReturnNode):
+            return self.visit_return(node)
+        elif isinstance(node, PrintNode):
+            return self.visit_print(node)
+        elif isinstance(node, ExprStmtNode):
+            return self.visit_expr_stmt(node)
+        elif isinstance(node, BlockNode):
+            return self.visit_block(node)
+        return self.generic_visit(node)
+
+
+class TablaConAmbitos(SymbolTable):
+    """La tabla anterior: un diccionario por ámbito y lookup de adentro hacia afuera"""
+
+    def __init__(self):
+        super().__init__()
+        self.scopes = [{}]
+
+    def enter_scope(self):
+        self.scopes.append({})
+
+    def exit_scope(self):
+        if len(self.scopes) > 1:
+            self.scopes.pop()
+
+    def add_symbol(self, name, symbol_type, is_function=False):
+        if name in self.scopes[-1]:
+            raise SemanticError(f"Variable '{name}' ya está declarada en este ámbito")
+        self.scopes[-1][name] = symbol_type
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                return scope[name]
+        return None
+
+
+def programa_anidado(profundidad, referencias=2000):
+    """Una función con profundidad bloques while anidados; el más interno usa
+    una global y un parámetro, declarados afuera de todo"""
+    partes = ["int g = 0;\nint f(int p) {\n"]
+    for i in range(profundidad):
+        partes.append(f"while (p) {{ int v{i} = {i};\n")
+    partes.append("g = g + p;\n" * (referencias // 3))
+    partes.append("}\n" * profundidad)
+    partes.append("return g;\n}\n")
+    return "".join(partes)
+
+
+def contar(nodo):
+    if isinstance(nodo, list):
+        return sum(contar(x) for x in nodo)
+    if not isinstance(nodo, ASTNode):
+        return 0
+    return 1 + sum(contar(valor) for _, valor in nodo.iter_fields())
+
+
+def analizar(clase, ast, tabla=SymbolTable):
+    analyzer = clase()
+    analyzer.symbol_table = tabla()
+    analyzer.analyze(ast)
+    return analyzer.errors
+
+
+def analizar_con_jobs(tokens, jobs):
+    parser = ParserAST(tokens, lazy=jobs > 1)
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(parser.parse(), jobs)
+    return parser.errors, analyzer.errors
+
+
+def main():
+    n_funciones = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    ast = ParserAST(Lexer().tokenize(programa_expresiones(n_funciones))).parse()
+    nodos = contar(ast)
+    print(f"Nodos: {nodos}")
+    if analizar(SemanticAnalyzer, ast):
+        print("ERROR: el programa de prueba tiene errores semánticos")
+        sys.exit(1)
+
+    t_cadena, errores_cadena = medir(lambda a: analizar(ConIsinstance, a), ast, repeticiones=5)
+    t_tabla, errores_tabla = medir(lambda a: analizar(SemanticAnalyzer, a), ast, repeticiones=5)
+    if errores_cadena != errores_tabla:
+        print("ERROR: los diagnósticos no coinciden")
+        sys.exit(1)
+
+    print(f"Cadena de isinstance: {t_cadena * 1e9 / nodos:.0f} ns/nodo")
+    print(f"Tabla de despacho:    {t_tabla * 1e9 / nodos:.0f} ns/nodo")
+    print(f"Aceleración: {t_cadena / t_tabla:.2f}x")
+
+    # Búsqueda de nombres según el anidamiento: cada sentencia del bloque más
+    # interno hace tres referencias a nombres declarados afuera de todo
+    print("\nReferencias a nombres externos (ns/referencia):")
+    print("Anidamiento   Un dict por ámbito   Pilas de ligaduras")
+    for profundidad in (1, 8, 32, 96):
+        ast = ParserAST(Lexer().tokenize(programa_anidado(profundidad))).parse()
+        referencias = 3 * (2000 // 3)
+        t_ambitos, errores_ambitos = medir(lambda a: analizar(SemanticAnalyzer, a, TablaConAmbitos), ast, repeticiones=5)
+        t_pilas, errores_pilas = medir(lambda a: analizar(SemanticAnalyzer, a), ast, repeticiones=5)
+        if errores_ambitos or errores_pilas:
+            print("ERROR: el programa anidado tiene errores semánticos")
+            sys.exit(1)
+        print(f"{profundidad:>11}   {t_ambitos * 1e9 / referencias:>18.0f}   {t_pilas * 1e9 / referencias:>18.0f}")
+
+    # Cuerpos de función en un pool de procesos: el parser los difiere y cada
+    # proceso analiza y verifica los suyos a partir de los tokens
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    tokens = Lexer().tokenize(generar_programa(20 * n_funciones))
+    t_serie, errores_serie = medir(lambda t: analizar_con_jobs(t, 1), tokens)
+    t_paralelo, errores_paralelo = medir(lambda t: analizar_con_jobs(t, jobs), tokens)
+    if errores_serie != errores_paralelo:
+        print("ERROR: los diagnósticos en paralelo no coinciden")
+        sys.exit(1)
+    print(f"\nFunciones: {20 * n_funciones} (análisis sintáctico y semántico, {os.cpu_count()} núcleos)")
+    print(f"En serie:                {t_serie:.3f} s")
+    print(f"En paralelo ({jobs} procesos): {t_paralelo:.3f} s")
+    print(f"Aceleración: {t_serie / t_paralelo:.2f}x")
+
+    # Una edición dentro de una función: solo se verifican de nuevo ella y
+    # las que dependen de lo que declara
+    texto = generar_programa(20 * n_funciones)
+    programa = ProgramaIncremental(Lexer().tokenize(texto))
+    analisis = IncrementalAnalyzer(programa.program)
+    analisis.analyze()
+    offset = texto.index("return", len(texto) // 2)
+    programa.editar(offset, 0, "a = b;\n    ")
+    # Solo la primera verificación tras la edición tiene trabajo: no se repite
+    inicio = time.perf_counter()
+    analisis.analyze()
+    t_incremental = time.perf_counter() - inicio
+    t_completo, errores_completo = medir(lambda a: analizar(SemanticAnalyzer, a), programa.program)
+    if analisis.errors != errores_completo:
+        print("ERROR: los diagnósticos incrementales no coinciden")
+        sys.exit(1)
+    print(f"\nEdición en una función de {len(programa.program.declarations)} declaraciones")
+    print(f"Verificación completa:    {t_completo * 1000:.2f} ms")
+    print(f"Verificación incremental: {t_incremental * 1000:.2f} ms "
+          f"({len(analisis.rechecked)} declaraciones verificadas de nuevo)")
+    print(f"Aceleración: {t_completo / t_incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Generador de programas sintéticos para los benchmarks"""
+import random
+
+FUNCION = """
+// función generada {i}
+float calcular_{i}(int a, int b, int c) {{
+    float suma = a + b + c;
+    /* promedio
+       de tres valores */
+    float promedio = suma / 3.0;
+    int contador = 0;
+    while (contador < 10 && a != 0) {{
+        contador = contador + 1;
+        if (contador >= 5 || b > 15) {{
+            print(contador * (a - b) % 7);
+        }} else {{
+            b = b + contador;
+        }}
+    }}
+    for (contador = 0; contador < 5; contador = contador + 1) {{
+        c = c + (contador + 1) * 2 - b / 3;
+    }}
+    return promedio + c;
+}}
+"""
+
+
+def generar_programa(n_funciones):
+    """Devuelve el texto de un programa válido con n_funciones funciones distintas"""
+    partes = ["int global_total = 0;\n"]
+    for i in range(n_funciones):
+        partes.append(FUNCION.format(i=i))
+    partes.append("\nvoid main() {\n")
+    for i in range(n_funciones):
+        partes.append(f"    print(calcular_{i}({i}, {i + 1}, {i + 2}));\n")
+    partes.append("}\n")
+    return "".join(partes)
+
+
+class GeneradorAleatorio:
+    """Programas válidos al azar para comparar backends.
+
+    Mezclan int y float, asignaciones dentro de expresiones, llamadas con
+    efectos, && y || con cortocircuito, y divisiones por divisores que nunca
+    son cero. Los productos enteros se acotan con % para no desbordar 64 bits.
+    """
+
+    def __init__(self, semilla):
+        self.azar = random.Random(semilla)
+
+    def programa(self):
+        azar = self.azar
+        partes = []
+        globales = []
+        funciones = []
+        for i in range(azar.randint(0, 3)):
+            tipo = azar.choice(['int', 'float'])
+            partes.append(f"{tipo} g{i} = {self.expresion(tipo, globales, funciones, 2)};")
+            globales.append((f"g{i}", tipo))
+        for i in range(azar.randint(0, 4)):
+            retorno = azar.choice(['int', 'float', 'void'])
+            params = [azar.choice(['int', 'float']) for _ in range(azar.randint(0, 3))]
+            visibles = globales + [(f"p{j}", tipo) for j, tipo in enumerate(params)]
+            cuerpo = self.bloque(visibles, funciones, 2, retorno, 5)
+            if retorno != 'void':
+                cuerpo += f" return {self.expresion(retorno, visibles, funciones, 2)};"
+            lista = ", ".join(f"{tipo} p{j}" for j, tipo in enumerate(params))
+            partes.append(f"{retorno} f{i}({lista}) {{ {cuerpo} }}")
+            funciones.append((f"f{i}", retorno, params))
+        partes.append(f"void main() {{ {self.bloque(globales, funciones, 3, 'void', 8)} }}")
+        return "\n".join(partes) + "\n"
+
+    def expresion(self, tipo, variables, funciones, profundidad):
+        azar = self.azar
+        if profundidad <= 0 or azar.random() < 0.25:
+            candidatas = [v for v, t in variables if t == tipo or (tipo == 'float' and t == 'int')]
+            if candidatas and azar.random() < 0.7:
+                return azar.choice(candidatas)
+            if tipo == 'int':
+                return str(azar.randint(0, 20))
+            return f"{azar.randint(0, 20)}.{azar.randint(0, 9)}"
+        k = azar.random()
+        if k < 0.45:
+            op = azar.choice(['+', '-', '*', '/', '%'])
+            a = self.expresion(tipo, variables, funciones, profundidad - 1)
+            b = self.expresion(tipo, variables, funciones, profundidad - 1)
+            if op in ('/', '%'):
+                uno = '1' if tipo == 'int' else '1.0'
+                return f"({a} {op} ({b} * {b} + {uno}))"
+            if op == '*' and tipo == 'int':
+                return f"(({a} % 97) * ({b} % 89))"
+            return f"({a} {op} {b})"
+        if k < 0.55:
+            return f"-{self.expresion(tipo, variables, funciones, profundidad - 1)}"
+        if k < 0.7:
+            candidatas = [f for f in funciones if f[1] == tipo or (tipo == 'float' and f[1] == 'int')]
+            if candidatas:
+                nombre, _, params = azar.choice(candidatas)
+                args = ", ".join(self.expresion(p, variables, funciones, profundidad - 1) for p in params)
+                return f"{nombre}({args})"
+        if k < 0.9 and variables:
+            nombre, t = azar.choice(variables)
+            if t == tipo or (tipo == 'float' and t == 'int'):
+                return f"({nombre} = {self.expresion(t, variables, funciones, profundidad - 1)})"
+        return self.expresion(tipo, variables, funciones, 0)
+
+    def condicion(self, variables, funciones, profundidad):
+        azar = self.azar
+        k = azar.random()
+        if k < 0.3 and profundidad > 0:
+            op = azar.choice(['&&', '||'])
+            return (f"({self.condicion(variables, funciones, profundidad - 1)} {op} "
+                    f"{self.condicion(variables, funciones, profundidad - 1)})")
+        if k < 0.4 and profundidad > 0:
+            return f"!{self.condicion(variables, funciones, profundidad - 1)}"
+        tipo = azar.choice(['int', 'float'])
+        if k < 0.5:
+            return self.expresion(tipo, variables, funciones, 2)
+        op = azar.choice(['<', '>', '<=', '>=', '==', '!='])
+        return (f"({self.expresion(tipo, variables, funciones, 2)} {op} "
+                f"{self.expresion(tipo, variables, funciones, 2)})")
+
+    def bloque(self, variables, funciones, profundidad, retorno, n):
+        azar = self.azar
+        sentencias = []
+        variables = list(variables)
+        for _ in range(n):
+            k = azar.random()
+            if k < 0.2:
+                tipo = azar.choice(['int', 'float'])
+                nombre = f"v{len(variables)}_{azar.randint(0, 999)}"
+                inicial = f" = {self.expresion(tipo, variables, funciones, 3)}" if azar.random() < 0.8 else ""
+                sentencias.append(f"{tipo} {nombre}{inicial};")
+                variables.append((nombre, tipo))
+            elif k < 0.4 and variables:
+                nombre, tipo = azar.choice(variables)
+                sentencias.append(f"{nombre} = {self.expresion(tipo, variables, funciones, 3)};")
+            elif k < 0.55:
+                if azar.random() < 0.3:
+                    sentencias.append(f"print({self.condicion(variables, funciones, 2)});")
+                else:
+                    tipo = azar.choice(['int', 'float'])
+                    sentencias.append(f"print({self.expresion(tipo, variables, funciones, 3)});")
+            elif k < 0.65 and profundidad > 0:
+                texto = (f"if ({self.condicion(variables, funciones, 2)}) "
+                         f"{{ {self.bloque(variables, funciones, profundidad - 1, retorno, 3)} }}")
+                if azar.random() < 0.5:
+                    texto += f" else {{ {self.bloque(variables, funciones, profundidad - 1, retorno, 2)} }}"
+                sentencias.append(texto)
+            elif k < 0.75 and profundidad > 0:
+                contador = f"i{profundidad}_{azar.randint(0, 999)}"
+                sentencias.append(f"int {contador};")
+                cuerpo = self.bloque(variables, funciones, profundidad - 1, retorno, 3)
+                limite = azar.randint(0, 6)
+                if azar.random() < 0.5:
+                    sentencias.append(f"for ({contador} = 0; {contador} < {limite}; "
+                                      f"{contador} = {contador} + 1) {{ {cuerpo} }}")
+                else:
+                    sentencias.append(f"{contador} = 0; while ({contador} < {limite} && "
+                                      f"{self.condicion(variables, funciones, 1)}) "
+                                      f"{{ {contador} = {contador} + 1; {cuerpo} }}")
+            elif k < 0.8 and azar.random() < 0.3:
+                if retorno == 'void':
+                    sentencias.append("return;")
+                else:
+                    sentencias.append(f"return {self.expresion(retorno, variables, funciones, 2)};")
+            elif k < 0.9:
+                sentencias.append(f"{{ {self.bloque(variables, funciones, profundidad - 1, retorno, 2)} }}")
+            elif funciones:
+                nombre, _, params = azar.choice(funciones)
+                args = ", ".join(self.expresion(p, variables, funciones, 2) for p in params)
+                sentencias.append(f"{nombre}({args});")
+        return " ".join(sentencias)
@@ -0,0 +1,121 @@
+"""Prueba diferencial de los backends contra el intérprete.
+
+Ejecuta cada programa con Interpreter y con los demás backends (VM, closures,
+Python y, si hay compilador de C, C) y compara la salida y el error de
+ejecución. Los programas son las muestras de parser/ y semantic/ que se
+pueden ejecutar, los casos de backend/pruebas/ (variables sin inicializar,
+globales leídas antes de su inicializador), uno del corpus y, con
+--aleatorios N, N programas de GeneradorAleatorio.
+
+    python benchmarks/diff_backends.py [--aleatorios N] [--semilla S] [--sin-c]
+"""
+import sys
+import os
+import io
+import glob
+import contextlib
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'lexer'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'parser'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'semantic'))
+sys.path.insert(0, os.path.join(current_dir, '..', 'backend'))
+
+from lexer import Lexer, LexerError
+from parser_ast import ParserAST
+from interpreter import Interpreter, ExecutionError, preparar
+from bytecode import compile_program
+from vm import VM
+from closures import compile_closures
+from transpiler import load_code, run_code
+from cgen import run_c, find_compiler
+from corpus import generar_programa, GeneradorAleatorio
+
+
+def resultado(ejecutar, texto):
+    """Salida de ejecutar(ast, out) sobre texto, más el error de ejecución si lo hubo"""
+    out = io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ast = ParserAST(Lexer().tokenize(texto)).parse()
+    try:
+        ejecutar(ast, out)
+    except ExecutionError as e:
+        return out.getvalue() + f"Error de ejecución: {e}\n"
+    return out.getvalue()
+
+
+def ejecutores(con_c):
+    """Pares (nombre, ejecutar(ast, out)) de los backends distintos del
+    intérprete; el de C solo con con_c y si hay compilador"""
+    backends = [
+        ("vm", lambda ast, out: VM(out).run(compile_program(ast))),
+        ("closures", lambda ast, out: compile_closures(ast, out)()),
+        ("python", lambda ast, out: run_code(load_code(ast), out)),
+    ]
+    if con_c and find_compiler() is not None:
+        backends.append(("c", lambda ast, out: run_c(ast, out)))
+    return backends
+
+
+def ejecutable(texto):
+    """Si el programa pasa el análisis y tiene main: si no, no hay nada que comparar"""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            parser = ParserAST(Lexer().tokenize(texto))
+            ast = parser.parse()
+        if parser.errors:
+            return False
+        preparar(ast)
+    except (LexerError, ExecutionError):
+        return False
+    return True
+
+
+def main():
+    aleatorios = 20
+    semilla = 0
+    if "--aleatorios" in sys.argv:
+        aleatorios = int(sys.argv[sys.argv.index("--aleatorios") + 1])
+    if "--semilla" in sys.argv:
+        semilla = int(sys.argv[sys.argv.index("--semilla") + 1])
+
+    backends = ejecutores("--sin-c" not in sys.argv)
+    if "--sin-c" in sys.argv:
+        print("Backend C omitido (--sin-c)")
+    elif find_compiler() is None:
+        print("Backend C omitido: no se encontró un compilador de C")
+
+    raiz = os.path.join(current_dir, '..')
+    programas = []
+    for ruta in sorted(glob.glob(os.path.join(raiz, 'parser', '*.src'))
+                       + glob.glob(os.path.join(raiz, 'semantic', '*.src'))
+                       + glob.glob(os.path.join(raiz, 'backend', 'pruebas', '*.src'))):
+        with open(ruta, encoding="utf-8") as f:
+            programas.append((os.path.relpath(ruta, raiz), f.read()))
+    programas.append(("corpus (3 funciones)", generar_programa(3)))
+    for i in range(semilla, semilla + aleatorios):
+        programas.append((f"aleatorio {i}", GeneradorAleatorio(i).programa()))
+
+    print(f"Backends comparados con el intérprete: {', '.join(nombre for nombre, _ in backends)}")
+    omitidos = fallidos = 0
+    for nombre, texto in programas:
+        if not ejecutable(texto):
+            omitidos += 1
+            if not nombre.startswith("aleatorio"):
+                print(f"  {nombre}: se omite (no compila o no tiene main)")
+            continue
+        esperado = resultado(lambda ast, out: Interpreter(out).run(ast), texto)
+        distintos = [backend for backend, ejecutar in backends if resultado(ejecutar, texto) != esperado]
+        if distintos:
+            fallidos += 1
+            print(f"  {nombre}: DIFERENCIAS en {', '.join(distintos)}")
+        elif not nombre.startswith("aleatorio"):
+            print(f"  {nombre}: ok")
+
+    comparados = len(programas) - omitidos
+    print(f"\n{comparados} programas comparados, {omitidos} omitidos, {fallidos} con diferencias")
+    sys.exit(1 if fallidos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Casos de regresión de los backends con su salida esperada.
+
+Cada programa de backend/pruebas/*.src se ejecuta con todos los backends
+(intérprete, VM, closures, Python y, si hay compilador de C, C) y la salida,
+más el error de ejecución si lo hubo, se compara con la de su archivo
+.salida. Cubren lo que los programas aleatorios de diff_backends.py no
+generan: signo de la división y el resto, división por cero, variables sin
+inicializar o leídas en su propio inicializador y recursión profunda.
+
+    python benchmarks/pruebas_backends.py [--sin-c] [--regenerar]
+
+--regenerar reescribe los .salida con la salida del intérprete.
+"""
+import sys
+import os
+import glob
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(current_dir, '..', 'backend'))
+
+from interpreter import Interpreter
+from cgen import find_compiler
+from diff_backends import resultado, ejecutores
+
+
+def main():
+    backends = [("ast", lambda ast, out: Interpreter(out).run(ast))]
+    backends += ejecutores("--sin-c" not in sys.argv)
+    if "--sin-c" in sys.argv:
+        print("Backend C omitido (--sin-c)")
+    elif find_compiler() is None:
+        print("Backend C omitido: no se encontró un compilador de C")
+
+    directorio = os.path.join(current_dir, '..', 'backend', 'pruebas')
+    fallidos = 0
+    rutas = sorted(glob.glob(os.path.join(directorio, '*.src')))
+    for ruta in rutas:
+        nombre = os.path.basename(ruta)
+        with open(ruta, encoding="utf-8") as f:
+            texto = f.read()
+        ruta_salida = ruta[:-len('.src')] + '.salida'
+        if "--regenerar" in sys.argv:
+            with open(ruta_salida, "w", encoding="utf-8") as f:
+                f.write(resultado(backends[0][1], texto))
+        with open(ruta_salida, encoding="utf-8") as f:
+            esperado = f.read()
+        distintos = [backend for backend, ejecutar in backends if resultado(ejecutar, texto) != esperado]
+        if distintos:
+            fallidos += 1
+            print(f"  {nombre}: salida distinta de la esperada en {', '.join(distintos)}")
+        else:
+            print(f"  {nombre}: ok")
+
+    print(f"\n{len(rutas)} casos, {fallidos} con diferencias ({', '.join(b for b, _ in backends)})")
+    sys.exit(1 if fallidos else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,28 @@
 import sys
 import os
+import re
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(current_dir, 'lexer'))
 sys.path.insert(0, os.path.join(current_dir, 'parser'))
 sys.path.insert(0, os.path.join(current_dir, 'semantic'))
+sys.path.insert(0, os.path.join(current_dir, 'backend'))
 
 from lexer import Lexer, LexerError
+from token_buffer import LineIndex
 from parser_ast import ParserAST
+from parser_ll1 import ParserLL1
 from semantic_analyzer import SemanticAnalyzer, SemanticError
+from interpreter import Interpreter, ExecutionError
+from bytecode import compile_program
+from vm import VM
+from closures import compile_closures
+from transpiler import load_code, run_code
+from cgen import run_c, CFLAGS
+
+BACKENDS = ("vm", "ast", "closures", "python", "c")
+
+_POSICION = re.compile(r"\(línea (\d+), columna (\d+)\)$")
 
 
 def print_separator(title="", char="-"):
@@ -20,44 +34,203 @@ def print_separator(title="", char="-"):
         print(char * width)
 
 
-def compile_file(filepath, verbose=False):
-    """Ejecuta el proceso de compilación completo"""
+def print_syntax_errors(parser):
+    """Errores de sintaxis de parser ordenados por posición en el fuente.
+
+    Con cuerpos diferidos, los errores de cada cuerpo se agregan a
+    parser.errors recién al analizarlo, después de los de nivel superior.
+    """
+    def posicion(error):
+        m = _POSICION.search(error)
+        return (int(m.group(1)), int(m.group(2))) if m else (float("inf"), 0)
+
+    for error in sorted(parser.errors, key=posicion):
+        print(f"Error de sintaxis: {error}")
+    if len(parser.errors) >= parser.max_errors:
+        print(f"Análisis sintáctico abandonado tras {len(parser.errors)} errores")
+
+
+def print_result(analyzer, success, syntax_errors, report=True):
+    """Tabla de símbolos y resultado final; report=False si los errores
+    semánticos ya se mostraron"""
+    print("\nTABLA DE SÍMBOLOS\n")
+    print(analyzer.symbol_table.get_table_representation())
+
+    if success and syntax_errors:
+        print("\nAnálisis semántico del AST parcial sin errores")
+        print_separator("COMPILACIÓN FALLIDA", "-")
+        print(f"Errores de sintaxis: {syntax_errors}")
+        return False
+    elif success:
+        print("\nAnálisis semántico completado sin errores")
+        print_separator("COMPILACIÓN EXITOSA", "-")
+        print("El programa pasó todas las fases correctamente")
+        return True
+    else:
+        if report:
+            print("\n" + analyzer.get_errors_report())
+        print_separator("COMPILACIÓN FALLIDA", "-")
+        if syntax_errors:
+            print(f"Errores de sintaxis: {syntax_errors}")
+        print(f"Errores semánticos: {len(analyzer.errors)}")
+        return False
+
+
+def compile_pipeline(parser, verbose=False):
+    """Análisis sintáctico y semántico superpuestos, declaración por declaración.
+
+    Cada declaración de nivel superior se verifica apenas se analiza y luego
+    se descarta: los errores aparecen sin esperar al final del archivo y la
+    memoria queda acotada por la declaración más grande (más la tabla de
+    símbolos), no por el programa completo.
+    """
+    print_separator("FASE 2-3: ANÁLISIS SINTÁCTICO Y SEMÁNTICO")
+    print("Análisis por declaración (cada una se verifica apenas se analiza)\n")
+
+    analyzer = SemanticAnalyzer()
+    mostrados = 0
+    semanticos = 0
+    n_decl = 0
+    for decl, errores in analyzer.analyze_declarations(parser.declaraciones()):
+        n_decl += 1
+        for error in parser.errors[mostrados:]:
+            print(f"Error de sintaxis: {error}")
+        mostrados = len(parser.errors)
+        for error in errores:
+            semanticos += 1
+            print(f"Error semántico {semanticos}: {error}")
+        if verbose:
+            print(f"  {decl}")
+    for error in parser.errors[mostrados:]:
+        print(f"Error de sintaxis: {error}")
+    if len(parser.errors) >= parser.max_errors:
+        print(f"Análisis sintáctico abandonado tras {len(parser.errors)} errores")
+
+    print(f"\nTokens consumidos: {parser.pos}")
+    print(f"Declaraciones analizadas: {n_decl}")
+    return print_result(analyzer, not analyzer.errors, len(parser.errors), report=False)
+
 
+def run_program(ast, backend="vm", source_code=None, c_path=None):
+    """Fase 4: ejecuta el programa verificado desde main().
+
+    backend es "vm" (bytecode), "ast" (recorrido del árbol), "closures",
+    "python" (traducción a Python; con source_code usa la caché de código) o
+    "c" (C compilado con el compilador del sistema; con c_path el C generado
+    se escribe y se conserva ahí).
+    """
+    print_separator("FASE 4: EJECUCIÓN")
+    sys.stdout.flush()
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            source_code = f.read()
+        if backend == "ast":
+            Interpreter().run(ast)
+        elif backend == "closures":
+            compile_closures(ast)()
+        elif backend == "python":
+            run_code(load_code(ast, source_code))
+        elif backend == "c":
+            t_compilacion, t_ejecucion = run_c(ast, fuente=c_path)
+            print_separator()
+            print(f"Compilación C ({' '.join(CFLAGS)}): {t_compilacion * 1000:.1f} ms")
+            print(f"Ejecución: {t_ejecucion * 1000:.1f} ms")
+        else:
+            VM().run(compile_program(ast))
+    except ExecutionError as e:
+        print_separator("ERROR DE EJECUCIÓN", "-")
+        print(str(e))
+        return False
+    print_separator()
+    return True
+
+
+def compile_file(filepath, verbose=False, stream=False, jobs=1, ll1=False, run=False, backend="vm",
+                 c_path=None):
+    """Ejecuta el proceso de compilación completo; con run=True, si compila, lo ejecuta"""
+
+    source_file = None
+    try:
+        if stream:
+            # Los tokens se generan a medida que el parser los consume,
+            # sin cargar el archivo ni la lista de tokens completa.
+            source_file = open(filepath, "r", encoding="utf-8")
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                source_code = f.read()
 
         print(f"Archivo: {filepath}")
-        print(f"Tamaño: {len(source_code)} caracteres\n")
+        if stream:
+            print(f"Tamaño: {os.path.getsize(filepath)} bytes\n")
+        else:
+            print(f"Tamaño: {len(source_code)} caracteres\n")
 
         # --- FASE 1: ANÁLISIS LÉXICO ---
         print_separator("FASE 1: ANÁLISIS LÉXICO")
 
         lexer = Lexer()
-        tokens = lexer.tokenize(source_code)
+        lines = None
+        if stream:
+            lines = LineIndex()
+            tokens = lexer.iter_tokens(source_file, lineas=lines)
+            print("Análisis léxico en modo streaming (junto con el análisis sintáctico)")
+        else:
+            if jobs > 1:
+                tokens = lexer.tokenize_paralelo(source_code, jobs)
+                print(f"Análisis léxico en paralelo ({jobs} procesos)")
+            else:
+                tokens = lexer.tokenize(source_code)
 
-        print("Análisis léxico completado")
-        print(f"Tokens generados: {len(tokens)}")
+            print("Análisis léxico completado")
+            print(f"Tokens generados: {len(tokens)}")
 
-        if verbose:
-            print("\nPrimeros 10 tokens:")
-            for i, token in enumerate(tokens[:10]):
-                print(f"  {i+1}. <{token[0]}, \"{token[1]}\">")
-            if len(tokens) > 10:
-                print(f"  ... y {len(tokens) - 10} más")
+            if verbose:
+                print("\nPrimeros 10 tokens:")
+                for i, token in enumerate(tokens[:10]):
+                    print(f"  {i+1}. <{token[0]}, \"{token[1]}\">")
+                if len(tokens) > 10:
+                    print(f"  ... y {len(tokens) - 10} más")
+
+        if stream and not ll1:
+            return compile_pipeline(ParserAST(tokens, lines), verbose)
 
         # --- FASE 2: ANÁLISIS SINTÁCTICO ---
         print_separator("FASE 2: ANÁLISIS SINTÁCTICO")
 
-        parser = ParserAST(tokens)
-        ast = parser.parse()
+        if ll1:
+            # Parser por tabla con pila explícita: sin límite de anidamiento,
+            # pero sin recuperación de errores
+            parser = ParserLL1(tokens, lines)
+            print("Parser LL(1) por tabla (sin recuperación de errores: se detiene en el primero)")
+        elif jobs > 1:
+            # Los cuerpos de función se saltan: los analiza el pool de la fase 3
+            parser = ParserAST(tokens, lines, lazy=True)
+            print("Cuerpos de función diferidos (se analizan en paralelo en la fase 3)")
+        else:
+            parser = ParserAST(tokens, lines)
+        diferidos = parser.lazy
+        # Con cuerpos diferidos, los errores de sintaxis se informan juntos en
+        # la fase 3, una vez analizados los cuerpos
+        ast = parser.parse(imprimir=not diferidos)
+
+        if stream:
+            print(f"Tokens consumidos: {parser.pos}")
 
         if not ast:
+            if diferidos:
+                print_syntax_errors(parser)
             print("Error en el análisis sintáctico")
             return False
 
-        print("Análisis sintáctico completado")
-        print("AST generado correctamente")
+        if diferidos:
+            print("Declaraciones de nivel superior analizadas")
+            print("Los errores de sintaxis se informan tras analizar los cuerpos")
+        elif parser.errors:
+            # El AST parcial pasa igual por el análisis semántico para
+            # informar todos los problemas en una sola compilación
+            print(f"Errores de sintaxis: {len(parser.errors)}")
+            print("Se continúa con el AST parcial")
+        else:
+            print("Análisis sintáctico completado")
+            print("AST generado correctamente")
 
         if verbose:
             print("\nEstructura del AST:")
@@ -68,21 +241,16 @@ def compile_file(filepath, verbose=False):
         print_separator("FASE 3: ANÁLISIS SEMÁNTICO")
 
         analyzer = SemanticAnalyzer()
-        success = analyzer.analyze(ast)
-
-        print("\nTABLA DE SÍMBOLOS\n")
-        print(analyzer.symbol_table.get_table_representation())
-
-        if success:
-            print("\nAnálisis semántico completado sin errores")
-            print_separator("COMPILACIÓN EXITOSA", "-")
-            print("El programa pasó todas las fases correctamente")
-            return True
-        else:
-            print("\n" + analyzer.get_errors_report())
-            print_separator("COMPILACIÓN FALLIDA", "-")
-            print(f"Errores semánticos: {len(analyzer.errors)}")
+        if jobs > 1:
+            print(f"Cuerpos de función analizados y verificados en paralelo ({jobs} procesos)")
+        success = analyzer.analyze(ast, jobs)
+        if diferidos and parser.errors:
+            print_syntax_errors(parser)
+            print(f"Errores de sintaxis: {len(parser.errors)}")
+            print("Se continúa con el AST parcial")
+        if not print_result(analyzer, success, len(parser.errors)):
             return False
+        return run_program(ast, backend, source_code, c_path) if run else True
 
     except LexerError as e:
         print_separator("ERROR LÉXICO", "-")
@@ -101,16 +269,53 @@ def compile_file(filepath, verbose=False):
         traceback.print_exc()
         return False
 
+    finally:
+        if source_file is not None:
+            source_file.close()
+
 
 def main():
     if len(sys.argv) < 2:
-        print("Uso: python compile.py <archivo.src> [--verbose]")
+        print("Uso: python compile.py <archivo.src> [--verbose] [--stream] [--jobs N] [--ll1] [--run] [--backend vm|ast|closures|python|c] [--emit-c <archivo.c>]")
+        print("  --ll1  usa el parser LL(1) por tabla; no se recupera de los errores de sintaxis: informa el primero y se detiene")
         sys.exit(1)
 
     filepath = sys.argv[1]
     verbose = "--verbose" in sys.argv or "-v" in sys.argv
+    stream = "--stream" in sys.argv
+    ll1 = "--ll1" in sys.argv
+    run = "--run" in sys.argv
+    backend = "vm"
+    if "--backend" in sys.argv:
+        i = sys.argv.index("--backend")
+        if i + 1 >= len(sys.argv) or sys.argv[i + 1] not in BACKENDS:
+            print(f"--backend requiere uno de: {', '.join(BACKENDS)}")
+            sys.exit(1)
+        backend = sys.argv[i + 1]
+    c_path = None
+    if "--emit-c" in sys.argv:
+        i = sys.argv.index("--emit-c")
+        if i + 1 >= len(sys.argv):
+            print("--emit-c requiere la ruta del archivo C")
+            sys.exit(1)
+        c_path = sys.argv[i + 1]
+        if not run or backend != "c":
+            # Sin ejecutar con el backend C no se genera ningún C
+            print("--emit-c solo se puede usar con --run --backend c")
+            sys.exit(1)
+    if run and stream:
+        # El análisis por declaración descarta el AST: para ejecutar hace falta completo
+        print("--run necesita el AST completo: se ignora --stream")
+        stream = False
+    jobs = 1
+    if "--jobs" in sys.argv:
+        i = sys.argv.index("--jobs")
+        if i + 1 >= len(sys.argv) or not sys.argv[i + 1].isdigit() or int(sys.argv[i + 1]) < 1:
+            print("--jobs requiere un número de procesos mayor que 0")
+            sys.exit(1)
+        jobs = int(sys.argv[i + 1])
 
-    success = compile_file(filepath, verbose)
+    success = compile_file(filepath, verbose, stream, jobs, ll1, run, backend, c_path)
     sys.exit(0 if success else 1)
 
 
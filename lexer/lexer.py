@@ -1,136 +1,362 @@
 import sys
+import re
+import codecs
+from types import MappingProxyType
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from token_buffer import TokenBuffer, TOKEN_NAMES, TOKEN_KINDS, T_ID, T_NUM
+from lexgen import generar, patron
 
 class LexerError(Exception):
     pass
 
-KEYWORDS = {k.lower(): k for k in ["IF", "ELSE", "WHILE", "FOR", "INT", "FLOAT", "RETURN", "PRINT", "VOID"]}
+# AFD mínimo generado desde specs/tokens_spec.md, una fila bytes por estado
+_TABLA = generar()
+_FILAS = _TABLA.filas()
+
+# Palabras clave de la especificación, por nombre de token
+KEYWORDS = {kw: TOKEN_NAMES[kind] for kw, kind in _TABLA.palabras_clave.items()}
+
+# Patrón maestro, generado desde la misma especificación que el AFD. Los
+# espacios y comentarios (#, //, /* */) se reconocen como separadores para
+# conservar la posición de cada token en el texto original: los espacios se
+# absorben al comienzo de cada coincidencia y los comentarios (o el fin del
+# texto) forman el grupo SKIP. Un /* sin cerrar consume el resto del archivo.
+# Las palabras clave no tienen alternativa propia: se reconocen como ID
+# completo (maximal munch) y se reclasifican con _PALABRAS_CLAVE.
+_ALTERNATIVAS, _LITERALES = patron()
+_TOKEN_RE = re.compile(
+    r"[ \t\r\n]*(?:"
+    r"(?P<SKIP>#[^\n]*|//[^\n]*|/\*(?s:.*?\*/|.*)|\Z)"
+    r"|" + _ALTERNATIVAS + ")",
+    re.ASCII
+)
+
+# Tipo de token de cada grupo del patrón; 0 para SKIP y None para LITERAL,
+# cuyo tipo sale del lexema
+_KIND_DE_GRUPO = [0] * (_TOKEN_RE.groups + 1)
+for _nombre, _grupo in _TOKEN_RE.groupindex.items():
+    _KIND_DE_GRUPO[_grupo] = TOKEN_KINDS.get(_nombre, 0)
+_KIND_DE_GRUPO[_TOKEN_RE.groupindex["LITERAL"]] = None
+
+_ESPACIOS_RE = re.compile(r"[ \t\r\n]*")
+
+_COMENTARIOS_RE = re.compile(r"#[^\n]*|//[^\n]*|/\*(?:.*?\*/|.*)", re.S)
 
-class AFD:
-    def __init__(self, estados, transiciones, estado_inicial, estados_aceptacion):
-        self.estados = estados
-        self.transiciones = transiciones
-        self.estado_inicial = estado_inicial
-        self.estados_aceptacion = estados_aceptacion
+_SEPARADORES_RE = re.compile(r"(?:[ \t\r\n]+|#[^\n]*|//[^\n]*|/\*(?:.*?\*/|.*))*", re.S)
 
-    def mover(self, estado, simbolo):
-        return self.transiciones.get(estado, {}).get(simbolo, None)
+# Búsqueda exacta de palabras clave sobre el identificador completo
+_PALABRAS_CLAVE = MappingProxyType(_TABLA.palabras_clave)
+
+def cortes_seguros(texto, partes):
+    """Posiciones para dividir texto en hasta partes trozos que se pueden lexear por separado.
+
+    Cada corte queda justo después de un salto de línea que no está dentro de
+    un comentario /* */, así ningún token ni comentario cruza de un trozo a
+    otro. Los comentarios se ubican con un recorrido previo de _COMENTARIOS_RE,
+    que respeta que un /* dentro de un comentario de línea no abre nada.
+    """
+    inicios = array('I')
+    fines = array('I')
+    for m in _COMENTARIOS_RE.finditer(texto):
+        if texto.startswith("/*", m.start()):
+            inicios.append(m.start())
+            fines.append(m.end())
+
+    n = len(texto)
+    cortes = []
+    anterior = 0
+    for k in range(1, partes):
+        pos = max(n * k // partes, anterior)
+        while True:
+            pos = texto.find("\n", pos)
+            if pos < 0:
+                return cortes
+            i = bisect_right(inicios, pos) - 1
+            if i < 0 or pos >= fines[i]:
+                break
+            pos = fines[i]
+        if pos + 1 < n:
+            cortes.append(pos + 1)
+            anterior = pos + 1
+    return cortes
+
+
+def _lexear_trozo(trozo):
+    """Lexea un trozo en un proceso del pool; devuelve los arrays del TokenBuffer"""
+    texto, base = trozo
+    tokens = TokenBuffer(texto)
+    Lexer()._escanear(texto, tokens, True, base)
+    return tokens.kinds, tokens.starts, tokens.ends
 
-    def es_aceptacion(self, estado):
-        return estado in self.estados_aceptacion
 
 class Lexer:
     def __init__(self):
-        trans_id_q0 = {c: "q1" for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_"}
-        trans_id_q1 = {c: "q1" for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_0123456789"}
-        self.afd_id = AFD(["q0", "q1"], {"q0": trans_id_q0, "q1": trans_id_q1}, "q0", ["q1"])
-
-        trans_num_q0 = {c: "q1" for c in "0123456789"}
-        trans_num_q1 = {c: "q1" for c in "0123456789"}
-        trans_num_q1["."] = "q2"
-        trans_num_q2 = {c: "q3" for c in "0123456789"}
-        trans_num_q3 = {c: "q3" for c in "0123456789"}
-        self.afd_num = AFD(["q0", "q1", "q2", "q3"], {"q0": trans_num_q0, "q1": trans_num_q1, "q2": trans_num_q2, "q3": trans_num_q3}, "q0", ["q1", "q3"])
-
-    def limpiar_codigo(self, texto):
-        result = ""
-        i = 0
-        n = len(texto)
-        while i < n:
-            c = texto[i]
-            if c == "#":
-                while i < n and texto[i] != "\n":
-                    i += 1
-            elif c == "/" and i + 1 < n and texto[i + 1] == "/":
-                i += 2
-                while i < n and texto[i] != "\n":
-                    i += 1
-            elif c == "/" and i + 1 < n and texto[i + 1] == "*":
-                i += 2
-                while i + 1 < n and not (texto[i] == "*" and texto[i+1] == "/"):
-                    i += 1
-                i += 2
-            elif c in " \t\r\n":
-                i += 1
-            else:
-                result += c
-                i += 1
-        return result
+        self.tabla = _TABLA
 
     def tokenize(self, texto):
-        texto = self.limpiar_codigo(texto)
-        tokens = []
+        tokens = TokenBuffer(texto)
+        self._escanear(texto, tokens, True)
+        return tokens
+
+    def tokenize_paralelo(self, texto, jobs):
+        """Como tokenize, pero lexea trozos del texto en un pool de jobs procesos.
+
+        El texto se divide con cortes_seguros y los buffers de cada trozo se
+        concatenan en orden, por lo que el resultado es idéntico al de
+        tokenize. Si hay varios errores léxicos se informa el primero.
+        """
+        limites = [0] + cortes_seguros(texto, jobs) + [len(texto)]
+        if len(limites) <= 2:
+            return self.tokenize(texto)
+        trozos = [(texto[a:b], a) for a, b in zip(limites, limites[1:])]
+
+        tokens = TokenBuffer(texto)
+        with ProcessPoolExecutor(len(trozos)) as pool:
+            for kinds, starts, ends in pool.map(_lexear_trozo, trozos):
+                tokens.kinds.extend(kinds)
+                tokens.starts.extend(starts)
+                tokens.ends.extend(ends)
+        return tokens
+
+    def _escanear(self, texto, tokens, final, base=0):
+        """Reconoce los tokens de texto y los agrega al TokenBuffer.
+
+        Las posiciones se guardan desplazadas en base. Si final es False, el
+        último lexema (o un carácter suelto al final) puede continuar en el
+        siguiente bloque: no se emite y se devuelve su posición para que el
+        llamador lo conserve. Con final True devuelve len(texto).
+        """
+        kinds = tokens.kinds.append
+        starts = tokens.starts.append
+        ends = tokens.ends.append
         pos = 0
         n = len(texto)
 
-        while pos < n:
-            c = texto[pos]
-            matched = False 
-
-            estado = self.afd_num.estado_inicial
-            start = pos
-            temp_pos = pos
-            while temp_pos < n:
-                siguiente = self.afd_num.mover(estado, texto[temp_pos])
-                if siguiente is None:
-                    break
-                estado = siguiente
-                temp_pos += 1
-            if self.afd_num.es_aceptacion(estado):
-                lex = texto[start:temp_pos]
-                if temp_pos < n and (texto[temp_pos].isalpha() or texto[temp_pos] == '_'):
-                    raise LexerError(f"Lexema inválido '{texto[start:temp_pos+1]}'")
-                tokens.append(("NUM", lex))
-                pos = temp_pos
-                matched = True
-                continue
+        for m in _TOKEN_RE.finditer(texto):
+            if m.start() != pos:
+                break
+            grupo = m.lastindex
+            start, end = m.span(grupo)
+            if not final and end == n:
+                return pos
+            pos = end
 
-            dos_char_ops = {"==": "OP_EQ", "!=": "OP_NEQ", "<=": "OP_LE", ">=": "OP_GE", "&&": "OP_AND", "||": "OP_OR"}
-            if pos + 1 < n and texto[pos:pos+2] in dos_char_ops:
-                tokens.append((dos_char_ops[texto[pos:pos+2]], texto[pos:pos+2]))
-                pos += 2
-                matched = True
+            kind = _KIND_DE_GRUPO[grupo]
+            if kind is None:
+                kind = _LITERALES[texto[start:end]]
+            elif kind == T_ID:
+                kind = _PALABRAS_CLAVE.get(texto[start:end], T_ID)
+            elif kind == T_NUM:
+                # "12." deja al AFD de números en un estado no final: el
+                # recorrido falla en el siguiente carácter (o en el próximo
+                # bloque, que puede traer los decimales)
+                if end < n and texto[end] == "." and "." not in texto[start:end]:
+                    if not final and end + 1 == n:
+                        return m.start()
+                    raise LexerError(f"Carácter inesperado: {texto[start]}")
+                if end < n and (texto[end].isalpha() or texto[end] == "_"):
+                    raise LexerError(f"Lexema inválido '{texto[start:end + 1]}'")
+            elif not kind:
                 continue
+            kinds(kind)
+            starts(base + start)
+            ends(base + end)
 
-            uno_char_ops = {"+": "OP_SUMA", "-": "OP_RESTA", "*": "OP_MUL", "/": "OP_DIV", "%": "OP_MOD",
-                            "=": "ASIGNACION", "!": "OP_NOT", "<": "OP_LT", ">": "OP_GT",
-                            "(": "LPAREN", ")": "RPAREN", "{": "LBRACE", "}": "RBRACE", ";": "PUNTOYCOMA", ",": "COMA"}
-            if c in uno_char_ops:
-                tokens.append((uno_char_ops[c], c))
-                pos += 1
-                matched = True
-                continue
+        if pos < n:
+            error = _ESPACIOS_RE.match(texto, pos).end()
+            # "&" o "|" al final del bloque pueden completar "&&" / "||"
+            if not final and error == n - 1:
+                return pos
+            raise LexerError(f"Carácter inesperado: {texto[error]}")
+
+        return pos
 
-            estado = self.afd_id.estado_inicial
-            start = pos
-            while pos < n:
-                siguiente = self.afd_id.mover(estado, texto[pos])
-                if siguiente is None:
+    def relex(self, tokens, offset, borrados, insertado):
+        """Actualiza un TokenBuffer tras reemplazar borrados caracteres en offset por insertado.
+
+        Se vuelve a lexear desde el final del último token que termina antes de
+        la edición, en ventanas crecientes, hasta que un token posterior a la
+        edición coincide (tipo y posición desplazada) con uno del flujo
+        anterior; desde ahí el resto se reutiliza. Abrir o cerrar un /* */
+        extiende el re-lexeo hasta donde termine el comentario.
+
+        Devuelve (nuevo_buffer, (primero, fin_viejo, fin_nuevo)): los tokens
+        viejos [primero, fin_viejo) fueron reemplazados por los nuevos
+        [primero, fin_nuevo).
+        """
+        texto = tokens.source[:offset] + insertado + tokens.source[offset + borrados:]
+        delta = len(insertado) - borrados
+        fin_edicion = offset + len(insertado)
+        n = len(texto)
+
+        # Un token que termina justo en offset puede extenderse con la edición
+        primero = bisect_left(tokens.ends, offset)
+        pos = tokens.ends[primero - 1] if primero > 0 else 0
+
+        nuevos = TokenBuffer(texto)
+        ventana = fin_edicion - pos + 256
+        while True:
+            limite = min(pos + ventana, n)
+            final = limite == n
+            parte = TokenBuffer(texto)
+            corte = self._escanear(texto[pos:limite], parte, final, pos)
+
+            for k in range(len(parte)):
+                start = parte.starts[k]
+                if start < fin_edicion:
+                    continue
+                j = bisect_left(tokens.starts, start - delta)
+                if (j < len(tokens) and tokens.starts[j] == start - delta
+                        and tokens.ends[j] == parte.ends[k] - delta
+                        and tokens.kinds[j] == parte.kinds[k]):
+                    self._agregar(nuevos, parte, k + 1)
+                    return self._empalmar(tokens, nuevos, primero, j + 1, delta)
+
+            self._agregar(nuevos, parte, len(parte))
+            if final:
+                return self._empalmar(tokens, nuevos, primero, len(tokens), delta)
+            pos += corte
+            ventana *= 2
+
+    def _agregar(self, destino, origen, cantidad):
+        destino.kinds.extend(origen.kinds[:cantidad])
+        destino.starts.extend(origen.starts[:cantidad])
+        destino.ends.extend(origen.ends[:cantidad])
+
+    def _empalmar(self, viejos, nuevos, primero, siguiente, delta):
+        resultado = TokenBuffer(nuevos.source)
+        resultado.kinds = viejos.kinds[:primero] + nuevos.kinds + viejos.kinds[siguiente:]
+        cola_starts = viejos.starts[siguiente:]
+        cola_ends = viejos.ends[siguiente:]
+        if delta:
+            cola_starts = array('I', map(delta.__add__, cola_starts))
+            cola_ends = array('I', map(delta.__add__, cola_ends))
+        resultado.starts = viejos.starts[:primero] + nuevos.starts + cola_starts
+        resultado.ends = viejos.ends[:primero] + nuevos.ends + cola_ends
+        return resultado, (primero, siguiente, primero + len(nuevos))
+
+    def iter_tokens(self, fuente, tam_bloque=1 << 16, lineas=None):
+        """Genera los tokens de un archivo, mmap o cadena sin cargar todo el flujo.
+
+        Cada token es una tupla (tipo, lexema, inicio) con la posición absoluta
+        en la fuente. La fuente se lee por bloques de tam_bloque caracteres (o
+        bytes, que se decodifican como UTF-8). Solo se retiene entre bloques lo
+        que aún puede cambiar: el último token, un '/' que puede abrir un
+        comentario y la apertura de un comentario sin cerrar, nunca su
+        contenido. Si se pasa un LineIndex en lineas, se completa a medida que
+        se leen los bloques.
+        """
+        if isinstance(fuente, str):
+            bloques = iter((fuente,))
+        else:
+            bloques = self._leer_bloques(fuente, tam_bloque)
+
+        pendiente = ""
+        base = 0
+        leidos = 0
+        for bloque in bloques:
+            if lineas is not None:
+                lineas.feed(bloque, leidos)
+            leidos += len(bloque)
+            texto = pendiente + bloque
+            tokens = TokenBuffer(texto)
+            corte = self._escanear(texto, tokens, False, base)
+            yield from self._con_posicion(tokens, texto, base)
+            pendiente = self._resto_pendiente(texto[corte:])
+            base = leidos - len(pendiente)
+
+        tokens = TokenBuffer(pendiente)
+        self._escanear(pendiente, tokens, True, base)
+        yield from self._con_posicion(tokens, pendiente, base)
+
+    def _con_posicion(self, tokens, texto, base):
+        for kind, start, end in zip(tokens.kinds, tokens.starts, tokens.ends):
+            yield (TOKEN_NAMES[kind], texto[start - base:end - base], start)
+
+    def _leer_bloques(self, fuente, tam_bloque):
+        decodificador = None
+        while True:
+            bloque = fuente.read(tam_bloque)
+            if not bloque:
+                break
+            if not isinstance(bloque, str):
+                if decodificador is None:
+                    decodificador = codecs.getincrementaldecoder("utf-8")()
+                bloque = decodificador.decode(bloque)
+            yield bloque
+        if decodificador is not None:
+            yield decodificador.decode(b"", final=True)
+
+    def _resto_pendiente(self, resto):
+        """Reduce lo que queda sin reconocer al final de un bloque.
+
+        Los espacios y comentarios completos se descartan, y de un comentario
+        abierto solo se guarda la apertura (más un '*' final que podría
+        cerrarlo), así la memoria retenida no crece con el comentario.
+        """
+        resto = resto.lstrip(" \t\r\n")
+        if not resto:
+            return ""
+        if resto[0] == "#":
+            return "#"
+        if resto.startswith("//"):
+            return "//"
+        if resto.startswith("/*"):
+            if len(resto) >= 4 and resto.endswith("*/"):
+                return ""
+            return "/**" if len(resto) > 2 and resto[-1] == "*" else "/*"
+        return resto
+
+    def tokenize_tabla(self, texto):
+        """Reconoce los tokens recorriendo la tabla del AFD generado desde la especificación.
+
+        Un solo bucle con maximal munch: se avanza mientras haya transición y
+        se emite el último estado de aceptación visto. Los separadores se
+        saltan con _SEPARADORES_RE. Devuelve el mismo TokenBuffer que tokenize.
+        """
+        tokens = TokenBuffer(texto)
+        kinds = tokens.kinds.append
+        starts = tokens.starts.append
+        ends = tokens.ends.append
+        clases = texto.translate(self.tabla.clases).encode("latin-1")
+        aceptacion = self.tabla.aceptacion
+        filas = _FILAS
+        inicial = filas[1]
+        separador = _SEPARADORES_RE.match
+        n = len(texto)
+        pos = separador(texto, 0).end()
+
+        while pos < n:
+            estado = inicial[clases[pos]]
+            if not estado:
+                raise LexerError(f"Carácter inesperado: {texto[pos]}")
+            j = pos + 1
+            tipo = aceptacion[estado]
+            ultimo = j if tipo else -1
+            while j < n:
+                estado = filas[estado][clases[j]]
+                if not estado:
                     break
-                estado = siguiente
-                pos += 1
-            if self.afd_id.es_aceptacion(estado):
-                lex = texto[start:pos]
-
-                palabra_reservada = None
-                for kw in KEYWORDS:
-                    if lex.startswith(kw) and (len(lex) == len(kw) or not lex[len(kw)].isalnum() and lex[len(kw)] != "_"):
-                        palabra_reservada = kw
-                        break
-                    elif lex.startswith(kw):
-                        palabra_reservada = kw
-                        break
-
-                if palabra_reservada:
-                    tokens.append((KEYWORDS[palabra_reservada], lex[:len(palabra_reservada)]))
-                    pos = start + len(palabra_reservada)
-                else:
-                    tokens.append(("ID", lex))
-
-                matched = True
-                continue
+                j += 1
+                if aceptacion[estado]:
+                    tipo = aceptacion[estado]
+                    ultimo = j
 
-            if not matched:
+            if ultimo < 0:
                 raise LexerError(f"Carácter inesperado: {texto[pos]}")
+            if tipo == T_NUM:
+                # "12." deja el recorrido más allá del último estado final
+                if j > ultimo:
+                    raise LexerError(f"Carácter inesperado: {texto[pos]}")
+                if ultimo < n and (texto[ultimo].isalpha() or texto[ultimo] == "_"):
+                    raise LexerError(f"Lexema inválido '{texto[pos:ultimo + 1]}'")
+            kinds(tipo)
+            starts(pos)
+            ends(ultimo)
+            pos = separador(texto, ultimo).end()
 
         return tokens
 
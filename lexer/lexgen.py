@@ -0,0 +1,383 @@
+"""Generador del AFD léxico a partir de specs/tokens_spec.md.
+
+Lee la tabla de tokens (nombre y expresión regular), construye un AFND por
+el método de Thompson, lo determiniza por subconjuntos y lo minimiza por
+refinamiento de particiones. El resultado es una única tabla plana de
+transiciones indexada por estado * num_clases + clase, donde las clases son
+grupos de caracteres con el mismo comportamiento en todas las expresiones.
+"""
+import os
+import re
+from array import array
+
+from token_buffer import TOKEN_KINDS
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'specs', 'tokens_spec.md')
+
+# Símbolos del alfabeto: los caracteres ASCII y OTRO para cualquier otro carácter
+OTRO = 128
+ALFABETO = frozenset(range(OTRO + 1))
+
+_ESCAPES = {
+    "d": frozenset(range(ord("0"), ord("9") + 1)),
+    "w": frozenset(ord(c) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"),
+    "s": frozenset(ord(c) for c in " \t\r\n\f\v"),
+}
+
+
+class SpecError(Exception):
+    pass
+
+
+def leer_spec(path=SPEC_PATH):
+    """Devuelve [(nombre, regex)] en el orden de la tabla de tokens"""
+    reglas = []
+    en_tabla = False
+    with open(path, "r", encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea.startswith("|"):
+                en_tabla = False
+                continue
+            # En Markdown "\|" es un '|' dentro de la celda
+            celdas = [c.strip() for c in re.split(r"(?<!\\)\|", linea)[1:-1]]
+            if celdas[0] == "Token":
+                en_tabla = True
+                continue
+            if not en_tabla or set(celdas[0]) <= set("-: "):
+                continue
+            regex = celdas[1].strip("`").replace("\\|", "|")
+            reglas.append((celdas[0], regex))
+    if not reglas:
+        raise SpecError(f"No se encontró la tabla de tokens en {path}")
+    return reglas
+
+
+class _Regex:
+    """Parser descendente de la sintaxis de expresiones regulares usada en la especificación"""
+
+    def __init__(self, texto, afnd):
+        self.texto = texto
+        self.pos = 0
+        self.afnd = afnd
+
+    def parse(self):
+        fragmento = self.alternativa()
+        if self.pos != len(self.texto):
+            raise SpecError(f"Expresión inválida '{self.texto}' en la posición {self.pos}")
+        return fragmento
+
+    def peek(self):
+        return self.texto[self.pos] if self.pos < len(self.texto) else None
+
+    def alternativa(self):
+        opciones = [self.concatenacion()]
+        while self.peek() == "|":
+            self.pos += 1
+            opciones.append(self.concatenacion())
+        if len(opciones) == 1:
+            return opciones[0]
+        inicio, fin = self.afnd.nuevo(), self.afnd.nuevo()
+        for a, b in opciones:
+            self.afnd.epsilon(inicio, a)
+            self.afnd.epsilon(b, fin)
+        return inicio, fin
+
+    def concatenacion(self):
+        fragmentos = []
+        while self.peek() not in (None, "|", ")"):
+            fragmentos.append(self.repeticion())
+        if not fragmentos:
+            estado = self.afnd.nuevo()
+            return estado, estado
+        inicio, fin = fragmentos[0]
+        for a, b in fragmentos[1:]:
+            self.afnd.epsilon(fin, a)
+            fin = b
+        return inicio, fin
+
+    def repeticion(self):
+        a, b = self.atomo()
+        while self.peek() in ("*", "+", "?"):
+            op = self.texto[self.pos]
+            self.pos += 1
+            inicio, fin = self.afnd.nuevo(), self.afnd.nuevo()
+            self.afnd.epsilon(inicio, a)
+            self.afnd.epsilon(b, fin)
+            if op in "*?":
+                self.afnd.epsilon(inicio, fin)
+            if op in "*+":
+                self.afnd.epsilon(b, a)
+            a, b = inicio, fin
+        return a, b
+
+    def atomo(self):
+        c = self.peek()
+        if c == "(":
+            self.pos += 1
+            if self.texto.startswith("?:", self.pos):
+                self.pos += 2
+            fragmento = self.alternativa()
+            if self.peek() != ")":
+                raise SpecError(f"Falta ')' en '{self.texto}'")
+            self.pos += 1
+            return fragmento
+        if c == "[":
+            simbolos = self.clase()
+        elif c == "\\":
+            simbolos = self.escape()
+        elif c == ".":
+            self.pos += 1
+            simbolos = ALFABETO - {ord("\n")}
+        else:
+            self.pos += 1
+            simbolos = frozenset((ord(c),))
+        inicio, fin = self.afnd.nuevo(), self.afnd.nuevo()
+        self.afnd.transicion(inicio, simbolos, fin)
+        return inicio, fin
+
+    def escape(self):
+        c = self.texto[self.pos + 1]
+        self.pos += 2
+        return _ESCAPES.get(c, frozenset((ord(c),)))
+
+    def clase(self):
+        self.pos += 1
+        negada = self.peek() == "^"
+        if negada:
+            self.pos += 1
+        simbolos = set()
+        while self.peek() != "]":
+            if self.peek() is None:
+                raise SpecError(f"Falta ']' en '{self.texto}'")
+            if self.peek() == "\\":
+                grupo = self.escape()
+                simbolos |= grupo
+                continue
+            desde = self.texto[self.pos]
+            self.pos += 1
+            if self.peek() == "-" and self.texto[self.pos + 1] != "]":
+                hasta = self.texto[self.pos + 1]
+                self.pos += 2
+                simbolos.update(range(ord(desde), ord(hasta) + 1))
+            else:
+                simbolos.add(ord(desde))
+        self.pos += 1
+        return ALFABETO - simbolos if negada else frozenset(simbolos)
+
+
+class _AFND:
+    def __init__(self):
+        self.epsilons = []
+        self.transiciones = []
+        self.aceptacion = {}
+
+    def nuevo(self):
+        self.epsilons.append([])
+        self.transiciones.append([])
+        return len(self.epsilons) - 1
+
+    def epsilon(self, desde, hasta):
+        self.epsilons[desde].append(hasta)
+
+    def transicion(self, desde, simbolos, hasta):
+        self.transiciones[desde].append((simbolos, hasta))
+
+    def clausura(self, estados):
+        pila = list(estados)
+        visitados = set(estados)
+        while pila:
+            for siguiente in self.epsilons[pila.pop()]:
+                if siguiente not in visitados:
+                    visitados.add(siguiente)
+                    pila.append(siguiente)
+        return frozenset(visitados)
+
+
+class TablaLexica:
+    """AFD mínimo en forma de tabla plana.
+
+    transiciones[estado * num_clases + clase] es el siguiente estado; el
+    estado 0 es el de error y el 1 el inicial. aceptacion[estado] es el tipo
+    de token (entero de token_buffer) o 0 si el estado no es final.
+    clases traduce cada carácter a su clase con str.translate y
+    palabras_clave asocia cada palabra clave con su tipo.
+    """
+
+    def __init__(self, num_clases, clases, transiciones, aceptacion, palabras_clave):
+        self.num_clases = num_clases
+        self.clases = clases
+        self.transiciones = transiciones
+        self.aceptacion = aceptacion
+        self.palabras_clave = palabras_clave
+
+    @property
+    def num_estados(self):
+        return len(self.aceptacion)
+
+    def filas(self):
+        """Una fila bytes por estado: filas()[estado][clase] es el siguiente estado"""
+        if self.num_estados > 255:
+            raise SpecError("El AFD tiene demasiados estados para filas de un byte")
+        nc = self.num_clases
+        return [bytes(self.transiciones[e * nc:(e + 1) * nc].tolist()) for e in range(self.num_estados)]
+
+
+class _ClasesTraduccion(dict):
+    """Tabla para str.translate: los caracteres no ASCII van a la clase de OTRO"""
+
+    def __init__(self, clase_de, otro):
+        super().__init__({c: chr(clase_de[c]) for c in range(OTRO)})
+        self.otro = otro
+
+    def __missing__(self, codigo):
+        return self.otro
+
+
+def _es_palabra(regex):
+    return re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", regex) is not None
+
+
+def _literal(regex):
+    """Texto que reconoce regex si es un literal (sin operadores ni clases), o None"""
+    if re.fullmatch(r"(?:\\[^A-Za-z0-9]|[^\\.^$*+?{}\[\]|()])+", regex):
+        return re.sub(r"\\(.)", r"\1", regex)
+    return None
+
+
+def patron(reglas=None):
+    """Alternativas para el módulo re equivalentes al AFD de generar(reglas).
+
+    Devuelve (patron, literales). Cada regla que no es un literal tiene su
+    grupo con el nombre del token; los literales comparten el grupo LITERAL,
+    del más largo al más corto, porque re se queda con la primera alternativa
+    que coincide, y literales asocia cada lexema con su tipo. Las palabras
+    clave no tienen alternativa: se reconocen con la regla de ID y se
+    reclasifican con TablaLexica.palabras_clave. Se compila con re.ASCII,
+    así \\d, \\w y \\s son los de _ESCAPES.
+    """
+    if reglas is None:
+        reglas = leer_spec()
+
+    grupos = []
+    literales = {}
+    for nombre, regex in reglas:
+        if nombre not in TOKEN_KINDS:
+            raise SpecError(f"Token desconocido en la especificación: {nombre}")
+        if _es_palabra(regex):
+            continue
+        texto = _literal(regex)
+        if texto is None:
+            grupos.append(f"(?P<{nombre}>{regex})")
+        else:
+            literales[texto] = TOKEN_KINDS[nombre]
+    alternativas = "|".join(re.escape(t) for t in sorted(literales, key=len, reverse=True))
+    grupos.append(f"(?P<LITERAL>{alternativas})")
+    return "|".join(grupos), literales
+
+
+def generar(reglas=None):
+    """Construye la TablaLexica para las reglas [(nombre, regex)] de la especificación.
+
+    Ante empates de longitud gana la regla que aparece primero en la tabla,
+    salvo las palabras clave (reglas cuyo patrón es una palabra), que ganan
+    siempre: así VOID se reconoce aunque su fila esté después de ID.
+    """
+    if reglas is None:
+        reglas = leer_spec()
+
+    palabras_clave = {}
+    afnd = _AFND()
+    inicio = afnd.nuevo()
+    for prioridad, (nombre, regex) in enumerate(reglas):
+        if nombre not in TOKEN_KINDS:
+            raise SpecError(f"Token desconocido en la especificación: {nombre}")
+        if _es_palabra(regex):
+            palabras_clave[regex] = TOKEN_KINDS[nombre]
+            prioridad = -1
+        a, b = _Regex(regex, afnd).parse()
+        if b in afnd.clausura([a]):
+            raise SpecError(f"La expresión de {nombre} acepta la cadena vacía: '{regex}'")
+        afnd.epsilon(inicio, a)
+        afnd.aceptacion[b] = (prioridad, TOKEN_KINDS[nombre])
+
+    # Clases de caracteres: símbolos que ninguna transición distingue
+    conjuntos = {simbolos for trans in afnd.transiciones for simbolos, _ in trans}
+    firmas = {}
+    clase_de = {}
+    for simbolo in sorted(ALFABETO):
+        firma = tuple(simbolo in conjunto for conjunto in conjuntos)
+        clase_de[simbolo] = firmas.setdefault(firma, len(firmas))
+    num_clases = len(firmas)
+    representante = {}
+    for simbolo, clase in clase_de.items():
+        representante.setdefault(clase, simbolo)
+
+    # Construcción por subconjuntos; el conjunto vacío es el estado de error
+    vacio = frozenset()
+    estados = [vacio, afnd.clausura([inicio])]
+    indice = {vacio: 0, estados[1]: 1}
+    mover = []
+    i = 0
+    while i < len(estados):
+        actual = estados[i]
+        fila = []
+        for clase in range(num_clases):
+            simbolo = representante[clase]
+            destino = set()
+            for estado in actual:
+                for simbolos, siguiente in afnd.transiciones[estado]:
+                    if simbolo in simbolos:
+                        destino.add(siguiente)
+            destino = afnd.clausura(destino) if destino else vacio
+            if destino not in indice:
+                indice[destino] = len(estados)
+                estados.append(destino)
+            fila.append(indice[destino])
+        mover.append(fila)
+        i += 1
+
+    def token_de(conjunto):
+        finales = [afnd.aceptacion[e] for e in conjunto if e in afnd.aceptacion]
+        return min(finales)[1] if finales else 0
+
+    aceptacion = [token_de(conjunto) for conjunto in estados]
+
+    # Minimización por refinamiento (Moore): se separan los estados con
+    # distinto token y luego los que transicionan a bloques distintos.
+    bloque = aceptacion[:]
+    while True:
+        firmas = {}
+        nuevo = [firmas.setdefault((bloque[e], tuple(bloque[d] for d in mover[e])), len(firmas))
+                 for e in range(len(estados))]
+        if len(firmas) == len(set(bloque)):
+            break
+        bloque = nuevo
+    bloque = nuevo
+
+    # Renumerar para que el error sea 0 y el inicial 1
+    orden = {bloque[0]: 0, bloque[1]: 1}
+    for e in range(len(estados)):
+        orden.setdefault(bloque[e], len(orden))
+    num_estados = len(orden)
+    transiciones = array('H', bytes(2 * num_estados * num_clases))
+    aceptacion_min = array('B', bytes(num_estados))
+    for e in range(len(estados)):
+        m = orden[bloque[e]]
+        aceptacion_min[m] = aceptacion[e]
+        for clase, d in enumerate(mover[e]):
+            transiciones[m * num_clases + clase] = orden[bloque[d]]
+
+    clases = _ClasesTraduccion(clase_de, chr(clase_de[OTRO]))
+    return TablaLexica(num_clases, clases, transiciones, aceptacion_min, palabras_clave)
+
+
+def main():
+    tabla = generar()
+    print(f"Estados: {tabla.num_estados}")
+    print(f"Clases de caracteres: {tabla.num_clases}")
+    print(f"Palabras clave: {', '.join(tabla.palabras_clave)}")
+
+
+if __name__ == "__main__":
+    main()
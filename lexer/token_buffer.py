@@ -0,0 +1,115 @@
+from array import array
+from bisect import bisect_right
+
+# Tipos de token como enteros pequeños. El orden solo importa para que
+# TOKEN_NAMES[kind] devuelva el nombre usado en el resto del compilador.
+TOKEN_NAMES = (
+    "EOF", "ID", "NUM",
+    "IF", "ELSE", "WHILE", "FOR", "INT", "FLOAT", "RETURN", "PRINT", "VOID",
+    "OP_EQ", "OP_NEQ", "OP_LE", "OP_GE", "OP_AND", "OP_OR",
+    "OP_SUMA", "OP_RESTA", "OP_MUL", "OP_DIV", "OP_MOD",
+    "ASIGNACION", "OP_NOT", "OP_LT", "OP_GT",
+    "LPAREN", "RPAREN", "LBRACE", "RBRACE", "PUNTOYCOMA", "COMA",
+)
+
+TOKEN_KINDS = {name: kind for kind, name in enumerate(TOKEN_NAMES)}
+
+(T_EOF, T_ID, T_NUM,
+ T_IF, T_ELSE, T_WHILE, T_FOR, T_INT, T_FLOAT, T_RETURN, T_PRINT, T_VOID,
+ T_OP_EQ, T_OP_NEQ, T_OP_LE, T_OP_GE, T_OP_AND, T_OP_OR,
+ T_OP_SUMA, T_OP_RESTA, T_OP_MUL, T_OP_DIV, T_OP_MOD,
+ T_ASIGNACION, T_OP_NOT, T_OP_LT, T_OP_GT,
+ T_LPAREN, T_RPAREN, T_LBRACE, T_RBRACE, T_PUNTOYCOMA, T_COMA) = range(len(TOKEN_NAMES))
+
+
+class LineIndex:
+    """Inicios de línea de un texto para convertir posiciones en (línea, columna).
+
+    El índice se construye la primera vez que se consulta; un lexer por bloques
+    puede completarlo con feed() a medida que lee. Línea y columna empiezan en 1.
+    """
+
+    def __init__(self, texto=None):
+        self.starts = array('I', [0])
+        self._texto = texto
+
+    def feed(self, bloque, base):
+        starts = self.starts
+        i = bloque.find("\n")
+        while i >= 0:
+            starts.append(base + i + 1)
+            i = bloque.find("\n", i + 1)
+
+    def line_col(self, offset):
+        if self._texto is not None:
+            texto, self._texto = self._texto, None
+            self.feed(texto, 0)
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+
+class TokenBuffer:
+    """Flujo de tokens compacto: tipos en array('B') y rangos del texto en array('I').
+
+    Los lexemas no se guardan; se recortan de source al pedirlos. Las
+    posiciones son índices en el texto original, sin quitar espacios ni
+    comentarios, y line_col() las traduce con un LineIndex perezoso. Indexar o
+    iterar el buffer devuelve tuplas (tipo, lexema) como la lista que producía
+    el lexer, de modo que format_tokens y el código existente siguen funcionando.
+    """
+
+    def __init__(self, source=""):
+        self.source = source
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self._lines = None
+
+    def append(self, kind, start, end):
+        self.kinds.append(kind)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def kind(self, i):
+        return self.kinds[i]
+
+    def type_name(self, i):
+        return TOKEN_NAMES[self.kinds[i]]
+
+    def lexeme(self, i):
+        return self.source[self.starts[i]:self.ends[i]]
+
+    def line_index(self):
+        if self._lines is None:
+            self._lines = LineIndex(self.source)
+        return self._lines
+
+    def line_col(self, i):
+        return self.line_index().line_col(self.starts[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.kinds)))]
+        return (TOKEN_NAMES[self.kinds[i]], self.source[self.starts[i]:self.ends[i]])
+
+    def __iter__(self):
+        source = self.source
+        for kind, start, end in zip(self.kinds, self.starts, self.ends):
+            yield (TOKEN_NAMES[kind], source[start:end])
+
+    def entries(self, desde=0):
+        """Genera (kind, lexema, inicio) con el tipo como entero, para el parser,
+        a partir del token desde"""
+        source = self.source
+        kinds, starts, ends = self.kinds, self.starts, self.ends
+        if desde:
+            # Un memoryview recorta sin copiar: empezar a mitad cuesta O(1)
+            kinds, starts, ends = memoryview(kinds)[desde:], memoryview(starts)[desde:], memoryview(ends)[desde:]
+        for kind, start, end in zip(kinds, starts, ends):
+            yield (kind, source[start:end], start)
+
+    def __repr__(self):
+        return f"TokenBuffer({len(self.kinds)} tokens)"
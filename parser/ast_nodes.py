@@ -1,11 +1,30 @@
+# Los nodos declaran __slots__: sin __dict__ por instancia, un AST grande
+# ocupa bastante menos memoria. Cada clase lista solo sus propios atributos.
+#
+# Además de expr_type, que anota el análisis semántico, VarNode, AssignNode y
+# VarDeclNode llevan frame y slot (marco 0 global o 1 local y posición en él),
+# VarDeclNode además self_ref (su inicializador lee la variable que declara) y
+# FuncCallNode lleva func_index: los completa backend/resolver.py.
+
 class ASTNode:
+    __slots__ = ("line", "col")
+    
     def __init__(self):
         self.line = 0
+        self.col = 0
     
     def __repr__(self):
         return f"{self.__class__.__name__}()"
+    
+    def iter_fields(self):
+        """Pares (nombre, valor) de todos los atributos del nodo, line y col primero"""
+        for cls in reversed(type(self).__mro__):
+            for name in cls.__dict__.get("_fields", cls.__dict__.get("__slots__", ())):
+                yield name, getattr(self, name)
 
 class ProgramNode(ASTNode):
+    __slots__ = ("declarations",)
+    
     def __init__(self, declarations):
         super().__init__()
         self.declarations = declarations
@@ -14,28 +33,61 @@ class ProgramNode(ASTNode):
         return f"Program({len(self.declarations)} declarations)"
 
 class VarDeclNode(ASTNode):
+    __slots__ = ("var_type", "var_name", "init_expr", "frame", "slot", "self_ref")
+    
     def __init__(self, var_type, var_name, init_expr=None):
         super().__init__()
         self.var_type = var_type
         self.var_name = var_name
         self.init_expr = init_expr
+        self.frame = None
+        self.slot = None
+        self.self_ref = False
     
     def __repr__(self):
         init = f", init={self.init_expr}" if self.init_expr else ""
         return f"VarDecl({self.var_type} {self.var_name}{init})"
 
 class FuncDeclNode(ASTNode):
-    def __init__(self, return_type, func_name, params, body):
+    # body puede quedar diferido: _pending es entonces una función sin
+    # argumentos que analiza el cuerpo, y se llama al leer body por primera vez
+    __slots__ = ("return_type", "func_name", "params", "_body", "_pending")
+    _fields = ("return_type", "func_name", "params", "body")
+    
+    def __init__(self, return_type, func_name, params, body, pending=None):
         super().__init__()
         self.return_type = return_type
         self.func_name = func_name
         self.params = params
-        self.body = body
+        self._body = body
+        self._pending = pending
+    
+    @property
+    def body(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._body = pending()
+        return self._body
+    
+    @body.setter
+    def body(self, body):
+        self._body = body
+        self._pending = None
+    
+    def is_materialized(self):
+        """False si el cuerpo todavía no se analizó"""
+        return self._pending is None
+    
+    def pending_body(self):
+        """La función que analizará el cuerpo, o None si ya se analizó"""
+        return self._pending
     
     def __repr__(self):
         return f"FuncDecl({self.return_type} {self.func_name}, {len(self.params)} params)"
 
 class ParamNode(ASTNode):
+    __slots__ = ("param_type", "param_name")
+    
     def __init__(self, param_type, param_name):
         super().__init__()
         self.param_type = param_type
@@ -45,6 +97,8 @@ class ParamNode(ASTNode):
         return f"Param({self.param_type} {self.param_name})"
 
 class BlockNode(ASTNode):
+    __slots__ = ("statements",)
+    
     def __init__(self, statements):
         super().__init__()
         self.statements = statements
@@ -53,6 +107,8 @@ class BlockNode(ASTNode):
         return f"Block({len(self.statements)} statements)"
 
 class IfNode(ASTNode):
+    __slots__ = ("condition", "then_stmt", "else_stmt")
+    
     def __init__(self, condition, then_stmt, else_stmt=None):
         super().__init__()
         self.condition = condition
@@ -63,6 +119,8 @@ class IfNode(ASTNode):
         return f"If(cond={self.condition})"
 
 class WhileNode(ASTNode):
+    __slots__ = ("condition", "body")
+    
     def __init__(self, condition, body):
         super().__init__()
         self.condition = condition
@@ -72,6 +130,8 @@ class WhileNode(ASTNode):
         return f"While(cond={self.condition})"
 
 class ForNode(ASTNode):
+    __slots__ = ("init_expr", "condition", "update_expr", "body")
+    
     def __init__(self, init_expr, condition, update_expr, body):
         super().__init__()
         self.init_expr = init_expr
@@ -83,6 +143,8 @@ class ForNode(ASTNode):
         return f"For(init={self.init_expr}, cond={self.condition})"
 
 class ReturnNode(ASTNode):
+    __slots__ = ("expr",)
+    
     def __init__(self, expr):
         super().__init__()
         self.expr = expr
@@ -91,6 +153,8 @@ class ReturnNode(ASTNode):
         return f"Return({self.expr})"
 
 class PrintNode(ASTNode):
+    __slots__ = ("expr",)
+    
     def __init__(self, expr):
         super().__init__()
         self.expr = expr
@@ -99,6 +163,8 @@ class PrintNode(ASTNode):
         return f"Print({self.expr})"
 
 class ExprStmtNode(ASTNode):
+    __slots__ = ("expr",)
+    
     def __init__(self, expr):
         super().__init__()
         self.expr = expr
@@ -107,6 +173,8 @@ class ExprStmtNode(ASTNode):
         return f"ExprStmt({self.expr})"
 
 class BinaryOpNode(ASTNode):
+    __slots__ = ("op", "left", "right", "expr_type")
+    
     def __init__(self, op, left, right):
         super().__init__()
         self.op = op
@@ -118,6 +186,8 @@ class BinaryOpNode(ASTNode):
         return f"BinaryOp({self.left} {self.op} {self.right})"
 
 class UnaryOpNode(ASTNode):
+    __slots__ = ("op", "expr", "expr_type")
+    
     def __init__(self, op, expr):
         super().__init__()
         self.op = op
@@ -128,24 +198,35 @@ class UnaryOpNode(ASTNode):
         return f"UnaryOp({self.op}{self.expr})"
 
 class AssignNode(ASTNode):
+    __slots__ = ("var_name", "expr", "expr_type", "frame", "slot")
+    
     def __init__(self, var_name, expr):
         super().__init__()
         self.var_name = var_name
         self.expr = expr
+        self.expr_type = None
+        self.frame = None
+        self.slot = None
     
     def __repr__(self):
         return f"Assign({self.var_name} = {self.expr})"
 
 class VarNode(ASTNode):
+    __slots__ = ("var_name", "expr_type", "frame", "slot")
+    
     def __init__(self, var_name):
         super().__init__()
         self.var_name = var_name
         self.expr_type = None
+        self.frame = None
+        self.slot = None
     
     def __repr__(self):
         return f"Var({self.var_name})"
 
 class NumNode(ASTNode):
+    __slots__ = ("value", "expr_type", "is_dummy")
+    
     def __init__(self, value):
         super().__init__()
         value_str = str(value)
@@ -166,6 +247,8 @@ class NumNode(ASTNode):
         return self.value
 
 class EmptyExprNode(ASTNode):
+    __slots__ = ("expr_type",)
+    
     def __init__(self):
         super().__init__()
         self.expr_type = 'void'
@@ -174,11 +257,14 @@ class EmptyExprNode(ASTNode):
         return "EmptyExpr()"
 
 class FuncCallNode(ASTNode):
+    __slots__ = ("func_name", "args", "expr_type", "func_index")
+    
     def __init__(self, func_name, args):
         super().__init__()
         self.func_name = func_name
         self.args = args
         self.expr_type = None
+        self.func_index = None
     
     def __repr__(self):
         return f"FuncCall({self.func_name}, {len(self.args)} args)"
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""Reanálisis incremental por declaraciones de nivel superior.
+
+Tras una edición, Lexer.relex indica qué rango de tokens cambió; aquí solo se
+vuelven a analizar las declaraciones de nivel superior que tocan ese rango y
+se empalman en el ProgramNode existente. Las demás declaraciones se reutilizan
+tal cual (los mismos objetos nodo), así los cachés indexados por identidad de
+nodo siguen siendo válidos.
+"""
+import sys
+import os
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+from lexer import Lexer, LexerError
+from token_buffer import *
+from ast_nodes import *
+from parser_ast import ParserAST, MAX_ERRORES, _Abandono
+
+
+def _desplazar(nodo, lineas):
+    """Suma lineas a la línea de nodo y de todos sus descendientes"""
+    pendientes = [nodo]
+    while pendientes:
+        actual = pendientes.pop()
+        actual.line += lineas
+        for _, valor in actual.iter_fields():
+            if isinstance(valor, ASTNode):
+                pendientes.append(valor)
+            elif isinstance(valor, list):
+                pendientes.extend(x for x in valor if isinstance(x, ASTNode))
+
+
+class ProgramaIncremental:
+    """Un programa analizado que se actualiza declaración por declaración.
+
+    Guarda los tokens, el ProgramNode y los tramos de ParserAST: por cada
+    declaración de nivel superior, (inicio, fin, nodos, errores) con su rango
+    de tokens. fines tiene el fin de cada tramo, para buscarlos con bisect.
+    errors reúne los errores de sintaxis de todos los tramos.
+    """
+
+    def __init__(self, tokens):
+        self.analizar(tokens)
+
+    def analizar(self, tokens):
+        """Analiza todos los tokens desde cero"""
+        parser = ParserAST(tokens)
+        start = parser.start
+        try:
+            declarations = parser.listadecl()
+        except _Abandono:
+            declarations = [n for tramo in parser.tramos for n in tramo[2]]
+        self.program = parser.located(ProgramNode(declarations), start)
+        self.tokens = tokens
+        self.tramos = parser.tramos
+        self.fines = [tramo[1] for tramo in self.tramos]
+        self.errors = parser.errors
+
+    def editar(self, offset, borrados, insertado, lexer=None):
+        """Reemplaza borrados caracteres en offset por insertado y actualiza el AST"""
+        tokens, cambio = (lexer or Lexer()).relex(self.tokens, offset, borrados, insertado)
+        return self.actualizar(tokens, cambio)
+
+    def actualizar(self, tokens, cambio):
+        """Actualiza el AST al nuevo TokenBuffer tokens.
+
+        cambio es (primero, fin_viejo, fin_nuevo), como lo devuelve
+        Lexer.relex: los tokens viejos [primero, fin_viejo) pasaron a ser los
+        nuevos [primero, fin_nuevo). Se analiza desde la declaración que
+        contiene (o toca) el primer token cambiado hasta volver a caer, ya
+        pasado el cambio, en el inicio de una declaración vieja; desde ahí el
+        resto se reutiliza con sus índices corridos. Devuelve los nodos de
+        las declaraciones que se volvieron a analizar.
+        """
+        primero, fin_viejo, fin_nuevo = cambio
+        delta = fin_nuevo - fin_viejo
+        viejos = self.tokens
+        tramos = self.tramos
+        if (tramos[-1][1] if tramos else 0) != len(viejos):
+            # El análisis anterior se abandonó por max_errors y los tramos no
+            # cubren todos los tokens: se analiza todo de nuevo
+            self.analizar(tokens)
+            return list(self.program.declarations)
+
+        i = bisect_left(self.fines, primero)
+        desde = min(tramos[i][0], primero) if i < len(tramos) else primero
+
+        # Una declaración que empieza en la misma línea donde termina el cambio
+        # tiene las columnas corridas: se vuelve a analizar.
+        fin_linea = tokens.source.find("\n", tokens.ends[fin_nuevo - 1] if fin_nuevo > 0 else 0)
+        if fin_linea < 0:
+            fin_linea = len(tokens.source)
+        # Los mensajes de error llevan la línea: si cambió, los tramos con
+        # errores no se reutilizan.
+        ultimo_con_errores = max((k for k, tramo in enumerate(tramos) if tramo[3]), default=-1)
+
+        errores_antes = sum(len(tramo[3]) for tramo in tramos[:i])
+        parser = ParserAST(tokens, max_errors=max(MAX_ERRORES - errores_antes, 1), desde=desde)
+        j = i
+        lineas = 0
+        reutilizar = False
+        try:
+            while parser.kind != T_EOF:
+                k = parser.indice()
+                if k >= fin_nuevo:
+                    while j < len(tramos) and tramos[j][0] + delta < k:
+                        j += 1
+                    if j < len(tramos) and tramos[j][0] + delta == k and tokens.starts[k] > fin_linea:
+                        lineas = tokens.line_col(k)[0] - viejos.line_col(tramos[j][0])[0]
+                        if lineas == 0 or j > ultimo_con_errores:
+                            reutilizar = True
+                            break
+                parser.declaracion()
+        except _Abandono:
+            pass
+
+        if not reutilizar:
+            j = len(tramos)
+        reutilizados = tramos[j:]
+        if lineas:
+            for tramo in reutilizados:
+                for nodo in tramo[2]:
+                    _desplazar(nodo, lineas)
+        if delta:
+            reutilizados = [(a + delta, b + delta, nodos, errores) for a, b, nodos, errores in reutilizados]
+
+        antes = sum(len(tramo[2]) for tramo in tramos[:i])
+        reemplazados = sum(len(tramo[2]) for tramo in tramos[i:j])
+        nuevos = [nodo for tramo in parser.tramos for nodo in tramo[2]]
+        self.program.declarations[antes:antes + reemplazados] = nuevos
+        parser.located(self.program, tokens.starts[0] if len(tokens) else 0)
+
+        self.tramos = tramos[:i] + parser.tramos + reutilizados
+        self.fines = [tramo[1] for tramo in self.tramos]
+        self.errors = [error for tramo in self.tramos for error in tramo[3]]
+        self.tokens = tokens
+        return nuevos
+
+
+def main():
+    if len(sys.argv) < 5:
+        print("Uso: python incremental.py <archivo_fuente> <offset> <borrados> <insertado>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    offset, borrados, insertado = int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        programa = ProgramaIncremental(Lexer().tokenize(src))
+        anteriores = list(programa.program.declarations)
+        nuevos = programa.editar(offset, borrados, insertado)
+
+        ids = {id(nodo) for nodo in anteriores}
+        reutilizadas = sum(1 for nodo in programa.program.declarations if id(nodo) in ids)
+        print(f"Declaraciones: {len(programa.program.declarations)}")
+        print(f"Reanalizadas: {len(nuevos)}")
+        for nodo in nuevos:
+            print(f"  {nodo} (línea {nodo.line})")
+        print(f"Reutilizadas por identidad: {reutilizadas}")
+        for error in programa.errors:
+            print(f"Error de sintaxis: {error}")
+        sys.exit(1 if programa.errors else 0)
+
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Generador del parser LL(1) a partir de specs/grammar_spec.md.
+
+Lee las producciones (con sus acciones semánticas), calcula FIRST y FOLLOW y
+construye la tabla predictiva. Las acciones entre llaves se conservan en las
+producciones pero no cuentan como símbolos de la gramática.
+"""
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+from token_buffer import TOKEN_KINDS
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'specs', 'grammar_spec.md')
+
+# Marca de la cadena vacía dentro de los conjuntos FIRST
+EPSILON = -1
+
+_SIMBOLO_RE = re.compile(r"\*\*([^*]+)\*\*|``([^`]+)``|\{(\w+)\}|(\|)|(ε)")
+
+
+class GrammarError(Exception):
+    pass
+
+
+def es_accion(simbolo):
+    return isinstance(simbolo, str) and simbolo.startswith("{")
+
+
+def es_no_terminal(simbolo):
+    return isinstance(simbolo, str) and not simbolo.startswith("{")
+
+
+class Gramatica:
+    """Producciones, conjuntos FIRST/FOLLOW y tabla predictiva.
+
+    Los terminales son tipos de token (enteros de token_buffer), los no
+    terminales cadenas con su nombre y las acciones cadenas "{nombre}".
+    producciones[A] es la lista de alternativas de A, cada una una tupla de
+    símbolos; tabla[A][tipo] es el índice de la alternativa a usar.
+    """
+
+    def __init__(self, producciones, inicial, nombres_terminales):
+        self.producciones = producciones
+        self.inicial = inicial
+        self.nombres_terminales = nombres_terminales
+        self.first = self._calcular_first()
+        self.follow = self._calcular_follow()
+        self.conflictos = []
+        self.tabla = self._construir_tabla()
+
+    def first_de(self, simbolos):
+        """FIRST de una secuencia de símbolos; incluye EPSILON si puede ser vacía"""
+        resultado = set()
+        for simbolo in simbolos:
+            if es_accion(simbolo):
+                continue
+            if not es_no_terminal(simbolo):
+                resultado.add(simbolo)
+                return resultado
+            resultado |= self.first[simbolo] - {EPSILON}
+            if EPSILON not in self.first[simbolo]:
+                return resultado
+        resultado.add(EPSILON)
+        return resultado
+
+    def _calcular_first(self):
+        self.first = {a: set() for a in self.producciones}
+        cambio = True
+        while cambio:
+            cambio = False
+            for a, alternativas in self.producciones.items():
+                for alternativa in alternativas:
+                    nuevos = self.first_de(alternativa) - self.first[a]
+                    if nuevos:
+                        self.first[a] |= nuevos
+                        cambio = True
+        return self.first
+
+    def _calcular_follow(self):
+        follow = {a: set() for a in self.producciones}
+        cambio = True
+        while cambio:
+            cambio = False
+            for a, alternativas in self.producciones.items():
+                for alternativa in alternativas:
+                    for i, simbolo in enumerate(alternativa):
+                        if not es_no_terminal(simbolo):
+                            continue
+                        resto = self.first_de(alternativa[i + 1:])
+                        nuevos = resto - {EPSILON}
+                        if EPSILON in resto:
+                            nuevos |= follow[a]
+                        nuevos -= follow[simbolo]
+                        if nuevos:
+                            follow[simbolo] |= nuevos
+                            cambio = True
+        return follow
+
+    def _construir_tabla(self):
+        tabla = {a: {} for a in self.producciones}
+        for a, alternativas in self.producciones.items():
+            for i, alternativa in enumerate(alternativas):
+                prediccion = self.first_de(alternativa)
+                if EPSILON in prediccion:
+                    prediccion = (prediccion - {EPSILON}) | self.follow[a]
+                for tipo in prediccion:
+                    anterior = tabla[a].get(tipo)
+                    if anterior is None:
+                        tabla[a][tipo] = i
+                        continue
+                    # Entre una alternativa vacía y otra que consume el token gana
+                    # la segunda (else colgante, asignación dentro de una expresión)
+                    vacia = [j for j in (anterior, i) if EPSILON in self.first_de(alternativas[j])]
+                    if len(vacia) == 1:
+                        tabla[a][tipo] = i if vacia[0] == anterior else anterior
+                        self.conflictos.append((a, tipo))
+                    else:
+                        raise GrammarError(f"La gramática no es LL(1): {a} tiene dos producciones "
+                                           f"para {self.nombres_terminales[tipo]}")
+        return tabla
+
+    def esperados(self, a):
+        """Terminales con los que puede empezar a, en el orden de sus alternativas (para mensajes)"""
+        orden = []
+        pendientes = [a]
+        vistos = set()
+        while pendientes:
+            x = pendientes.pop(0)
+            if x in vistos:
+                continue
+            vistos.add(x)
+            for alternativa in self.producciones[x]:
+                for simbolo in alternativa:
+                    if es_accion(simbolo):
+                        continue
+                    if es_no_terminal(simbolo):
+                        pendientes.append(simbolo)
+                        if EPSILON in self.first[simbolo]:
+                            continue
+                    elif simbolo not in orden:
+                        orden.append(simbolo)
+                    break
+        return orden
+
+    def nombre(self, simbolo):
+        if es_no_terminal(simbolo) or es_accion(simbolo):
+            return simbolo
+        return self.nombres_terminales[simbolo]
+
+    def texto_produccion(self, a, i, acciones=False):
+        simbolos = [self.nombre(s) for s in self.producciones[a][i] if acciones or not es_accion(s)]
+        return f"{a} → {' '.join(simbolos) if simbolos else 'ε'}"
+
+
+def leer_gramatica(path=SPEC_PATH):
+    """Lee las producciones de la especificación y devuelve la Gramatica"""
+    producciones = {}
+    nombres_terminales = {}
+    inicial = None
+    actual = None
+    with open(path, "r", encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if linea.startswith("**") and "→" in linea:
+                cabeza, cuerpo = linea.split("→", 1)
+                actual = cabeza.strip().strip("*")
+                if actual in producciones:
+                    raise GrammarError(f"El no terminal {actual} está definido dos veces")
+                producciones[actual] = []
+                inicial = inicial or actual
+            elif linea.startswith("|") and actual is not None:
+                cuerpo = linea
+            else:
+                actual = None
+                continue
+            _leer_alternativas(cuerpo, producciones[actual], nombres_terminales)
+
+    if not producciones:
+        raise GrammarError(f"No se encontraron producciones en {path}")
+    for alternativas in producciones.values():
+        for alternativa in alternativas:
+            for simbolo in alternativa:
+                if es_no_terminal(simbolo) and simbolo not in producciones:
+                    raise GrammarError(f"El no terminal {simbolo} no tiene producciones")
+    return Gramatica(producciones, inicial, nombres_terminales)
+
+
+def _leer_alternativas(cuerpo, alternativas, nombres_terminales):
+    # Una línea "| ..." continúa la lista de alternativas de la anterior
+    if cuerpo.lstrip().startswith("|"):
+        cuerpo = cuerpo.lstrip()[1:]
+    simbolos = []
+    for m in _SIMBOLO_RE.finditer(cuerpo):
+        no_terminal, terminal, accion, barra, _ = m.groups()
+        if barra:
+            alternativas.append(tuple(simbolos))
+            simbolos = []
+        elif no_terminal:
+            simbolos.append(no_terminal)
+        elif terminal:
+            if terminal == "bof":
+                continue
+            kind = TOKEN_KINDS.get(terminal.upper())
+            if kind is None:
+                raise GrammarError(f"Terminal desconocido en la gramática: {terminal}")
+            nombres_terminales[kind] = terminal
+            simbolos.append(kind)
+        elif accion:
+            simbolos.append("{" + accion + "}")
+    alternativas.append(tuple(simbolos))
+
+
+def _conjunto(g, simbolos):
+    nombres = [g.nombres_terminales[s] for s in simbolos if s != EPSILON]
+    nombres.sort(key=list(g.nombres_terminales.values()).index)
+    if EPSILON in simbolos:
+        nombres.append("ε")
+    return "{ " + ", ".join(nombres) + " }"
+
+
+def first_follow_markdown(g):
+    lineas = ["# Análisis FIRST y FOLLOW", "",
+              "Generado con `python parser/llgen.py --first-follow` a partir de `specs/grammar_spec.md`.", "",
+              "## FIRST Rules", ""]
+    lineas += [f"- **FIRST({a})** = {_conjunto(g, g.first[a])}" for a in g.producciones]
+    lineas += ["", "## FOLLOW Rules", ""]
+    lineas += [f"- **FOLLOW({a})** = {_conjunto(g, g.follow[a])}" for a in g.producciones]
+    return "\n".join(lineas)
+
+
+def tabla_markdown(g):
+    terminales = list(g.nombres_terminales)
+    lineas = ["# Tabla Predictiva", "",
+              "Generada con `python parser/llgen.py --tabla` a partir de `specs/grammar_spec.md`.", "",
+              "| No-terminal | " + " | ".join(g.nombres_terminales[t] for t in terminales) + " |",
+              "|---" * (len(terminales) + 1) + "|"]
+    for a in g.producciones:
+        celdas = [g.texto_produccion(a, g.tabla[a][t]) if t in g.tabla[a] else "" for t in terminales]
+        lineas.append(f"| **{a}** | " + " | ".join(celdas) + " |")
+    return "\n".join(lineas)
+
+
+def main():
+    g = leer_gramatica()
+    if "--first-follow" in sys.argv:
+        print(first_follow_markdown(g))
+    elif "--tabla" in sys.argv:
+        print(tabla_markdown(g))
+    else:
+        print(f"No terminales: {len(g.producciones)}")
+        print(f"Producciones: {sum(len(alts) for alts in g.producciones.values())}")
+        print(f"Entradas de la tabla: {sum(len(fila) for fila in g.tabla.values())}")
+        for a, tipo in g.conflictos:
+            print(f"Conflicto resuelto en {a} con {g.nombres_terminales[tipo]}: "
+                  f"{g.texto_produccion(a, g.tabla[a][tipo])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,139 +1,404 @@
 import sys
 import os
+import re
+from sys import intern
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
 from lexer import Lexer, LexerError
+from token_buffer import *
 from ast_nodes import *
 
 class ParseError(Exception):
     pass
 
+class _Abandono(Exception):
+    """Se alcanzó el máximo de errores de sintaxis: el análisis se detiene"""
+
+# Errores de sintaxis que se acumulan antes de abandonar el análisis
+MAX_ERRORES = 50
+
+# Conjuntos de tipos de token (enteros) usados en las decisiones del parser
+TIPOS = frozenset((T_INT, T_FLOAT, T_VOID))
+# Una sola cadena por tipo, compartida por todos los nodos y la tabla de símbolos
+NOMBRE_TIPO = {kind: intern(TOKEN_NAMES[kind].lower()) for kind in TIPOS}
+FIRST_EXPR = frozenset((T_LPAREN, T_NUM, T_OP_NOT, T_ID, T_OP_RESTA))
+FIRST_SENTENCIA = frozenset((T_INT, T_FLOAT, T_VOID, T_ID, T_LPAREN, T_NUM, T_OP_NOT,
+                             T_PUNTOYCOMA, T_IF, T_WHILE, T_FOR, T_RETURN, T_PRINT, T_LBRACE))
+
+# Poder de ligadura de cada operador binario, indexado por tipo de token (0 si
+# no es un operador). Los niveles siguen la gramática: || < && < igualdad <
+# relacionales < aditivos < multiplicativos. Todos asocian a izquierda salvo
+# los relacionales, que no asocian: tras a < b no se acepta otro relacional.
+NIVEL_RELACIONAL = 4
+_NIVELES = {
+    T_OP_OR: 1,
+    T_OP_AND: 2,
+    T_OP_EQ: 3, T_OP_NEQ: 3,
+    T_OP_LT: NIVEL_RELACIONAL, T_OP_GT: NIVEL_RELACIONAL, T_OP_LE: NIVEL_RELACIONAL, T_OP_GE: NIVEL_RELACIONAL,
+    T_OP_SUMA: 5, T_OP_RESTA: 5,
+    T_OP_MUL: 6, T_OP_DIV: 6, T_OP_MOD: 6,
+}
+LIGADURA = bytes(_NIVELES.get(kind, 0) for kind in range(len(TOKEN_NAMES)))
+
+# Puntos de sincronización de la recuperación en modo pánico, tomados de los
+# FOLLOW de specs/first_and_follow_spec.md. FOLLOW(SENTENCIA) sin los tokens
+# que también aparecen dentro de una expresión (id, num, '(' ...) ni else;
+# FOLLOW(DECL) son los tipos que empiezan la declaración siguiente. En ambos
+# casos un ';' se consume y cierra la sincronización.
+SINC_SENTENCIA = frozenset((T_INT, T_FLOAT, T_VOID, T_IF, T_WHILE, T_FOR, T_RETURN, T_PRINT,
+                            T_LBRACE, T_RBRACE))
+SINC_DECL = TIPOS
+
+# Llaves sobre los tipos de token como bytes (TokenBuffer.kinds.tobytes()),
+# para saltar cuerpos de función sin analizarlos
+_LLAVES = re.compile(b"[" + re.escape(bytes([T_LBRACE])) + re.escape(bytes([T_RBRACE])) + b"]")
+
+def _con_tipo(tokens):
+    """Adapta tuplas (tipo, lexema) o (tipo, lexema, inicio) al formato del parser"""
+    for token in tokens:
+        yield (TOKEN_KINDS[token[0]], token[1], token[2] if len(token) > 2 else 0)
+
+class CuerpoDiferido:
+    """Un cuerpo de función que ParserAST saltó sin analizar.
+
+    Llamarlo analiza el bloque que empieza en el token desde y agrega sus
+    errores de sintaxis a errors, la lista del parser que lo difirió. Si esos
+    errores ya se informaron por otro lado (informar), no se agregan de nuevo.
+    """
+
+    def __init__(self, tokens, lines, desde, errors):
+        self.tokens = tokens
+        self.lines = lines
+        self.desde = desde
+        self.errors = errors
+        self.informado = False
+
+    def __call__(self):
+        parser = ParserAST(self.tokens, self.lines, desde=self.desde)
+        try:
+            body = parser.bloque()
+        except _Abandono:
+            body = parser.located(BlockNode([]), self.tokens.starts[self.desde])
+        if not self.informado:
+            self.informar(parser.errors)
+        return body
+
+    def informar(self, errors):
+        """Agrega errors, los errores de sintaxis del cuerpo analizado en otro lado"""
+        self.errors.extend(errors)
+        self.informado = True
+
 class ParserAST:
-    def __init__(self, tokens):
+    def __init__(self, tokens, lines=None, max_errors=MAX_ERRORES, desde=0, lazy=False):
+        # tokens puede ser un TokenBuffer, una lista de tuplas (tipo, lexema) o
+        # cualquier iterador de ellas (p. ej. Lexer.iter_tokens): el parser solo
+        # consume hacia adelante y no retiene tokens ya leídos. lines es el
+        # LineIndex con el que se asignan line/col a cada nodo; sin él los
+        # nodos quedan en la posición 0. Con un TokenBuffer, desde indica el
+        # primer token a leer (el reanálisis incremental empieza a mitad).
+        # Con lazy (solo con un TokenBuffer) los cuerpos de función no se
+        # analizan: se saltan emparejando llaves y FuncDeclNode.body se
+        # construye al leerlo por primera vez.
         self.tokens = tokens
-        self.pos = 0
-        self.current_token = None
+        self.errors = []
+        self.max_errors = max_errors
+        self.lazy = lazy and isinstance(tokens, TokenBuffer)
+        self._tipos = None
+        # Por cada declaración de nivel superior: (inicio, fin, nodos, errores)
+        self.tramos = []
+        if isinstance(tokens, TokenBuffer):
+            self._siguiente = tokens.entries(desde)
+            if lines is None:
+                lines = tokens.line_index()
+        else:
+            self._siguiente = _con_tipo(tokens)
+        self.lines = lines
+        self.pos = desde
+        self.kind = T_EOF
+        self.value = ""
+        self.start = 0
         self.advance()
     
     def advance(self):
-        if self.pos < len(self.tokens):
-            self.current_token = self.tokens[self.pos]
+        token = next(self._siguiente, None)
+        if token is not None:
+            self.kind, value, self.start = token
+            # Los nombres se internan: las fases siguientes los comparan por identidad
+            self.value = intern(value) if self.kind == T_ID else value
             self.pos += 1
         else:
-            self.current_token = ("EOF", "")
+            self.kind = T_EOF
+            self.value = ""
+    
+    def located(self, node, start):
+        """Asigna a node la línea y columna de la posición start"""
+        if self.lines is not None:
+            node.line, node.col = self.lines.line_col(start)
+        return node
     
     def current_type(self):
-        return self.current_token[0] if self.current_token else "EOF"
+        return TOKEN_NAMES[self.kind]
     
     def current_value(self):
-        return self.current_token[1] if self.current_token else ""
+        return self.value
     
-    def match(self, expected_type):
-        if self.current_type() == expected_type:
-            value = self.current_value()
+    def match(self, expected_kind):
+        if self.kind == expected_kind:
+            value = self.value
             self.advance()
             return value
         return None
     
-    def expect(self, expected_type):
-        value = self.match(expected_type)
+    def expect(self, expected_kind):
+        value = self.match(expected_kind)
         if value is None:
-            raise ParseError(f"Se esperaba {expected_type}, se encontró {self.current_type()}")
+            raise ParseError(f"Se esperaba {TOKEN_NAMES[expected_kind]}, se encontró {self.current_type()}")
         return value
     
-    def parse(self):
+    def parse(self, imprimir=True):
+        """Analiza el programa completo y devuelve el ProgramNode.
+
+        Los errores de sintaxis no detienen el análisis: se registran en
+        self.errors, se imprimen (salvo con imprimir=False), y el parser se
+        resincroniza en la siguiente sentencia o declaración (modo pánico). El
+        resultado es entonces un AST parcial, sin las construcciones erróneas,
+        que el analizador semántico puede recorrer. Devuelve None si se
+        alcanza max_errors.
+        """
+        ast = None
         try:
-            ast = self.programa()
-            if self.current_type() != "EOF":
-                raise ParseError(f"Se esperaba EOF, se encontró {self.current_type()}")
+            try:
+                ast = self.programa()
+                if self.kind != T_EOF:
+                    raise ParseError(f"Se esperaba EOF, se encontró {self.current_type()}")
+            except ParseError as e:
+                ast = None
+                self.registrar(e)
+        except _Abandono:
+            ast = None
+        if not imprimir:
             return ast
-        except ParseError as e:
-            print(f"Error de sintaxis: {e}")
-            return None
+        for error in self.errors:
+            print(f"Error de sintaxis: {error}")
+        if ast is None and len(self.errors) >= self.max_errors:
+            print(f"Análisis sintáctico abandonado tras {len(self.errors)} errores")
+        return ast
+    
+    def registrar(self, error):
+        """Agrega error a self.errors con la posición del token actual"""
+        mensaje = str(error)
+        if self.lines is not None:
+            line, col = self.lines.line_col(self.start)
+            mensaje = f"{mensaje} (línea {line}, columna {col})"
+        self.errors.append(mensaje)
+        if len(self.errors) >= self.max_errors:
+            raise _Abandono()
+    
+    def recuperar(self, error, sincronizacion, pos):
+        """Registra error y descarta tokens hasta un punto de sincronización.
+
+        pos es la posición donde empezó la construcción fallida: si el error
+        no consumió nada se descarta al menos el token actual, para avanzar
+        siempre. Los bloques '{...}' que se descartan se saltan completos.
+        """
+        self.registrar(error)
+        if self.pos == pos and self.kind != T_EOF:
+            kind = self.kind
+            self.advance()
+            if kind == T_PUNTOYCOMA:
+                return
+            profundidad = 1 if kind == T_LBRACE else 0
+        else:
+            profundidad = 0
+        while self.kind != T_EOF:
+            if profundidad == 0 and self.kind in sincronizacion:
+                return
+            kind = self.kind
+            self.advance()
+            if kind == T_PUNTOYCOMA and profundidad == 0:
+                return
+            if kind == T_LBRACE:
+                profundidad += 1
+            elif kind == T_RBRACE and profundidad > 0:
+                profundidad -= 1
+                if profundidad == 0:
+                    return
+    
+    def fin_sentencia(self):
+        """Consume el ';' que cierra una sentencia o declaración.
+
+        Si falta pero el token actual ya empieza otra sentencia, se registra el
+        error y se sigue como si estuviera, así la construcción se conserva.
+        """
+        if self.kind == T_PUNTOYCOMA:
+            self.advance()
+        elif self.kind in SINC_SENTENCIA:
+            self.registrar(ParseError(f"Se esperaba PUNTOYCOMA, se encontró {self.current_type()}"))
+        else:
+            raise ParseError(f"Se esperaba PUNTOYCOMA, se encontró {self.current_type()}")
     
     def programa(self):
+        start = self.start
         declarations = self.listadecl()
-        return ProgramNode(declarations)
+        return self.located(ProgramNode(declarations), start)
+    
+    def indice(self):
+        """Índice del token actual en el flujo (el total de tokens en EOF)"""
+        return self.pos if self.kind == T_EOF else self.pos - 1
     
     def listadecl(self):
         declarations = []
-        while self.current_type() in ["INT", "FLOAT", "VOID"]:
-            decl = self.decl()
-            if decl:
-                if isinstance(decl, list):
-                    declarations.extend(decl)
-                else:
-                    declarations.append(decl)
+        while self.kind != T_EOF:
+            declarations.extend(self.declaracion())
         return declarations
     
+    def declaraciones(self):
+        """Genera las declaraciones de nivel superior a medida que se analizan.
+
+        No arma el ProgramNode ni conserva los tramos, así cada declaración se
+        puede liberar una vez procesada. Los errores de sintaxis se acumulan en
+        self.errors como en parse(), pero no se imprimen; al llegar a
+        max_errors el generador termina.
+        """
+        try:
+            while self.kind != T_EOF:
+                nodos = self.declaracion()
+                self.tramos.clear()
+                yield from nodos
+        except _Abandono:
+            return
+    
+    def declaracion(self):
+        """Una declaración de nivel superior, con recuperación de errores.
+
+        Devuelve sus nodos (varios en int a, b; ninguno si fue errónea) y
+        agrega a self.tramos el rango [inicio, fin) de tokens que ocupó junto
+        con los nodos y los errores que produjo.
+        """
+        pos = self.pos
+        inicio = self.indice()
+        errores = len(self.errors)
+        try:
+            if self.kind not in TIPOS:
+                raise ParseError(f"Se esperaba EOF, se encontró {self.current_type()}")
+            decl = self.decl()
+            nodos = decl if isinstance(decl, list) else [decl]
+        except ParseError as e:
+            self.recuperar(e, SINC_DECL, pos)
+            nodos = []
+        self.tramos.append((inicio, self.indice(), nodos, self.errors[errores:]))
+        return nodos
+    
     def decl(self):
+        start = self.start
         var_type = self.tipo()
-        var_name = self.expect("ID")
+        name_start = self.start
+        var_name = self.expect(T_ID)
         
-        if self.current_type() == "LPAREN":
+        if self.kind == T_LPAREN:
             self.advance()
             params = self.parametros()
-            self.expect("RPAREN")
+            self.expect(T_RPAREN)
+            if self.lazy and self.kind == T_LBRACE:
+                pending = self.diferir_bloque()
+                if pending is not None:
+                    return self.located(FuncDeclNode(var_type, var_name, params, None, pending), start)
             body = self.bloque()
-            return FuncDeclNode(var_type, var_name, params, body)
+            return self.located(FuncDeclNode(var_type, var_name, params, body), start)
         else:
-            vars_list = [VarDeclNode(var_type, var_name, None)]
+            vars_list = [self.located(VarDeclNode(var_type, var_name, None), name_start)]
             
-            if self.current_type() == "ASIGNACION":
+            if self.kind == T_ASIGNACION:
                 self.advance()
                 init_expr = self.expr()
                 vars_list[0].init_expr = init_expr
             
-            while self.current_type() == "COMA":
+            while self.kind == T_COMA:
                 self.advance()
-                next_name = self.expect("ID")
+                name_start = self.start
+                next_name = self.expect(T_ID)
                 next_init = None
-                if self.current_type() == "ASIGNACION":
+                if self.kind == T_ASIGNACION:
                     self.advance()
                     next_init = self.expr()
-                vars_list.append(VarDeclNode(var_type, next_name, next_init))
+                vars_list.append(self.located(VarDeclNode(var_type, next_name, next_init), name_start))
             
-            self.expect("PUNTOYCOMA")
+            self.fin_sentencia()
             return vars_list
     
     def tipo(self):
-        if self.current_type() in ["INT", "FLOAT", "VOID"]:
-            tipo_str = self.current_type().lower()
+        if self.kind in TIPOS:
+            tipo_str = NOMBRE_TIPO[self.kind]
             self.advance()
             return tipo_str
         else:
             raise ParseError(f"Se esperaba un tipo, se encontró {self.current_type()}")
     
     def parametros(self):
-        if self.current_type() in ["INT", "FLOAT", "VOID"]:
+        if self.kind in TIPOS:
             return self.paramlista()
         return []
     
     def paramlista(self):
         params = [self.param()]
-        while self.current_type() == "COMA":
+        while self.kind == T_COMA:
             self.advance()
             params.append(self.param())
         return params
     
     def param(self):
+        start = self.start
         param_type = self.tipo()
-        param_name = self.expect("ID")
-        return ParamNode(param_type, param_name)
+        param_name = self.expect(T_ID)
+        return self.located(ParamNode(param_type, param_name), start)
+    
+    def diferir_bloque(self):
+        """Salta el bloque '{...}' actual sin analizarlo y devuelve la función
+        que lo analiza más tarde.
+
+        Las llaves se emparejan sobre los tipos de token, sin mirar lo demás.
+        Si no cierran devuelve None sin consumir nada, y el bloque se analiza
+        en el momento con la recuperación de errores de siempre. Los errores
+        de sintaxis del cuerpo aparecen en self.errors recién al analizarlo.
+        """
+        inicio = self.pos - 1
+        if self._tipos is None:
+            self._tipos = self.tokens.kinds.tobytes()
+        tipos = self._tipos
+        profundidad = 0
+        for m in _LLAVES.finditer(tipos, inicio):
+            if tipos[m.start()] == T_LBRACE:
+                profundidad += 1
+            else:
+                profundidad -= 1
+                if profundidad == 0:
+                    break
+        else:
+            return None
+        fin = m.end()
+        self._siguiente = self.tokens.entries(fin)
+        self.pos = fin
+        self.advance()
+        return CuerpoDiferido(self.tokens, self.lines, inicio, self.errors)
     
     def bloque(self):
-        self.expect("LBRACE")
+        start = self.start
+        self.expect(T_LBRACE)
         statements = self.listasentencias()
-        self.expect("RBRACE")
-        return BlockNode(statements)
+        self.expect(T_RBRACE)
+        return self.located(BlockNode(statements), start)
     
     def listasentencias(self):
         statements = []
-        first_sentencia = ["INT", "FLOAT", "VOID", "ID", "LPAREN", "NUM", "OP_NOT", 
-                          "PUNTOYCOMA", "IF", "WHILE", "FOR", "RETURN", "PRINT", "LBRACE"]
-        
-        while self.current_type() in first_sentencia:
-            stmt = self.sentencia()
+        while self.kind != T_RBRACE and self.kind != T_EOF:
+            pos = self.pos
+            try:
+                if self.kind not in FIRST_SENTENCIA:
+                    raise ParseError(f"Se esperaba RBRACE, se encontró {self.current_type()}")
+                stmt = self.sentencia()
+            except ParseError as e:
+                self.recuperar(e, SINC_SENTENCIA, pos)
+                continue
             if stmt:
                 if isinstance(stmt, list):
                     statements.extend(stmt)
@@ -142,217 +407,203 @@ class ParserAST:
         return statements
     
     def sentencia(self):
-        token = self.current_type()
+        token = self.kind
         
-        if token in ["INT", "FLOAT", "VOID"]:
+        if token in TIPOS:
             return self.decllocal()
-        elif token == "IF":
+        elif token == T_IF:
             return self.sentenciasel()
-        elif token in ["WHILE", "FOR"]:
+        elif token == T_WHILE or token == T_FOR:
             return self.sentenciaiter()
-        elif token == "RETURN":
+        elif token == T_RETURN:
             return self.sentenciaret()
-        elif token == "PRINT":
+        elif token == T_PRINT:
             return self.sentenciaprint()
-        elif token == "LBRACE":
+        elif token == T_LBRACE:
             return self.bloque()
         else:
             return self.sentenciaexpr()
     
     def decllocal(self):
         var_type = self.tipo()
-        var_name = self.expect("ID")
+        name_start = self.start
+        var_name = self.expect(T_ID)
         
-        vars_list = [VarDeclNode(var_type, var_name, None)]
+        vars_list = [self.located(VarDeclNode(var_type, var_name, None), name_start)]
         
-        if self.current_type() == "ASIGNACION":
+        if self.kind == T_ASIGNACION:
             self.advance()
             vars_list[0].init_expr = self.expr()
         
-        while self.current_type() == "COMA":
+        while self.kind == T_COMA:
             self.advance()
-            next_name = self.expect("ID")
+            name_start = self.start
+            next_name = self.expect(T_ID)
             next_init = None
-            if self.current_type() == "ASIGNACION":
+            if self.kind == T_ASIGNACION:
                 self.advance()
                 next_init = self.expr()
-            vars_list.append(VarDeclNode(var_type, next_name, next_init))
+            vars_list.append(self.located(VarDeclNode(var_type, next_name, next_init), name_start))
         
-        self.expect("PUNTOYCOMA")
+        self.fin_sentencia()
         return vars_list
     
     def sentenciaexpr(self):
-        if self.current_type() == "PUNTOYCOMA":
+        if self.kind == T_PUNTOYCOMA:
             self.advance()
             return None
         else:
-            if self.current_type() in ["LPAREN", "NUM", "OP_NOT", "ID", "OP_RESTA"]:
+            if self.kind in FIRST_EXPR:
+                start = self.start
                 expr = self.expr()
-                self.expect("PUNTOYCOMA")
-                return ExprStmtNode(expr)
+                self.fin_sentencia()
+                return self.located(ExprStmtNode(expr), start)
             else:
-                self.expect("PUNTOYCOMA")
+                self.expect(T_PUNTOYCOMA)
                 return None
     
     def sentenciasel(self):
-        self.expect("IF")
-        self.expect("LPAREN")
+        start = self.start
+        self.expect(T_IF)
+        self.expect(T_LPAREN)
         condition = self.expr()
-        self.expect("RPAREN")
+        self.expect(T_RPAREN)
         then_stmt = self.sentencia()
         else_stmt = None
-        if self.current_type() == "ELSE":
+        if self.kind == T_ELSE:
             self.advance()
             else_stmt = self.sentencia()
-        return IfNode(condition, then_stmt, else_stmt)
+        return self.located(IfNode(condition, then_stmt, else_stmt), start)
     
     def sentenciaiter(self):
-        if self.current_type() == "WHILE":
+        start = self.start
+        if self.kind == T_WHILE:
             self.advance()
-            self.expect("LPAREN")
+            self.expect(T_LPAREN)
             condition = self.expr()
-            self.expect("RPAREN")
+            self.expect(T_RPAREN)
             body = self.sentencia()
-            return WhileNode(condition, body)
-        elif self.current_type() == "FOR":
+            return self.located(WhileNode(condition, body), start)
+        elif self.kind == T_FOR:
             self.advance()
-            self.expect("LPAREN")
+            self.expect(T_LPAREN)
             
-            if self.current_type() == "PUNTOYCOMA":
-                init_expr = EmptyExprNode()
+            if self.kind == T_PUNTOYCOMA:
+                init_expr = self.located(EmptyExprNode(), self.start)
             else:
                 init_expr = self.expr()
-            self.expect("PUNTOYCOMA")
+            self.expect(T_PUNTOYCOMA)
             
-            if self.current_type() == "PUNTOYCOMA":
-                condition = EmptyExprNode()
+            if self.kind == T_PUNTOYCOMA:
+                condition = self.located(EmptyExprNode(), self.start)
             else:
                 condition = self.expr()
-            self.expect("PUNTOYCOMA")
+            self.expect(T_PUNTOYCOMA)
             
-            if self.current_type() == "RPAREN":
-                update_expr = EmptyExprNode()
+            if self.kind == T_RPAREN:
+                update_expr = self.located(EmptyExprNode(), self.start)
             else:
                 update_expr = self.expr()
-            self.expect("RPAREN")
+            self.expect(T_RPAREN)
             
             body = self.sentencia()
-            return ForNode(init_expr, condition, update_expr, body)
+            return self.located(ForNode(init_expr, condition, update_expr, body), start)
     
     def sentenciaret(self):
-        self.expect("RETURN")
-        if self.current_type() in ["LPAREN", "NUM", "OP_NOT", "ID", "OP_RESTA"]:
+        start = self.start
+        self.expect(T_RETURN)
+        if self.kind in FIRST_EXPR:
             expr = self.expr()
         else:
-            expr = EmptyExprNode()
-        self.expect("PUNTOYCOMA")
-        return ReturnNode(expr)
+            expr = self.located(EmptyExprNode(), self.start)
+        self.fin_sentencia()
+        return self.located(ReturnNode(expr), start)
     
     def sentenciaprint(self):
-        self.expect("PRINT")
-        self.expect("LPAREN")
+        start = self.start
+        self.expect(T_PRINT)
+        self.expect(T_LPAREN)
         expr = self.expr()
-        self.expect("RPAREN")
-        self.expect("PUNTOYCOMA")
-        return PrintNode(expr)
+        self.expect(T_RPAREN)
+        self.fin_sentencia()
+        return self.located(PrintNode(expr), start)
     
     def expr(self):
-        left = self.exprand()
-        while self.current_type() == "OP_OR":
-            op = self.current_value()
-            self.advance()
-            right = self.exprand()
-            left = BinaryOpNode(op, left, right)
-        return left
-    
-    def exprand(self):
-        left = self.expreq()
-        while self.current_type() == "OP_AND":
-            op = self.current_value()
-            self.advance()
-            right = self.expreq()
-            left = BinaryOpNode(op, left, right)
-        return left
-    
-    def expreq(self):
-        left = self.exprrel()
-        while self.current_type() in ["OP_EQ", "OP_NEQ"]:
-            op = self.current_value()
-            self.advance()
-            right = self.exprrel()
-            left = BinaryOpNode(op, left, right)
-        return left
-    
-    def exprrel(self):
-        left = self.expradit()
-        if self.current_type() in ["OP_LT", "OP_GT", "OP_LE", "OP_GE"]:
-            op = self.current_value()
-            self.advance()
-            right = self.expradit()
-            left = BinaryOpNode(op, left, right)
-        return left
-    
-    def expradit(self):
-        left = self.term()
-        while self.current_type() in ["OP_SUMA", "OP_RESTA"]:
-            op = self.current_value()
-            self.advance()
-            right = self.term()
-            left = BinaryOpNode(op, left, right)
-        return left
-    
-    def term(self):
-        left = self.factor()
-        while self.current_type() in ["OP_MUL", "OP_DIV", "OP_MOD"]:
-            op = self.current_value()
+        start = self.start
+        return self.operadores(self.factor(), start, 1)
+    
+    def operadores(self, left, start, min_bp):
+        """Precedence climbing: extiende left (que empieza en start) con los
+        operadores binarios de ligadura >= min_bp.
+
+        El operando derecho solo se extiende con una llamada interna si el
+        operador que le sigue liga más fuerte, así cada operando cuesta una
+        llamada a factor() en lugar de una por nivel de precedencia. ultimo
+        acota los operadores aceptados a continuación: tras un relacional no
+        se acepta otro (no asocian) y se devuelve sin consumirlo.
+        """
+        ligadura = LIGADURA
+        ultimo = 255
+        while True:
+            bp = ligadura[self.kind]
+            if bp < min_bp or bp > ultimo:
+                return left
+            op = self.value
             self.advance()
+            right_start = self.start
             right = self.factor()
-            left = BinaryOpNode(op, left, right)
-        return left
+            if ligadura[self.kind] > bp:
+                right = self.operadores(right, right_start, bp + 1)
+            left = self.located(BinaryOpNode(op, left, right), start)
+            ultimo = bp - 1 if bp == NIVEL_RELACIONAL else bp
     
     def factor(self):
-        token = self.current_type()
+        token = self.kind
         
-        if token == "LPAREN":
+        if token == T_LPAREN:
             self.advance()
             expr = self.expr()
-            self.expect("RPAREN")
+            self.expect(T_RPAREN)
             return expr
-        elif token == "NUM":
-            value = self.current_value()
+        elif token == T_NUM:
+            start = self.start
+            value = self.value
             self.advance()
-            return NumNode(value)
-        elif token == "OP_NOT":
+            return self.located(NumNode(value), start)
+        elif token == T_OP_NOT:
+            start = self.start
             self.advance()
             expr = self.factor()
-            return UnaryOpNode("!", expr)
-        elif token == "OP_RESTA":
+            return self.located(UnaryOpNode("!", expr), start)
+        elif token == T_OP_RESTA:
+            start = self.start
             self.advance()
             expr = self.factor()
-            return UnaryOpNode("-", expr)
-        elif token == "ID":
-            var_name = self.current_value()
+            return self.located(UnaryOpNode("-", expr), start)
+        elif token == T_ID:
+            start = self.start
+            var_name = self.value
             self.advance()
             
-            if self.current_type() == "ASIGNACION":
+            if self.kind == T_ASIGNACION:
                 self.advance()
                 expr = self.expr()
-                return AssignNode(var_name, expr)
-            elif self.current_type() == "LPAREN":
+                return self.located(AssignNode(var_name, expr), start)
+            elif self.kind == T_LPAREN:
                 self.advance()
                 args = []
-                if self.current_type() in ["LPAREN", "NUM", "OP_NOT", "ID", "OP_RESTA"]:
+                if self.kind in FIRST_EXPR:
                     args = self.arglist()
-                self.expect("RPAREN")
-                return FuncCallNode(var_name, args)
+                self.expect(T_RPAREN)
+                return self.located(FuncCallNode(var_name, args), start)
             else:
-                return VarNode(var_name)
+                return self.located(VarNode(var_name), start)
         else:
-            raise ParseError(f"Se esperaba LPAREN, NUM, OP_NOT, OP_RESTA o ID, se encontró {token}")
+            raise ParseError(f"Se esperaba LPAREN, NUM, OP_NOT, OP_RESTA o ID, se encontró {TOKEN_NAMES[token]}")
     
     def arglist(self):
         args = [self.expr()]
-        while self.current_type() == "COMA":
+        while self.kind == T_COMA:
             self.advance()
             args.append(self.expr())
         return args
@@ -379,10 +630,15 @@ def main():
         parser = ParserAST(tokens)
         ast = parser.parse()
         
-        if ast:
+        if ast and not parser.errors:
             print("AST construido exitosamente")
             print(f"\n{ast}")
             sys.exit(0)
+        elif ast:
+            print("AST parcial construido")
+            print(f"Errores de sintaxis: {len(parser.errors)}")
+            print(f"\n{ast}")
+            sys.exit(1)
         else:
             print("Error al construir el AST")
             sys.exit(1)
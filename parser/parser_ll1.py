@@ -0,0 +1,497 @@
+import sys
+import os
+from sys import intern
+from bisect import bisect_right
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+from lexer import Lexer, LexerError
+from token_buffer import *
+from ast_nodes import *
+from parser_ast import ParseError, MAX_ERRORES, _con_tipo
+from llgen import leer_gramatica, es_accion, es_no_terminal, EPSILON, GrammarError
+
+# Códigos de los símbolos en la pila: los terminales son tipos de token
+# (< _NT), los no terminales y cadenas de no terminales van desde _NT y las
+# acciones desde _ACCION.
+_NT = 64
+_ACCION = 1024
+_MAX_CADENA = 8
+
+# Terminales que dejan ((línea, columna), lexema) en la pila de valores. Los demás solo
+# delimitan y no aportan nada a los nodos.
+_SIN_VALOR = (T_RPAREN, T_RBRACE, T_PUNTOYCOMA, T_COMA, T_ELSE, T_EOF)
+_CON_VALOR = bytes(t not in _SIN_VALOR for t in range(len(TOKEN_NAMES))) + b"\0"
+# Terminal ficticio que abre la pila: consumirlo lee el primer token
+_INICIO = len(TOKEN_NAMES)
+# Fondo de la pila del driver
+_FONDO = -1
+# Lo que devuelve el flujo agotado: EOF, sin lexema ni posición propia
+_FIN = (T_EOF, "", None)
+
+# Lo que se esperaba según ParserAST en los no terminales donde no enumera el
+# conjunto FIRST: fuera de una declaración espera el fin del programa, en una
+# lista de sentencias el '}', y donde falta una sentencia o el resto de una
+# declaración, el ';'. Los demás usan sus FIRST, como factor().
+_ESPERADO_AST = {
+    "S": "EOF", "PROGRAMA": "EOF", "LISTADECL": "EOF",
+    "DECL": "un tipo", "TIPO": "un tipo", "PARAM": "un tipo", "DECLLOCAL": "un tipo",
+    "DECL'": "PUNTOYCOMA", "LISTASENTENCIAS": "RBRACE",
+    "SENTENCIA": "PUNTOYCOMA", "SENTENCIAEXPR": "PUNTOYCOMA",
+}
+
+
+def _enumerar(tipos):
+    nombres = [TOKEN_NAMES[t] for t in tipos]
+    return nombres[0] if len(nombres) == 1 else ", ".join(nombres[:-1]) + " o " + nombres[-1]
+
+
+def _compilar(g):
+    """Traduce la Gramatica a las tablas del driver.
+
+    tabla[x][tipo] es la tupla de símbolos que reemplaza al no terminal x en
+    la pila (ya invertida), o None si es un error. Las celdas vacías de un no
+    terminal anulable usan su producción ε, como el descenso recursivo: el
+    error se detecta en el siguiente terminal. Si la expansión empieza por el
+    terminal tipo, ese terminal no se apila y consume[x][tipo] es 1: el
+    driver lo consume en el mismo paso.
+
+    Cada celda se expande de antemano mientras el primer símbolo sea un no
+    terminal, porque la decisión depende del mismo token: EXPR con ID pasa
+    directo a ID FACTOR' TERM' ... EXPR'. Además, las secuencias de no
+    terminales que quedan en la pila (las colas FACTOR' TERM' ... EXPR') se
+    agrupan en un solo símbolo con su propia fila, así un ';' las descarta
+    todas con una búsqueda en lugar de una por nivel.
+    """
+    nombres = list(g.producciones)
+    acciones = sorted({s for alts in g.producciones.values() for alt in alts for s in alt if es_accion(s)})
+    codigo = {a: _ACCION + i for i, a in enumerate(acciones)}
+    tipos = range(len(TOKEN_NAMES))
+
+    def alternativa(a, tipo):
+        i = g.tabla[a].get(tipo)
+        if i is None and EPSILON in g.first[a]:
+            i = next(j for j, alt in enumerate(g.producciones[a]) if EPSILON in g.first_de(alt))
+        return None if i is None else g.producciones[a][i]
+
+    def agrupar(simbolos):
+        resultado = []
+        for s in simbolos:
+            anterior = resultado[-1] if resultado else None
+            if (es_no_terminal(s) or type(s) is tuple) and (es_no_terminal(anterior) or type(anterior) is tuple):
+                cadena = (anterior if type(anterior) is tuple else (anterior,)) + (s if type(s) is tuple else (s,))
+                # El largo acotado mantiene finito el número de cadenas (if anidados)
+                if len(cadena) <= _MAX_CADENA:
+                    resultado[-1] = cadena
+                    continue
+            resultado.append(s)
+        return resultado
+
+    def componer(simbolos, tipo):
+        """Expande los símbolos (en orden de lectura) hasta que el primero sea un terminal"""
+        resultado = []
+        simbolos = list(simbolos)
+        while simbolos:
+            s = simbolos.pop(0)
+            if type(s) is tuple:
+                simbolos[:0] = s
+            elif es_accion(s):
+                resultado.append(s)
+            elif es_no_terminal(s) and alternativa(s, tipo) is not None:
+                simbolos[:0] = alternativa(s, tipo)
+            else:
+                return resultado + [s] + agrupar(simbolos)
+        return resultado
+
+    filas = {a: [None if alternativa(a, tipo) is None else componer([a], tipo) for tipo in tipos]
+             for a in nombres}
+    pendientes = [c for fila in filas.values() for celda in fila if celda for c in celda if type(c) is tuple]
+    while pendientes:
+        cadena = pendientes.pop()
+        if cadena not in filas:
+            filas[cadena] = [componer(cadena, tipo) for tipo in tipos]
+            pendientes += [c for celda in filas[cadena] for c in celda if type(c) is tuple]
+    if _NT + len(filas) > _ACCION:
+        raise GrammarError("Demasiados símbolos para la tabla del parser")
+
+    codigo.update({a: _NT + i for i, a in enumerate(filas)})
+    tabla = [None] * _NT
+    consume = [None] * _NT
+    for fila in filas.values():
+        tabla.append([])
+        consume.append(bytearray(len(tipos)))
+        for tipo, celda in zip(tipos, fila):
+            if celda and celda[0] == tipo:
+                consume[-1][tipo] = 1
+                celda = celda[1:]
+            tabla[-1].append(None if celda is None else tuple(codigo.get(s, s) for s in reversed(celda)))
+    consume = [None if c is None else bytes(c) for c in consume]
+    esperados = {codigo[a]: _ESPERADO_AST.get(a) or _enumerar(g.esperados(a)) for a in nombres}
+    return tabla, consume, codigo[g.inicial], acciones, esperados
+
+
+_GRAMATICA = leer_gramatica()
+_TABLA, _CONSUME, _INICIAL, _ACCIONES, _ESPERADOS = _compilar(_GRAMATICA)
+
+
+class ParserLL1:
+    """Parser LL(1) dirigido por la tabla generada desde specs/grammar_spec.md.
+
+    Usa una pila explícita en lugar de recursión, así que acepta anidamientos
+    de cualquier profundidad. Las acciones semánticas de la gramática
+    construyen los mismos nodos (con las mismas posiciones) que ParserAST,
+    sobre una pila de valores con pares ((línea, columna), valor). No se
+    recupera de los errores: parse() informa el primero y devuelve None.
+
+    No hereda de ParserAST: el driver lee los arreglos del TokenBuffer sin
+    pasar por entries(), lleva la línea y la columna a medida que avanza en
+    lugar de buscarlas por cada nodo, y las acciones son funciones del módulo
+    indexadas por código, sin despacho de métodos.
+
+    El primer error coincide con el de ParserAST salvo en dos casos: en un
+    for, una expresión omitida seguida de un token que no la empieza ni la
+    cierra (for (i = 0; < 3; ...)) da "Se esperaba PUNTOYCOMA" (o RPAREN)
+    donde ParserAST intenta leer la expresión y enumera los FIRST de factor;
+    y ParserAST no acepta una sentencia que empieza con '-' (FIRST_SENTENCIA
+    no incluye OP_RESTA), que la gramática sí admite.
+    """
+
+    # Sin cuerpos diferidos: la interfaz es la de ParserAST para compile.py
+    lazy = False
+
+    def __init__(self, tokens, lines=None, max_errors=MAX_ERRORES):
+        self.tokens = tokens
+        self.errors = []
+        self.max_errors = max_errors
+        if isinstance(tokens, TokenBuffer):
+            # Tuplas (tipo, lexema, inicio) armadas por zip/map, sin un
+            # generador de Python por token
+            fuente = tokens.source
+            self._siguiente = zip(tokens.kinds, map(fuente.__getitem__, map(slice, tokens.starts, tokens.ends)),
+                                  tokens.starts)
+            if lines is None:
+                lines = tokens.line_index()
+        else:
+            self._siguiente = _con_tipo(tokens)
+            if lines is None:
+                # Sin LineIndex los nodos quedan en la posición 0
+                self._siguiente = ((kind, value, 0) for kind, value, _ in self._siguiente)
+        self.lines = lines
+        self.pos = 0
+        self.kind = T_EOF
+        self.start = 0
+
+    def parse(self, imprimir=True):
+        """Analiza el programa completo y devuelve el ProgramNode, o None si
+        hay un error de sintaxis (se registra en self.errors y, salvo con
+        imprimir=False, se imprime)"""
+        try:
+            ast = self.programa()
+        except ParseError as e:
+            ast = None
+            mensaje = str(e)
+            if self.lines is not None:
+                line, col = self.lines.line_col(self.start)
+                mensaje = f"{mensaje} (línea {line}, columna {col})"
+            self.errors.append(mensaje)
+        if imprimir:
+            for error in self.errors:
+                print(f"Error de sintaxis: {error}")
+        return ast
+
+    def programa(self):
+        tabla = _TABLA
+        consume = _CONSUME
+        acciones = _FUNCIONES
+        con_valor = _CON_VALOR
+        siguiente = self._siguiente
+        # El terminal ficticio _INICIO se consume primero y lee el primer token
+        # _FONDO no coincide con ningún token: llegar a él termina el análisis
+        pila = [_FONDO, _INICIAL, _INICIO]
+        desapilar = pila.pop
+        valores = []
+        apilar = valores.append
+        kind, value, start = _INICIO, "", 0
+        pos = self.pos
+
+        # La línea y columna del token actual se calculan al leerlo: desde el
+        # inicio de línea base+1 hasta sig, el siguiente, solo cambia la
+        # columna. Pasado sig se vuelve a buscar (el índice puede crecer con
+        # un lexer por bloques).
+        if self.lines is not None:
+            posicion = self.lines.line_col(0)
+            inicios = self.lines.starts
+            linea, base, sig = 0, 0, 0
+        else:
+            posicion = (0, 0)
+            linea, base, sig = 0, 0, float("inf")
+
+        while True:
+            x = desapilar()
+            if x >= _NT:
+                if x >= _ACCION:
+                    acciones[x](valores, posicion)
+                    continue
+                expansion = tabla[x][kind]
+                if expansion is None:
+                    self.kind, self.start, self.pos = kind, start, pos
+                    raise ParseError(f"Se esperaba {_ESPERADOS[x]}, se encontró {TOKEN_NAMES[kind]}")
+                pila += expansion
+                if not consume[x][kind]:
+                    continue
+            elif x != kind:
+                if x == _FONDO:
+                    break
+                self.kind, self.start, self.pos = kind, start, pos
+                raise ParseError(f"Se esperaba {TOKEN_NAMES[x]}, se encontró {TOKEN_NAMES[kind]}")
+
+            # Consumir el terminal actual
+            if con_valor[kind]:
+                apilar(posicion)
+                apilar(value)
+            # Desempaquetar sin retener la tupla deja que zip la reutilice
+            kind, value, inicio = next(siguiente, _FIN)
+            if inicio is not None:
+                start = inicio
+                if kind == T_ID:
+                    value = intern(value)
+                if start >= sig:
+                    linea = bisect_right(inicios, start)
+                    base = inicios[linea - 1] - 1
+                    sig = inicios[linea] if linea < len(inicios) else start + 1
+                posicion = (linea, start - base)
+                pos += 1
+
+        self.kind, self.start, self.pos = kind, start, pos
+        return valores[1]
+
+
+# Acciones semánticas. v es la pila de valores: cada terminal con valor y cada
+# no terminal ya reducido ocupan dos posiciones, (línea, columna) y valor. p es
+# la posición del token actual.
+
+def _lista(v, p):
+    v.append(p)
+    v.append([])
+
+
+def _agregar(v, p):
+    x = v[-1]
+    del v[-2:]
+    if type(x) is list:
+        v[-1].extend(x)
+    elif x is not None:
+        v[-1].append(x)
+
+
+def _programa(v, p):
+    node = v[-1] = ProgramNode(v[-1])
+    node.line, node.col = v[-2]
+
+
+def _funcion(v, p):
+    body = v.pop()
+    v.pop()
+    params = v.pop()
+    del v[-3:]
+    name = v.pop()
+    v.pop()
+    node = v[-1] = FuncDeclNode(v[-1], name, params, body)
+    node.line, node.col = v[-2]
+
+
+def _primera(v, p):
+    node = VarDeclNode(v[-3], v[-1], None)
+    node.line, node.col = v[-2]
+    v[-1] = [node]
+
+
+def _inicializar(v, p):
+    expr = v.pop()
+    del v[-3:]
+    v[-1][-1].init_expr = expr
+
+
+def _otra(v, p):
+    name = v.pop()
+    node = VarDeclNode(v[-4], name, None)
+    node.line, node.col = v.pop()
+    v[-1].append(node)
+
+
+def _variables(v, p):
+    vars_list = v.pop()
+    v.pop()
+    v[-1] = vars_list
+
+
+def _parametro(v, p):
+    name = v.pop()
+    v.pop()
+    node = v[-1] = ParamNode(v[-1], name)
+    node.line, node.col = v[-2]
+
+
+def _bloque(v, p):
+    statements = v.pop()
+    v.pop()
+    node = v[-1] = BlockNode(statements)
+    node.line, node.col = v[-2]
+
+
+def _sentencia_expr(v, p):
+    node = v[-1] = ExprStmtNode(v[-1])
+    node.line, node.col = v[-2]
+
+
+def _nada(v, p):
+    v.append(p)
+    v.append(None)
+
+
+def _si(v, p):
+    then_stmt = v.pop()
+    v.pop()
+    condition = v.pop()
+    del v[-3:]
+    node = v[-1] = IfNode(condition, then_stmt, None)
+    node.line, node.col = v[-2]
+
+
+def _si_sino(v, p):
+    else_stmt = v.pop()
+    v.pop()
+    then_stmt = v.pop()
+    v.pop()
+    condition = v.pop()
+    del v[-3:]
+    node = v[-1] = IfNode(condition, then_stmt, else_stmt)
+    node.line, node.col = v[-2]
+
+
+def _mientras(v, p):
+    body = v.pop()
+    v.pop()
+    condition = v.pop()
+    del v[-3:]
+    node = v[-1] = WhileNode(condition, body)
+    node.line, node.col = v[-2]
+
+
+def _para(v, p):
+    body = v.pop()
+    v.pop()
+    update_expr = v.pop()
+    v.pop()
+    condition = v.pop()
+    v.pop()
+    init_expr = v.pop()
+    del v[-3:]
+    node = v[-1] = ForNode(init_expr, condition, update_expr, body)
+    node.line, node.col = v[-2]
+
+
+def _vacia(v, p):
+    node = EmptyExprNode()
+    node.line, node.col = p
+    v.append(p)
+    v.append(node)
+
+
+def _retorno(v, p):
+    expr = v.pop()
+    v.pop()
+    node = v[-1] = ReturnNode(expr)
+    node.line, node.col = v[-2]
+
+
+def _imprimir(v, p):
+    expr = v.pop()
+    del v[-3:]
+    node = v[-1] = PrintNode(expr)
+    node.line, node.col = v[-2]
+
+
+def _binaria(v, p):
+    node = BinaryOpNode(v[-3], v[-5], v[-1])
+    node.line, node.col = v[-6]
+    del v[-4:]
+    v[-1] = node
+
+
+def _parentesis(v, p):
+    expr = v.pop()
+    v.pop()
+    v[-1] = expr
+
+
+def _numero(v, p):
+    node = v[-1] = NumNode(v[-1])
+    node.line, node.col = v[-2]
+
+
+def _unaria(v, p):
+    expr = v.pop()
+    v.pop()
+    node = v[-1] = UnaryOpNode(v[-1], expr)
+    node.line, node.col = v[-2]
+
+
+def _asignacion(v, p):
+    expr = v.pop()
+    del v[-3:]
+    node = v[-1] = AssignNode(v[-1], expr)
+    node.line, node.col = v[-2]
+
+
+def _llamada(v, p):
+    args = v.pop()
+    del v[-3:]
+    node = v[-1] = FuncCallNode(v[-1], args)
+    node.line, node.col = v[-2]
+
+
+def _variable(v, p):
+    node = v[-1] = VarNode(v[-1])
+    node.line, node.col = v[-2]
+
+
+# Función de cada acción, indexada por su código en la pila
+_FUNCIONES = [None] * _ACCION + [globals()["_" + a.strip("{}")] for a in _ACCIONES]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python parser_ll1.py <archivo_fuente>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        tokens = Lexer().tokenize(src)
+        print("Análisis léxico exitoso")
+        print(f"Tokens generados: {len(tokens)}\n")
+
+        print("Iniciando construcción del AST (LL(1) por tabla)")
+        ast = ParserLL1(tokens).parse()
+
+        if ast:
+            print("AST construido exitosamente")
+            print(f"\n{ast}")
+            sys.exit(0)
+        else:
+            print("Error al construir el AST")
+            sys.exit(1)
+
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
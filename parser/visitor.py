@@ -0,0 +1,77 @@
+"""Recorrido de ASTs con despacho por clase de nodo.
+
+Cada pasada hereda de NodeVisitor y define visit_<nombre> para los nodos que
+le interesan, con el nombre de la clase sin "Node" en snake_case
+(BinaryOpNode -> visit_binary_op). visit(node) busca el método una vez por
+clase y lo guarda en un diccionario, en lugar de recorrer una cadena de
+isinstance en cada visita.
+
+Una declaración con varias variables (int a, b;) usada como cuerpo de un if,
+while o for llega como una lista de VarDeclNode: visit la pasa a visit_list.
+"""
+import re
+
+from ast_nodes import ASTNode
+
+_MAYUSCULA = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def nombre_visita(cls):
+    """Nombre del método que visita los nodos de cls: visit_binary_op para BinaryOpNode"""
+    nombre = cls.__name__
+    if nombre.endswith("Node"):
+        nombre = nombre[:-4]
+    return "visit_" + _MAYUSCULA.sub("_", nombre).lower()
+
+
+class _Despacho(dict):
+    """Clase de nodo -> método ligado; las clases que faltan se resuelven al pedirlas"""
+
+    def __init__(self, visitor):
+        super().__init__()
+        self.visitor = visitor
+
+    def __missing__(self, cls):
+        metodo = self[cls] = self.visitor._resolver(cls)
+        return metodo
+
+
+class NodeVisitor:
+    """Base de las pasadas sobre el AST.
+
+    La tabla de despacho va de clase de nodo a método ligado. Se completa la
+    primera vez que se visita cada clase: se usa el método de la clase o, si
+    no lo hay, el de la base más cercana en su MRO, y si ninguna lo tiene,
+    generic_visit.
+    """
+
+    def __init__(self):
+        self._visitas = _Despacho(self)
+
+    def visit(self, node):
+        return self._visitas[node.__class__](node)
+
+    def _resolver(self, cls):
+        if cls is list:
+            return self.visit_list
+        for base in cls.__mro__:
+            if issubclass(base, ASTNode):
+                metodo = getattr(self, nombre_visita(base), None)
+                if metodo is not None:
+                    return metodo
+        return self.generic_visit
+
+    def visit_list(self, nodes):
+        """Visita cada elemento de una lista de nodos en orden; no devuelve nada"""
+        for node in nodes:
+            self.visit(node)
+
+    def generic_visit(self, node):
+        """Visita los hijos de node en orden; no devuelve nada"""
+        for _, valor in node.iter_fields():
+            if isinstance(valor, ASTNode):
+                self.visit(valor)
+            elif isinstance(valor, list):
+                for hijo in valor:
+                    if isinstance(hijo, ASTNode):
+                        self.visit(hijo)
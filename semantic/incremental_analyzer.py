@@ -0,0 +1,180 @@
+"""Reverificación semántica incremental con dependencias por declaración.
+
+Cada declaración de nivel superior guarda sus errores junto con los nombres
+que consultó: las funciones que llama y las variables globales que lee o
+asigna, incluidas las que no encontró (una global agregada después puede
+cambiar el resultado). Tras una edición, ProgramaIncremental conserva los
+mismos objetos nodo para lo que no cambió; aquí solo se vuelven a verificar
+las declaraciones nuevas y las que consultaron un nombre declarado por alguna
+declaración nueva o eliminada. El resto reutiliza sus errores.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
+from lexer import Lexer, LexerError
+from ast_nodes import *
+from incremental import ProgramaIncremental
+from semantic_analyzer import SemanticAnalyzer, SemanticError, TYPE_CODES
+
+
+def claves_propias(decl):
+    """Nombres que declara decl: ('f', nombre) para una función, ('g', nombre) para una global"""
+    if isinstance(decl, FuncDeclNode):
+        return {('f', decl.func_name)}
+    if isinstance(decl, VarDeclNode):
+        return {('g', decl.var_name)}
+    return set()
+
+
+class _AnalizadorConDependencias(SemanticAnalyzer):
+    """SemanticAnalyzer que anota en deps los nombres de nivel superior que consulta"""
+
+    def __init__(self):
+        super().__init__()
+        self.deps = set()
+
+    def usar_global(self, name):
+        stack = self.symbol_table.bindings.get(name)
+        if not stack or stack[-1][0] == 0:
+            self.deps.add(('g', name))
+
+    def visit_var(self, node):
+        self.usar_global(node.var_name)
+        return super().visit_var(node)
+
+    def visit_assign(self, node):
+        self.usar_global(node.var_name)
+        return super().visit_assign(node)
+
+    def visit_func_call(self, node):
+        self.deps.add(('f', node.func_name))
+        return super().visit_func_call(node)
+
+
+class IncrementalAnalyzer:
+    """Análisis semántico de un ProgramNode que se reverifica tras cada edición.
+
+    resultados lleva cada declaración (por identidad) a sus errores y sus
+    dependencias; dependientes es el grafo inverso, de cada nombre a las
+    declaraciones que lo consultaron. analyze() da el mismo resultado que
+    SemanticAnalyzer().analyze(program).
+    """
+
+    def __init__(self, program):
+        self.program = program
+        self.resultados = {}
+        self.dependientes = {}
+        self.analyzer = None
+        self.rechecked = []
+
+    @property
+    def errors(self):
+        return self.analyzer.errors
+
+    @property
+    def symbol_table(self):
+        return self.analyzer.symbol_table
+
+    def dependencies(self, decl):
+        """Nombres ('f' o 'g', nombre) de los que depende el resultado de decl"""
+        return self.resultados[decl][1]
+
+    def analyze(self):
+        """Verifica program.declarations reutilizando lo que no cambió.
+
+        Devuelve True si no hay errores; las declaraciones verificadas de
+        nuevo quedan en rechecked.
+        """
+        declarations = self.program.declarations
+        actuales = set(declarations)
+        eliminadas = [decl for decl in self.resultados if decl not in actuales]
+        nuevas = [decl for decl in declarations if decl not in self.resultados]
+        sucias = set(nuevas)
+        for decl in eliminadas + nuevas:
+            for clave in claves_propias(decl):
+                sucias |= self.dependientes.get(clave, set())
+        for decl in eliminadas:
+            self._olvidar(decl)
+
+        analyzer = self.analyzer = _AnalizadorConDependencias()
+        self.rechecked = []
+        try:
+            repetidas = analyzer.declare_functions(declarations)
+            for i, decl in enumerate(declarations):
+                if decl in sucias:
+                    self._olvidar(decl)
+                    analyzer.deps = claves_propias(decl)
+                    antes = len(analyzer.errors)
+                    analyzer.check_declaration(decl, repetidas.get(i))
+                    self._registrar(decl, analyzer.errors[antes:], frozenset(analyzer.deps))
+                    self.rechecked.append(decl)
+                else:
+                    errores, _ = self.resultados[decl]
+                    if isinstance(decl, VarDeclNode):
+                        # La global sigue visible para las declaraciones siguientes
+                        try:
+                            analyzer.symbol_table.add_symbol(decl.var_name, TYPE_CODES[decl.var_type])
+                        except SemanticError:
+                            pass
+                    analyzer.errors.extend(errores)
+        except SemanticError as e:
+            analyzer.add_error(str(e))
+            return False
+        return len(analyzer.errors) == 0
+
+    def _registrar(self, decl, errores, deps):
+        self.resultados[decl] = (errores, deps)
+        for clave in deps:
+            self.dependientes.setdefault(clave, set()).add(decl)
+
+    def _olvidar(self, decl):
+        resultado = self.resultados.pop(decl, None)
+        if resultado is None:
+            return
+        for clave in resultado[1]:
+            nodos = self.dependientes.get(clave)
+            if nodos is not None:
+                nodos.discard(decl)
+                if not nodos:
+                    del self.dependientes[clave]
+
+
+def main():
+    if len(sys.argv) < 5:
+        print("Uso: python incremental_analyzer.py <archivo_fuente> <offset> <borrados> <insertado>", file=sys.stderr)
+        sys.exit(1)
+
+    path = sys.argv[1]
+    offset, borrados, insertado = int(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            src = f.read()
+
+        programa = ProgramaIncremental(Lexer().tokenize(src))
+        analisis = IncrementalAnalyzer(programa.program)
+        analisis.analyze()
+        programa.editar(offset, borrados, insertado)
+        success = analisis.analyze()
+
+        print(f"Declaraciones: {len(programa.program.declarations)}")
+        print(f"Reverificadas: {len(analisis.rechecked)}")
+        for decl in analisis.rechecked:
+            print(f"  {decl} (línea {decl.line})")
+        for error in programa.errors:
+            print(f"Error de sintaxis: {error}")
+        print(analisis.analyzer.get_errors_report())
+        sys.exit(0 if success and not programa.errors else 1)
+
+    except LexerError as e:
+        print(f"Error léxico: {e}", file=sys.stderr)
+        sys.exit(1)
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,133 @@
 import sys
 import os
+from sys import intern
+from concurrent.futures import ProcessPoolExecutor
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'lexer'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'parser'))
 from lexer import Lexer, LexerError
-from parser_ast import ParserAST
+from parser_ast import ParserAST, CuerpoDiferido
 from ast_nodes import *
+from visitor import NodeVisitor
 
 class SemanticError(Exception):
     pass
 
+
+# Los tipos son enteros pequeños; TYPE_NAMES da el nombre que va en los
+# mensajes y en las anotaciones expr_type del AST
+INT, FLOAT, BOOL, VOID, UNKNOWN = range(5)
+TYPE_NAMES = ('int', 'float', 'bool', 'void', 'unknown')
+TYPE_CODES = {intern(name): code for code, name in enumerate(TYPE_NAMES)}
+NUMERICOS = (INT, FLOAT, UNKNOWN)
+
+
+def _tabla(regla):
+    """Tupla de tuplas t[izquierdo][derecho] = regla(izquierdo, derecho)"""
+    return tuple(tuple(regla(a, b) for b in range(len(TYPE_NAMES))) for a in range(len(TYPE_NAMES)))
+
+
+# ASSIGNABLE[esperado][encontrado]: un valor del tipo encontrado se puede
+# asignar, pasar o devolver donde se espera el otro
+ASSIGNABLE = _tabla(lambda esperado, encontrado:
+                    esperado == encontrado or (esperado, encontrado) == (FLOAT, INT) or encontrado == UNKNOWN)
+
+# Condiciones de if, while y for, indexado por tipo
+CONDICION_VALIDA = tuple(t != VOID for t in range(len(TYPE_NAMES)))
+
+_ARITMETICO = _tabla(lambda a, b: (FLOAT if FLOAT in (a, b) else INT)
+                     if a in NUMERICOS and b in NUMERICOS else None)
+_RELACIONAL = _tabla(lambda a, b: BOOL if a in NUMERICOS and b in NUMERICOS else None)
+_LOGICO = _tabla(lambda a, b: BOOL)
+
+# Tipo del resultado de cada operador binario, BINARY_RESULT[op][izquierdo][derecho];
+# None si los operandos no son válidos
+BINARY_RESULT = {intern(op): tabla for ops, tabla in (("+-*/%", _ARITMETICO),
+                                                      (("<", ">", "<=", ">=", "==", "!="), _RELACIONAL),
+                                                      (("&&", "||"), _LOGICO))
+                 for op in ops}
+
+# Menos unario, por tipo del operando
+NEGACION = tuple(t if t in NUMERICOS else None for t in range(len(TYPE_NAMES)))
+
+
 class SymbolTable:
-    """Tabla de símbolos con soporte para ámbitos"""
+    """Tabla de símbolos con soporte para ámbitos.
+
+    Las claves son los nombres internados por ParserAST (sys.intern), así las
+    búsquedas resuelven por identidad sin comparar caracteres.
+
+    Un solo diccionario lleva cada nombre a su pila de ligaduras (ámbito, tipo,
+    posición en el registro), con la más interna al final, y un registro de deshacer guarda los nombres en
+    el orden en que se declararon. marks tiene, por ámbito abierto, dónde
+    empezaba su parte del registro. Así lookup es O(1) sin importar el
+    anidamiento, abrir un ámbito no crea nada y cerrarlo cuesta lo que declaró.
+
+    Los tipos se guardan como códigos (INT, FLOAT, ...); los nombres aparecen
+    solo en get_table_representation.
+    """
     
     def __init__(self):
-        self.scopes = [{}]
+        self.bindings = {}
+        self.log = []
+        self.marks = []
         self.functions = {}
     
     def enter_scope(self):
-        self.scopes.append({})
+        self.marks.append(len(self.log))
     
     def exit_scope(self):
-        if len(self.scopes) > 1:
-            self.scopes.pop()
+        if self.marks:
+            mark = self.marks.pop()
+            bindings = self.bindings
+            log = self.log
+            while len(log) > mark:
+                name = log.pop()
+                stack = bindings[name]
+                stack.pop()
+                if not stack:
+                    del bindings[name]
     
     def add_symbol(self, name, symbol_type, is_function=False):
-        current_scope = self.scopes[-1]
-        if name in current_scope:
+        name = intern(name)
+        depth = len(self.marks)
+        stack = self.bindings.get(name)
+        if stack is None:
+            stack = self.bindings[name] = []
+        elif stack[-1][0] == depth:
             raise SemanticError(f"Variable '{name}' ya está declarada en este ámbito")
-        current_scope[name] = symbol_type
+        stack.append((depth, symbol_type, len(self.log)))
+        self.log.append(name)
     
     def lookup(self, name):
-        for scope in reversed(self.scopes):
-            if name in scope:
-                return scope[name]
+        stack = self.bindings.get(name)
+        if stack:
+            return stack[-1][1]
         return None
     
+    def resolve(self, name):
+        """(marco, posición) de la ligadura visible de name, o None.
+
+        Marco 0 son las globales, numeradas en orden de declaración; marco 1
+        son los parámetros y locales de la función abierta, numerados desde
+        el inicio de su ámbito. Los ámbitos hermanos reutilizan posiciones.
+        """
+        stack = self.bindings.get(name)
+        if not stack:
+            return None
+        depth, _, index = stack[-1]
+        if depth == 0:
+            return 0, index
+        return 1, index - self.marks[0]
+    
+    def global_symbols(self):
+        """Variables globales (nombre, tipo) en orden de declaración"""
+        names = self.log[:self.marks[0]] if self.marks else self.log
+        return [(name, self.bindings[name][0][1]) for name in names]
+    
     def add_function(self, name, return_type, param_types):
         if name in self.functions:
             raise SemanticError(f"Función '{name}' ya está declarada")
-        self.functions[name] = (return_type, param_types)
+        self.functions[intern(name)] = (return_type, param_types)
     
     def lookup_function(self, name):
         return self.functions.get(name, None)
@@ -47,10 +137,10 @@ class SymbolTable:
         
         # --- Variables Globales ---
         lines.append("--- Variables Globales ---")
-        global_scope = self.scopes[0]
+        global_scope = self.global_symbols()
         if global_scope:
-            for name, var_type in global_scope.items():
-                lines.append(f"{name} ({var_type})")
+            for name, var_type in global_scope:
+                lines.append(f"{name} ({TYPE_NAMES[var_type]})")
         else:
             lines.append("(ninguna)")
         
@@ -63,15 +153,15 @@ class SymbolTable:
             nombres = list(self.functions.keys())
             max_name = max(len("Nombre"), max(len(n) for n in nombres))
             max_ret = max(len("Tipo Retorno"),
-                          max(len(info[0]) for info in self.functions.values()))
+                          max(len(TYPE_NAMES[info[0]]) for info in self.functions.values()))
             
             header = f"{'Nombre'.ljust(max_name)}   {'Tipo Retorno'.ljust(max_ret)}   Parámetros"
             lines.append(header)
             lines.append("-" * len(header))
             
             for name, (ret_type, params) in self.functions.items():
-                params_str = ", ".join(params) if params else "(sin parámetros)"
-                line = f"{name.ljust(max_name)}   {ret_type.ljust(max_ret)}   {params_str}"
+                params_str = ", ".join(TYPE_NAMES[t] for t in params) if params else "(sin parámetros)"
+                line = f"{name.ljust(max_name)}   {TYPE_NAMES[ret_type].ljust(max_ret)}   {params_str}"
                 lines.append(line)
         else:
             lines.append("(ninguna)")
@@ -82,46 +172,246 @@ class SymbolTable:
         return "\n".join(lines)
 
 
-class SemanticAnalyzer:
-    """Analizador semántico que recorre el AST y valida restricciones"""
+class _Diferir(Exception):
+    """Una llamada a una función todavía no declarada en el análisis por
+    declaración: la declaración se vuelve a verificar al final"""
+
+
+# Contexto de un proceso del pool de check_program: los tokens, las variables
+# globales (en orden), las firmas y el analizador que ya tiene declaradas las
+# primeras globales
+_trabajador = None
+
+
+def _iniciar_trabajador(tokens, globales, funciones):
+    global _trabajador
+    _trabajador = (tokens, globales, funciones, [None, 0])
+
+
+def _verificar_funcion(tarea):
+    """Analiza y verifica el cuerpo de una función en un proceso del pool.
+
+    tarea es (desde, tipo de retorno, parámetros (tipo, nombre), n): el cuerpo
+    empieza en el token desde y solo las primeras n globales son visibles. Las
+    tareas llegan en orden, así que el analizador del proceso se reutiliza
+    agregando las globales que faltan. Devuelve los errores de sintaxis y los
+    semánticos del cuerpo.
+    """
+    desde, return_type, params, n = tarea
+    tokens, globales, funciones, actual = _trabajador
+    analyzer, visibles = actual
+    if analyzer is None or n < visibles:
+        analyzer, visibles = SemanticAnalyzer.with_context([], funciones), 0
+    for name, var_type in globales[visibles:n]:
+        analyzer.symbol_table.add_symbol(name, var_type)
+    actual[:] = analyzer, n
+
+    sintaxis = []
+    body = CuerpoDiferido(tokens, None, desde, sintaxis)()
+    decl = FuncDeclNode(return_type, None, [ParamNode(t, name) for t, name in params], body)
+    analyzer.errors = []
+    analyzer.visit_func_body(decl)
+    return sintaxis, analyzer.errors
+
+
+class SemanticAnalyzer(NodeVisitor):
+    """Analizador semántico que recorre el AST y valida restricciones.
+
+    Cada nodo se despacha con NodeVisitor.visit a su visit_<nombre>; los de
+    expresión devuelven el tipo resultante.
+    """
     
     def __init__(self):
+        super().__init__()
         self.symbol_table = SymbolTable()
         self.errors = []
         self.current_function_return_type = None
+        self._diferir = False
+    
+    @classmethod
+    def with_context(cls, globales, funciones):
+        """Analizador con las variables globales (nombre, tipo) y las firmas ya declaradas"""
+        analyzer = cls()
+        for name, var_type in globales:
+            analyzer.symbol_table.add_symbol(name, var_type)
+        analyzer.symbol_table.functions = funciones
+        return analyzer
     
     def add_error(self, message):
         self.errors.append(message)
     
-    def analyze(self, ast):
+    def analyze(self, ast, jobs=1):
         try:
-            self.visit_program(ast)
+            self.check_program(ast.declarations, jobs)
             return len(self.errors) == 0
         except SemanticError as e:
             self.add_error(str(e))
             return False
     
-    def visit_program(self, node):
-        for decl in node.declarations:
+    def declare_functions(self, declarations):
+        """Registra las firmas de todas las funciones de declarations.
+
+        Devuelve {índice: error} de las funciones repetidas, cuyos cuerpos no
+        se verifican.
+        """
+        repetidas = {}
+        for i, decl in enumerate(declarations):
             if isinstance(decl, FuncDeclNode):
-                self.visit_func_decl(decl)
+                try:
+                    self.symbol_table.add_function(decl.func_name, TYPE_CODES[decl.return_type],
+                                                   [TYPE_CODES[p.param_type] for p in decl.params])
+                except SemanticError as e:
+                    repetidas[i] = str(e)
+        return repetidas
+    
+    def declare_signatures(self, ast):
+        """Registra en la tabla las funciones y variables globales sin recorrer
+        cuerpos ni inicializadores.
+
+        Con un AST de ParserAST(tokens, lazy=True) la tabla se obtiene sin
+        analizar ninguna sentencia.
+        """
+        repetidas = self.declare_functions(ast.declarations)
+        for i, decl in enumerate(ast.declarations):
+            if i in repetidas:
+                self.add_error(repetidas[i])
             elif isinstance(decl, VarDeclNode):
-                self.visit_var_decl(decl, is_global=True)
+                try:
+                    self.symbol_table.add_symbol(decl.var_name, TYPE_CODES[decl.var_type])
+                except SemanticError as e:
+                    self.add_error(str(e))
+        return len(self.errors) == 0
+    
+    def check_program(self, declarations, jobs=1):
+        """Verifica las declaraciones de nivel superior en dos pasadas.
+
+        La primera registra todas las firmas, así una función puede llamar a
+        otra definida más adelante. La segunda recorre las declaraciones en
+        orden: las variables globales se verifican aquí y cada cuerpo de
+        función ve solo las globales declaradas antes que él.
+
+        Con jobs > 1, los cuerpos que ParserAST(tokens, lazy=True) dejó sin
+        analizar se analizan y verifican en un pool de procesos, que recibe
+        los tokens una sola vez: copiar un AST ya construido a otro proceso
+        cuesta más que verificarlo. Los errores semánticos se intercalan en el
+        orden del fuente, igual que en serie, y los de sintaxis de cada cuerpo
+        se informan a su parser. Esos cuerpos siguen diferidos en este proceso.
+        """
+        repetidas = self.declare_functions(declarations)
+        tokens = None
+        if jobs > 1:
+            diferidas = [d.pending_body() for d in declarations
+                         if isinstance(d, FuncDeclNode) and isinstance(d.pending_body(), CuerpoDiferido)]
+            if len(diferidas) > 1:
+                tokens = diferidas[0].tokens
+        tareas = []
+        partes = []
+        for i, decl in enumerate(declarations):
+            antes = len(self.errors)
+            if i not in repetidas and isinstance(decl, FuncDeclNode):
+                pendiente = decl.pending_body()
+                if tokens is not None and isinstance(pendiente, CuerpoDiferido) and pendiente.tokens is tokens:
+                    partes.append(len(tareas))
+                    tareas.append((pendiente, (pendiente.desde, decl.return_type,
+                                               [(p.param_type, p.param_name) for p in decl.params],
+                                               len(self.symbol_table.log))))
+                    continue
+            self.check_declaration(decl, repetidas.get(i))
+            partes.append(self.errors[antes:])
+            del self.errors[antes:]
+        
+        resultados = []
+        if tareas:
+            globales = self.symbol_table.global_symbols()
+            chunksize = max(1, len(tareas) // (jobs * 4))
+            with ProcessPoolExecutor(jobs, initializer=_iniciar_trabajador,
+                                     initargs=(tokens, globales, self.symbol_table.functions)) as pool:
+                resultados = list(pool.map(_verificar_funcion, [t for _, t in tareas], chunksize=chunksize))
+            for (pendiente, _), (sintaxis, _) in zip(tareas, resultados):
+                pendiente.informar(sintaxis)
+        for parte in partes:
+            self.errors.extend(resultados[parte][1] if isinstance(parte, int) else parte)
+    
+    def check_declaration(self, decl, repetida=None):
+        """Segunda pasada de check_program para una declaración.
+
+        repetida es el error de declare_functions si la función está repetida.
+        """
+        if repetida is not None:
+            self.add_error(repetida)
+            # El cuerpo no se verifica, pero si estaba diferido se analiza
+            # para que sus errores de sintaxis se informen
+            decl.body
+        elif isinstance(decl, FuncDeclNode):
+            self.visit_func_body(decl)
+        elif isinstance(decl, VarDeclNode):
+            self.visit_var_decl(decl, is_global=True)
+    
+    def analyze_declarations(self, declarations):
+        """Analiza declaraciones de nivel superior a medida que llegan.
+
+        declarations es cualquier iterable, p. ej. ParserAST.declaraciones().
+        Tras cada declaración genera el par (declaración, errores nuevos), así
+        los errores se pueden informar antes de terminar de leer el programa.
+        Las que llaman a una función que todavía no apareció se guardan y se
+        verifican al final, con todas las firmas y las globales que veían: el
+        resultado es el de check_program, salvo que sus errores llegan últimos.
+        """
+        diferidas = []
+        for decl in declarations:
+            antes = len(self.errors)
+            self._diferir = True
+            try:
+                self.visit_declaration(decl)
+            except _Diferir:
+                del self.errors[antes:]
+                while self.symbol_table.marks:
+                    self.symbol_table.exit_scope()
+                self.current_function_return_type = None
+                diferidas.append((decl, len(self.symbol_table.log)))
+                continue
+            except SemanticError as e:
+                self.add_error(str(e))
+                yield decl, self.errors[antes:]
+                return
+            finally:
+                self._diferir = False
+            yield decl, self.errors[antes:]
+        
+        globales = self.symbol_table.global_symbols()
+        for decl, n in diferidas:
+            analyzer = SemanticAnalyzer.with_context(globales[:n], self.symbol_table.functions)
+            if isinstance(decl, FuncDeclNode):
+                analyzer.visit_func_body(decl)
+            else:
+                analyzer.visit_var_init(decl)
+            self.errors.extend(analyzer.errors)
+            yield decl, analyzer.errors
+    
+    def visit_program(self, node):
+        self.check_program(node.declarations)
+    
+    def visit_declaration(self, decl):
+        if isinstance(decl, (FuncDeclNode, VarDeclNode)):
+            self.visit(decl)
     
     def visit_func_decl(self, node):
-        param_types = [p.param_type for p in node.params]
+        param_types = [TYPE_CODES[p.param_type] for p in node.params]
         try:
-            self.symbol_table.add_function(node.func_name, node.return_type, param_types)
+            self.symbol_table.add_function(node.func_name, TYPE_CODES[node.return_type], param_types)
         except SemanticError as e:
             self.add_error(str(e))
             return
-        
+        self.visit_func_body(node)
+    
+    def visit_func_body(self, node):
+        """Parámetros y cuerpo de una función cuya firma ya está registrada"""
         self.symbol_table.enter_scope()
-        self.current_function_return_type = node.return_type
+        self.current_function_return_type = TYPE_CODES[node.return_type]
         
         for param in node.params:
             try:
-                self.symbol_table.add_symbol(param.param_name, param.param_type)
+                self.symbol_table.add_symbol(param.param_name, TYPE_CODES[param.param_type])
             except SemanticError as e:
                 self.add_error(str(e))
         
@@ -132,185 +422,168 @@ class SemanticAnalyzer:
     
     def visit_var_decl(self, node, is_global=False):
         try:
-            self.symbol_table.add_symbol(node.var_name, node.var_type)
+            self.symbol_table.add_symbol(node.var_name, TYPE_CODES[node.var_type])
         except SemanticError as e:
             self.add_error(str(e))
             return
-        
+        self.visit_var_init(node)
+    
+    def visit_var_init(self, node):
+        """Inicializador de una variable ya declarada"""
         if node.init_expr:
-            expr_type = self.visit_expr(node.init_expr)
-            if not self.types_compatible(node.var_type, expr_type):
+            expr_type = self.visit(node.init_expr)
+            if not ASSIGNABLE[TYPE_CODES[node.var_type]][expr_type]:
                 self.add_error(f"Tipo incompatible en inicialización de '{node.var_name}': "
-                             f"se esperaba '{node.var_type}', se encontró '{expr_type}'")
+                             f"se esperaba '{node.var_type}', se encontró '{TYPE_NAMES[expr_type]}'")
     
     def visit_block(self, node):
         self.symbol_table.enter_scope()
         for stmt in node.statements:
             if isinstance(stmt, list):
                 for s in stmt:
-                    self.visit_statement(s)
+                    self.visit(s)
             else:
-                self.visit_statement(stmt)
+                self.visit(stmt)
         self.symbol_table.exit_scope()
     
     def visit_statement(self, node):
-        if node is None:
-            return
-        elif isinstance(node, VarDeclNode):
-            self.visit_var_decl(node)
-        elif isinstance(node, IfNode):
-            self.visit_if(node)
-        elif isinstance(node, WhileNode):
-            self.visit_while(node)
-        elif isinstance(node, ForNode):
-            self.visit_for(node)
-        elif isinstance(node, ReturnNode):
-            self.visit_return(node)
-        elif isinstance(node, PrintNode):
-            self.visit_print(node)
-        elif isinstance(node, ExprStmtNode):
-            if node.expr:
-                self.visit_expr(node.expr)
-        elif isinstance(node, BlockNode):
-            self.visit_block(node)
+        if node is not None:
+            self.visit(node)
+
+    def visit_list(self, nodes):
+        # Declaración como cuerpo de if, while o for: un ámbito propio, como un bloque
+        self.symbol_table.enter_scope()
+        for node in nodes:
+            self.visit(node)
+        self.symbol_table.exit_scope()
+    
+    def visit_expr_stmt(self, node):
+        if node.expr:
+            self.visit(node.expr)
     
     def visit_if(self, node):
-        cond_type = self.visit_expr(node.condition)
-        if cond_type not in ['int', 'float', 'bool', 'unknown']:
-            self.add_error(f"La condición del 'if' debe ser una expresión booleana o numérica, se encontró '{cond_type}'")
+        cond_type = self.visit(node.condition)
+        if not CONDICION_VALIDA[cond_type]:
+            self.add_error(f"La condición del 'if' debe ser una expresión booleana o numérica, se encontró '{TYPE_NAMES[cond_type]}'")
         
         self.visit_statement(node.then_stmt)
         if node.else_stmt:
             self.visit_statement(node.else_stmt)
     
     def visit_while(self, node):
-        cond_type = self.visit_expr(node.condition)
-        if cond_type not in ['int', 'float', 'bool', 'unknown']:
-            self.add_error(f"La condición del 'while' debe ser una expresión booleana o numérica, se encontró '{cond_type}'")
+        cond_type = self.visit(node.condition)
+        if not CONDICION_VALIDA[cond_type]:
+            self.add_error(f"La condición del 'while' debe ser una expresión booleana o numérica, se encontró '{TYPE_NAMES[cond_type]}'")
         
         self.visit_statement(node.body)
     
     def visit_for(self, node):
         if not isinstance(node.init_expr, EmptyExprNode):
-            self.visit_expr(node.init_expr)
+            self.visit(node.init_expr)
         
         if not isinstance(node.condition, EmptyExprNode):
-            cond_type = self.visit_expr(node.condition)
-            if cond_type not in ['int', 'float', 'bool', 'unknown']:
-                self.add_error(f"La condición del 'for' debe ser una expresión booleana o numérica, se encontró '{cond_type}'")
+            cond_type = self.visit(node.condition)
+            if not CONDICION_VALIDA[cond_type]:
+                self.add_error(f"La condición del 'for' debe ser una expresión booleana o numérica, se encontró '{TYPE_NAMES[cond_type]}'")
         
         if not isinstance(node.update_expr, EmptyExprNode):
-            self.visit_expr(node.update_expr)
+            self.visit(node.update_expr)
             
         self.visit_statement(node.body)
     
     def visit_return(self, node):
         if isinstance(node.expr, EmptyExprNode):
-            expr_type = 'void'
+            expr_type = VOID
         else:
-            expr_type = self.visit_expr(node.expr)
+            expr_type = self.visit(node.expr)
         
-        if self.current_function_return_type:
-            if not self.types_compatible(self.current_function_return_type, expr_type):
-                self.add_error(f"Tipo de retorno incompatible: se esperaba '{self.current_function_return_type}', "
-                             f"se encontró '{expr_type}'")
+        expected = self.current_function_return_type
+        if expected is not None:
+            if not ASSIGNABLE[expected][expr_type]:
+                self.add_error(f"Tipo de retorno incompatible: se esperaba '{TYPE_NAMES[expected]}', "
+                             f"se encontró '{TYPE_NAMES[expr_type]}'")
     
     def visit_print(self, node):
-        self.visit_expr(node.expr)
+        self.visit(node.expr)
     
     def visit_expr(self, node):
         if node is None:
-            return 'void'
-        elif isinstance(node, EmptyExprNode):
-            return 'void'
-        elif isinstance(node, NumNode):
-            return node.expr_type
-        elif isinstance(node, BinaryOpNode):
-            return self.visit_binary_op(node)
-        elif isinstance(node, UnaryOpNode):
-            return self.visit_unary_op(node)
-        elif isinstance(node, AssignNode):
-            return self.visit_assign(node)
-        elif isinstance(node, VarNode):
-            return self.visit_var(node)
-        elif isinstance(node, FuncCallNode):
-            return self.visit_func_call(node)
-        else:
-            self.add_error(f"Tipo de expresión desconocido: {type(node)}")
-            return 'unknown'
+            return VOID
+        return self.visit(node)
+    
+    def generic_visit(self, node):
+        self.add_error(f"Tipo de expresión desconocido: {type(node)}")
+        return UNKNOWN
+    
+    def visit_empty_expr(self, node):
+        return VOID
+    
+    def visit_num(self, node):
+        return TYPE_CODES[node.expr_type]
     
     def visit_binary_op(self, node):
-        left_type = self.visit_expr(node.left)
-        right_type = self.visit_expr(node.right)
-        
-        if node.op in ['+', '-', '*', '/', '%']:
-            if left_type not in ['int', 'float', 'unknown'] or right_type not in ['int', 'float', 'unknown']:
-                self.add_error(f"Operador '{node.op}' requiere operandos numéricos, "
-                             f"se encontró '{left_type}' y '{right_type}'")
-                return 'unknown'
-            result_type = 'float' if 'float' in [left_type, right_type] else 'int'
-            node.expr_type = result_type
-            return result_type
-        
-        elif node.op in ['<', '>', '<=', '>=', '==', '!=']:
-            if left_type not in ['int', 'float', 'unknown'] or right_type not in ['int', 'float', 'unknown']:
-                self.add_error(f"Operador '{node.op}' requiere operandos numéricos, "
-                             f"se encontró '{left_type}' y '{right_type}'")
-                return 'unknown'
-            node.expr_type = 'bool'
-            return 'bool'
-        
-        elif node.op in ['&&', '||']:
-            node.expr_type = 'bool'
-            return 'bool'
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
         
-        else:
+        tabla = BINARY_RESULT.get(node.op)
+        if tabla is None:
             self.add_error(f"Operador binario desconocido: {node.op}")
-            return 'unknown'
+            return UNKNOWN
+        result_type = tabla[left_type][right_type]
+        if result_type is None:
+            self.add_error(f"Operador '{node.op}' requiere operandos numéricos, "
+                         f"se encontró '{TYPE_NAMES[left_type]}' y '{TYPE_NAMES[right_type]}'")
+            return UNKNOWN
+        node.expr_type = TYPE_NAMES[result_type]
+        return result_type
     
     def visit_unary_op(self, node):
-        expr_type = self.visit_expr(node.expr)
+        expr_type = self.visit(node.expr)
         
         if node.op == '!':
             node.expr_type = 'bool'
-            return 'bool'
+            return BOOL
         elif node.op == '-':
-            if expr_type not in ['int', 'float', 'unknown']:
-                self.add_error(f"Operador '-' unario requiere operando numérico, se encontró '{expr_type}'")
-                return 'unknown'
-            node.expr_type = expr_type
-            return expr_type
+            result_type = NEGACION[expr_type]
+            if result_type is None:
+                self.add_error(f"Operador '-' unario requiere operando numérico, se encontró '{TYPE_NAMES[expr_type]}'")
+                return UNKNOWN
+            node.expr_type = TYPE_NAMES[result_type]
+            return result_type
         else:
             self.add_error(f"Operador unario desconocido: {node.op}")
-            return 'unknown'
+            return UNKNOWN
     
     def visit_assign(self, node):
         var_type = self.symbol_table.lookup(node.var_name)
         if var_type is None:
             self.add_error(f"Variable '{node.var_name}' no está declarada")
-            return 'unknown'
+            return UNKNOWN
         
-        expr_type = self.visit_expr(node.expr)
-        if not self.types_compatible(var_type, expr_type):
+        expr_type = self.visit(node.expr)
+        if not ASSIGNABLE[var_type][expr_type]:
             self.add_error(f"Asignación de tipo incompatible a '{node.var_name}': "
-                         f"se esperaba '{var_type}', se encontró '{expr_type}'")
-        
+                         f"se esperaba '{TYPE_NAMES[var_type]}', se encontró '{TYPE_NAMES[expr_type]}'")
+
+        node.expr_type = TYPE_NAMES[var_type]
         return var_type
     
     def visit_var(self, node):
         var_type = self.symbol_table.lookup(node.var_name)
         if var_type is None:
             self.add_error(f"Variable '{node.var_name}' no está declarada")
-            return 'unknown'
+            return UNKNOWN
         
-        node.expr_type = var_type
+        node.expr_type = TYPE_NAMES[var_type]
         return var_type
     
     def visit_func_call(self, node):
         func_info = self.symbol_table.lookup_function(node.func_name)
         if func_info is None:
+            if self._diferir:
+                raise _Diferir()
             self.add_error(f"Función '{node.func_name}' no está declarada")
-            return 'unknown'
+            return UNKNOWN
         
         return_type, param_types = func_info
         
@@ -320,22 +593,17 @@ class SemanticAnalyzer:
             return return_type
         
         for i, (arg, expected_type) in enumerate(zip(node.args, param_types)):
-            arg_type = self.visit_expr(arg)
-            if not self.types_compatible(expected_type, arg_type):
+            arg_type = self.visit(arg)
+            if not ASSIGNABLE[expected_type][arg_type]:
                 self.add_error(f"Argumento {i+1} de función '{node.func_name}' tiene tipo incompatible: "
-                             f"se esperaba '{expected_type}', se encontró '{arg_type}'")
+                             f"se esperaba '{TYPE_NAMES[expected_type]}', se encontró '{TYPE_NAMES[arg_type]}'")
         
-        node.expr_type = return_type
+        node.expr_type = TYPE_NAMES[return_type]
         return return_type
     
     def types_compatible(self, expected, actual):
-        if expected == actual:
-            return True
-        if expected == 'float' and actual == 'int':
-            return True
-        if actual == 'unknown':
-            return True
-        return False
+        """Si un valor de tipo actual se puede usar donde se espera expected (códigos)"""
+        return ASSIGNABLE[expected][actual]
     
     def get_errors_report(self):
         if not self.errors:
@@ -349,10 +617,11 @@ class SemanticAnalyzer:
 
 def main():
     if len(sys.argv) < 2:
-        print("Uso: python semantic_analyzer.py <archivo_fuente>", file=sys.stderr)
+        print("Uso: python semantic_analyzer.py <archivo_fuente> [--solo-tabla]", file=sys.stderr)
         sys.exit(1)
     
     path = sys.argv[1]
+    solo_tabla = "--solo-tabla" in sys.argv[2:]
     
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -363,7 +632,8 @@ def main():
         print("Análisis léxico exitoso")
         print(f"Tokens generados: {len(tokens)}\n")
         
-        parser = ParserAST(tokens)
+        # Para la tabla sola basta con las firmas: los cuerpos no se analizan
+        parser = ParserAST(tokens, lazy=solo_tabla)
         ast = parser.parse()
         
         if not ast:
@@ -372,6 +642,14 @@ def main():
         
         print("AST construido exitosamente\n")
         
+        if solo_tabla:
+            analyzer = SemanticAnalyzer()
+            success = analyzer.declare_signatures(ast)
+            print(analyzer.symbol_table.get_table_representation())
+            print()
+            print(analyzer.get_errors_report())
+            sys.exit(0 if success and not parser.errors else 1)
+        
         print("Iniciando análisis semántico\n")
         analyzer = SemanticAnalyzer()
         success = analyzer.analyze(ast)